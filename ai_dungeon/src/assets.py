@@ -0,0 +1,60 @@
+import os
+
+import pygame
+
+
+class AssetCache:
+    """Images loaded and scaled once per (path, size), shared by everything that draws them.
+
+    Surfaces handed out are shared, so callers must copy one before drawing
+    on it. Loading needs a display mode set (for convert_alpha), so preload
+    after pygame.display.set_mode.
+    """
+
+    def __init__(self):
+        self.images = {}  # (normalised path, size) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.images)
+
+    def image(self, path, size=None):
+        """The image at `path`, scaled to a size x size square if given."""
+        key = (os.path.normpath(path), size)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = pygame.image.load(key[0]).convert_alpha()
+        if size:
+            surface = pygame.transform.scale(surface, (size, size))
+        self.images[key] = surface
+        return surface
+
+    def preload(self, assets):
+        """Load every (path, size) in `assets` now, so later lookups never touch the disk."""
+        for path, size in assets:
+            key = (os.path.normpath(path), size)
+            if key not in self.images:
+                self.image(path, size)
+
+    def clear(self):
+        self.images.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Get cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            'images': len(self.images),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-wide cache used by game.Sprite
+ASSETS = AssetCache()
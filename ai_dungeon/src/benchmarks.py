@@ -0,0 +1,739 @@
+"""Micro-benchmarks for the game logic.
+
+Run from the src directory:
+    python benchmarks.py            # run everything
+    python benchmarks.py grid       # run a single benchmark
+"""
+import itertools
+import os
+import random
+import sys
+import time
+
+from maze_samples import bfs_has_path, random_maze
+
+
+def _timeit(func, repeat):
+    """Average seconds per call of func over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def _legacy_slide(walls, placed, coins, size, x, y, dx, dy):
+    """The list-based slide Game.start_movement used before the board layers."""
+    while True:
+        new_x, new_y = x + dx, y + dy
+        if (0 <= new_x < size and 0 <= new_y < size and
+            [new_x, new_y] not in walls and
+            [new_x, new_y] not in placed):
+            x, y = new_x, new_y
+            if [x, y] in coins:
+                coins.remove([x, y])
+        else:
+            return x, y
+
+
+def bench_grid():
+    """List-of-lists layers vs byte-plane board layers at several grid sizes."""
+    from game_state import Game, GameState
+
+    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    print("grid: slide move and membership cost, legacy lists vs board")
+    print(f"{'size':>6} {'legacy move':>14} {'board move':>14} {'speedup':>9} "
+          f"{'legacy in':>12} {'board in':>12}")
+    for size in (10, 64, 256):
+        maze = random_maze(size)
+        rng = random.Random(1)
+        starts = [(rng.randrange(size), rng.randrange(size), rng.choice(directions)) for _ in range(64)]
+
+        walls = [list(w) for w in maze['walls']]
+        coins = [list(c) for c in maze['coins']]
+        moves = itertools.cycle(starts)
+
+        def legacy_move():
+            x, y, (dx, dy) = next(moves)
+            _legacy_slide(walls, [], coins, size, x, y, dx, dy)
+
+        game = Game()
+        game.init_level(maze)
+        game_moves = itertools.cycle(starts)
+
+        def board_move():
+            x, y, (dx, dy) = next(game_moves)
+            game.player.x, game.player.y = x, y
+            game.start_movement(dx, dy)
+            game.state = GameState.PLAYING
+
+        probes = [[rng.randrange(size), rng.randrange(size)] for _ in range(64)]
+        legacy_in = _timeit(lambda: [p in walls for p in probes], 20) / len(probes)
+        board_in = _timeit(lambda: [p in game.walls for p in probes], 200) / len(probes)
+
+        legacy = _timeit(legacy_move, 5 if size == 256 else 50)
+        board = _timeit(board_move, 2000)
+        print(f"{size:>6} {legacy * 1e6:>12.1f}us {board * 1e6:>12.1f}us {legacy / board:>8.1f}x "
+              f"{legacy_in * 1e6:>10.2f}us {board_in * 1e6:>10.2f}us")
+        print(f"{'':>6} walls counted: {game.board.walls.count()}")
+
+
+def bench_slides():
+    """Cell-by-cell slide walk vs SlideTable lookup, plus the cost of patching the table."""
+    from board import Board, SlideTable
+
+    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    print("slides: per-move cost of walking vs looking up the stop cell")
+    print(f"{'size':>6} {'walk':>10} {'lookup':>10} {'speedup':>9} {'build':>10} {'patch':>10}")
+    for size in (10, 64, 256):
+        maze = random_maze(size, wall_density=0.05)
+        board = Board(size)
+        board.walls.assign(maze['walls'])
+        rng = random.Random(1)
+        moves = itertools.cycle([(rng.randrange(size), rng.randrange(size), rng.choice(directions))
+                                 for _ in range(64)])
+
+        def walk():
+            x, y, (dx, dy) = next(moves)
+            while not board.is_blocked(x + dx, y + dy):
+                x += dx
+                y += dy
+            return x, y
+
+        build = _timeit(lambda: SlideTable(board), 3)
+        table = SlideTable(board)
+
+        def lookup():
+            x, y, (dx, dy) = next(moves)
+            return table.stop(x, y, dx, dy)
+
+        patch = _timeit(lambda: table.update_cell(rng.randrange(size), rng.randrange(size)), 50)
+        walk_time = _timeit(walk, 2000)
+        lookup_time = _timeit(lookup, 2000)
+        print(f"{size:>6} {walk_time * 1e6:>8.2f}us {lookup_time * 1e6:>8.2f}us "
+              f"{walk_time / lookup_time:>8.1f}x {build * 1e3:>8.2f}ms {patch * 1e6:>8.1f}us")
+
+
+def bench_simulator():
+    """Moves per second of the batched headless Simulator."""
+    import numpy as np
+    from simulator import Simulator, UP, RIGHT
+
+    print("simulator: batched slide moves per second")
+    print(f"{'size':>6} {'batch':>8} {'step':>12} {'moves/s':>14}")
+    for size in (10, 64):
+        maze = random_maze(size)
+        for batch in (1, 1024, 16384):
+            rng = np.random.default_rng(0)
+            sim = Simulator(maze, batch_size=batch)
+            actions = rng.integers(UP, RIGHT + 1, size=(32, batch))
+            steps = iter(actions)
+            step = _timeit(lambda: sim.step(next(steps)), len(actions))
+            print(f"{size:>6} {batch:>8} {step * 1e3:>10.3f}ms {batch / step:>14,.0f}")
+
+
+def bench_solver():
+    """Time to solve random boards under the real slide/place/destroy rules."""
+    from maze_solver import MazeSolver, difficulty_score
+
+    print("solver: optimal moves/spend search")
+    print(f"{'size':>6} {'walls':>6} {'solvable':>9} {'moves':>6} {'spend':>6} {'score':>6} "
+          f"{'exact':>6} {'states':>8} {'time':>10}")
+    for size in (10, 64):
+        for wall_density in (0.1, 0.3):
+            for seed in range(3):
+                maze = random_maze(size, seed=seed, wall_density=wall_density, coin_density=0.01)
+                start = time.perf_counter()
+                solution = MazeSolver(maze).solve()
+                elapsed = time.perf_counter() - start
+                print(f"{size:>6} {wall_density:>6} {str(solution['solvable']):>9} "
+                      f"{str(solution['moves']):>6} {str(solution['spend']):>6} "
+                      f"{difficulty_score(solution):>6} {str(solution['exact']):>6} "
+                      f"{solution['states']:>8} {elapsed * 1e3:>8.1f}ms")
+
+
+def bench_reachability():
+    """Per-maze validation cost: legacy double BFS vs one ReachabilityIndex build, plus its cut queries."""
+    from maze_engine import MazeEngine
+    from reachability import ReachabilityIndex
+
+    print("reachability: validation time per maze")
+    print(f"{'size':>6} {'double bfs':>12} {'index':>12} {'speedup':>9} {'cut query':>11} {'scatter':>10}")
+    for size in (10, 64, 256):
+        rng = random.Random(1)
+        # Validate a connected cave so the BFS can't bail out early
+        maze = MazeEngine(1).generate(3, size, algorithm='cellular')
+        walls, start, end = maze['walls'], maze['start'], maze['exit']
+        repeat = 3 if size == 256 else 30
+
+        legacy = _timeit(lambda: bfs_has_path(start, end, walls, size) and
+                         bfs_has_path(start, end, walls, size), repeat)
+        index_time = _timeit(lambda: ReachabilityIndex(size, walls, start, end).connected(), repeat)
+
+        index = ReachabilityIndex(size, walls, start, end)
+        probes = itertools.cycle([(rng.randrange(size), rng.randrange(size)) for _ in range(64)])
+        cut = _timeit(lambda: index.cuts_path(*next(probes)), 2000)
+
+        # Scatter walls over an open board without ever cutting the path
+        def scatter():
+            index = ReachabilityIndex(size)
+            return [[x, y] for y in range(size) for x in range(size)
+                    if rng.random() < 0.3 and index.add_wall(x, y)]
+
+        scattered = _timeit(scatter, repeat)
+        print(f"{size:>6} {legacy * 1e3:>10.3f}ms {index_time * 1e3:>10.3f}ms {legacy / index_time:>8.1f}x "
+              f"{cut * 1e6:>9.2f}us {scattered * 1e3:>8.2f}ms")
+
+
+def bench_engine():
+    """Mazes per second from each local MazeEngine algorithm."""
+    from maze_engine import MazeEngine, ALGORITHMS
+
+    print("engine: local maze generation time per maze")
+    print(f"{'size':>6} {'algorithm':>12} {'per maze':>12} {'mazes/s':>10}")
+    for size in (10, 64):
+        for algorithm in ALGORITHMS:
+            engine = MazeEngine(seed=0)
+            per_maze = _timeit(lambda: engine.generate(3, size, algorithm), 500 if size == 10 else 20)
+            print(f"{size:>6} {algorithm:>12} {per_maze * 1e3:>10.3f}ms {1 / per_maze:>10,.0f}")
+
+
+def _dungeon(level_number, enemy_count, seed=0, boss=False, size=None):
+    """A headless pygame-dungeon Game on `level_number` with `enemy_count` enemies spread over free floor.
+
+    With `boss`, the first of them is a Boss. `size` swaps in a map of that many tiles
+    instead of the one-screen level, for enemy counts a screen has no room for.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import game
+
+    random.seed(seed)
+    dungeon = game.Game(start_level=level_number)
+    if size:
+        dungeon.level = game.Level(level_number, size=size)
+        dungeon.player.rect.topleft = dungeon.find_safe_spawn()
+    level = dungeon.level
+    width, height = level.size
+    free = [(x * game.TILE_SIZE, y * game.TILE_SIZE) for y in range(2, height - 2) for x in range(2, width - 2)]
+    random.shuffle(free)
+    enemies = []
+    # Half-tile offsets pack more enemies in than there are free tiles
+    for x, y in itertools.chain(free, ((x + game.TILE_SIZE // 2, y) for x, y in free)):
+        if len(enemies) == enemy_count:
+            break
+        enemy = game.Boss(x, y) if boss and not enemies else game.Enemy(x, y, level_number)
+        if not any(enemy.rect.colliderect(other.rect) for other in enemies) and \
+                enemy.rect.collidelist(level.walls) == -1 and \
+                enemy.rect.collidelist([pillar.rect for pillar in level.fire_pillars]) == -1 and \
+                not enemy.rect.colliderect(dungeon.player.rect):
+            enemy.move_delay = -1  # Move on every update, however fast the loop runs
+            enemies.append(enemy)
+    dungeon.enemies = enemies
+    dungeon.swarm = game.EnemySwarm(enemies, game.PLAYER_SIZE, game.TILE_SIZE)
+    dungeon.player.health = dungeon.player.max_health = 10 ** 9  # Keep the run going
+    return dungeon
+
+
+def _legacy_enemy_moves(dungeon):
+    """One frame of the linear-scan Enemy.move_towards used before SpatialHash (levels 1-2)."""
+    import math
+
+    level, target = dungeon.level, dungeon.player
+    for enemy in dungeon.enemies:
+        dx = target.rect.centerx - enemy.rect.centerx
+        dy = target.rect.centery - enemy.rect.centery
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance == 0:
+            continue
+        new_rect = enemy.rect.copy()
+        new_rect.x += (dx / distance) * enemy.speed
+        new_rect.y += (dy / distance) * enemy.speed
+        can_move = True
+        for wall in level.walls:
+            if new_rect.colliderect(wall):
+                can_move = False
+                break
+        for pillar in level.fire_pillars:
+            if new_rect.colliderect(pillar.rect):
+                can_move = False
+                break
+        for other in dungeon.enemies:
+            if other != enemy and new_rect.colliderect(other.rect):
+                can_move = False
+                break
+        if can_move:
+            enemy.rect = new_rect
+
+
+def _legacy_flow_move(enemy, target, level, enemy_index):
+    """One Enemy.move_towards call, the per-enemy flow-field step used before EnemySwarm."""
+    import math
+    import pygame
+    from game import TILE_SIZE
+
+    current_time = pygame.time.get_ticks()
+    if current_time - enemy.last_move_time < enemy.move_delay:
+        return
+    # Head for the centre of the next tile on the flow field, or straight at the target on its tile
+    flow = level.flow_towards(target.rect)
+    step = flow.step_from(enemy.rect.centerx // TILE_SIZE, enemy.rect.centery // TILE_SIZE)
+    if step is None or step == flow.target:
+        goal_x, goal_y = target.rect.center
+    else:
+        goal_x = step[0] * TILE_SIZE + TILE_SIZE // 2
+        goal_y = step[1] * TILE_SIZE + TILE_SIZE // 2
+    dx = goal_x - enemy.rect.centerx
+    dy = goal_y - enemy.rect.centery
+    distance = math.sqrt(dx * dx + dy * dy)
+    if distance == 0:
+        return
+    scale = min(enemy.speed, distance) / distance
+    dx *= scale
+    dy *= scale
+    # Try the step, then each axis on its own to slide along a corner
+    for move_dx, move_dy in ((dx, dy), (dx, 0), (0, dy)):
+        if move_dx == 0 and move_dy == 0:
+            continue
+        new_rect = enemy.rect.copy()
+        new_rect.x += move_dx
+        new_rect.y += move_dy
+        if new_rect.topleft == enemy.rect.topleft:
+            continue
+        if level.wall_index.collides(new_rect) or level.hazards.collides(new_rect):
+            continue
+        if enemy_index.collides(new_rect, ignore=enemy):
+            break  # Wait behind other enemies rather than sidestep them
+        enemy.rect = new_rect
+        enemy_index.move(enemy)
+        break
+    enemy.last_move_time = current_time
+
+def bench_dungeon():
+    """Pygame dungeon frame cost as the enemy count grows (level 2: walls plus fire border)."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import game
+
+    print("dungeon: per-frame enemy movement, linear scans vs SpatialHash, and the whole Game.update")
+    print(f"{'enemies':>8} {'linear':>12} {'hashed':>12} {'speedup':>9} {'update':>12}")
+    for count in (10, 50, 100, 200):
+        legacy_game = _dungeon(2, count)
+        legacy = _timeit(lambda: _legacy_enemy_moves(legacy_game), 100)
+
+        hashed_game = _dungeon(2, count)
+        hashed_index = game.SpatialHash(game.TILE_SIZE, hashed_game.enemies)
+
+        def hashed_moves():
+            for enemy in hashed_game.enemies:
+                _legacy_flow_move(enemy, hashed_game.player, hashed_game.level, hashed_index)
+
+        hashed = _timeit(hashed_moves, 100)
+        update = _timeit(_dungeon(2, count).update, 100)
+        print(f"{len(hashed_game.enemies):>8} {legacy * 1e3:>10.3f}ms {hashed * 1e3:>10.3f}ms "
+              f"{legacy / hashed:>8.1f}x {update * 1e3:>10.3f}ms")
+
+
+def bench_level_draw():
+    """Pygame dungeon Level.draw: repainting every tile each frame vs blitting the pre-rendered layer."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+
+    screen = pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    print("level draw: per-frame cost of the floor, walls and fire pillars")
+    print(f"{'level':>6} {'per tile':>12} {'baked':>12} {'speedup':>9} {'bake once':>12}")
+    for level_number in (1, 2, 3):
+        random.seed(level_number)
+        level = game.Level(level_number)
+
+        def per_tile():
+            # What draw did every frame before the layer was cached
+            screen.blit(level.render_tiles(screen), (0, 0))
+            for pillar in level.fire_pillars:
+                pillar.draw(screen)
+
+        before = _timeit(per_tile, 50)
+        bake = _timeit(lambda: level.render_tiles(screen), 10)
+        after = _timeit(lambda: level.draw(screen), 200)
+        print(f"{level_number:>6} {before * 1e3:>10.3f}ms {after * 1e3:>10.3f}ms "
+              f"{before / after:>8.1f}x {bake * 1e3:>10.3f}ms")
+
+
+def bench_pillars():
+    """Fire pillars: per-pixel rects as before vs atlas frames blitted each frame vs a cached pillar layer."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+
+    screen = pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    columns = game.WINDOW_WIDTH // game.TILE_SIZE
+    pixel_size = game.TILE_SIZE // 4
+    print("pillars: per-frame Level update + draw at 60 FPS, tiles included")
+    print(f"{'pillars':>8} {'rects':>12} {'blits':>12} {'layer':>12} {'speedup':>9}")
+    for count in (60, 500):
+        random.seed(count)
+        level = game.Level(2)
+        level.fire_pillars = pillars = [
+            game.FirePillar(n % columns * game.TILE_SIZE, n // columns % 15 * game.TILE_SIZE) for n in range(count)]
+        level.draw(screen)
+        clock = itertools.count(0, 1000 // game.FPS)  # Milliseconds, one frame per call
+
+        # The old per-pillar state: a pixel dict per lit cell, recoloured every update_delay
+        patterns = [[(i, j) for i in range(4) for j in range(4) if random.random() > 0.2] for _ in pillars]
+        next_update = [0]
+
+        def rects():
+            now = next(clock)
+            if now >= next_update[0]:
+                for pillar, pattern in zip(pillars, patterns):
+                    pillar.pixels = [{'x': pillar.x + i * pixel_size, 'y': pillar.y + j * pixel_size,
+                                      'size': pixel_size, 'color': random.choice(pillar.colors)}
+                                     for i, j in pattern]
+                next_update[0] = now + pillar.update_delay
+            screen.blit(level.background, (0, 0))
+            for pillar in pillars:
+                pygame.draw.rect(screen, game.COLORS['dark_red'], pillar.rect)
+                for pixel in pillar.pixels:
+                    pygame.draw.rect(screen, pixel['color'], (pixel['x'], pixel['y'], pixel['size'], pixel['size']))
+
+        def blits():
+            now = next(clock)
+            for pillar in pillars:
+                pillar.update(now)
+            screen.blit(level.background, (0, 0))
+            screen.blits([(pillar.frames[pillar.frame], pillar.rect) for pillar in pillars], False)
+
+        def layer():
+            level.update(next(clock))
+            level.draw(screen)
+
+        before = _timeit(rects, 240)
+        batched = _timeit(blits, 240)
+        after = _timeit(layer, 240)
+        print(f"{count:>8} {before * 1e3:>10.3f}ms {batched * 1e3:>10.3f}ms {after * 1e3:>10.3f}ms "
+              f"{before / after:>8.1f}x")
+
+def bench_assets():
+    """Pygame dungeon object construction with the asset cache cleared each time vs kept warm."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+    from assets import ASSETS
+
+    pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    print("assets: building what a level transition and power-up spawns create")
+    print(f"{'objects':>24} {'cold':>12} {'warm':>12} {'speedup':>9} {'misses':>8}")
+
+    def transition():
+        game.Player(100, 100)
+        for n in range(10):
+            game.Enemy(40 * n, 200, 2)
+
+    def power_ups():
+        game.PowerUp(80, 80, game.PowerUpType.HEALTH_POTION)
+        game.PowerUp(120, 80, game.PowerUpType.MAGIC_STAFF)
+
+    for name, build in (("player + 10 enemies", transition), ("2 power-ups", power_ups)):
+        def cold():
+            ASSETS.clear()
+            build()
+
+        before = _timeit(cold, 50)
+        ASSETS.clear()
+        ASSETS.preload(game.SPRITE_ASSETS)
+        after = _timeit(build, 500)
+        print(f"{name:>24} {before * 1e3:>10.3f}ms {after * 1e3:>10.3f}ms "
+              f"{before / after:>8.1f}x {ASSETS.stats()['misses']:>8}")
+
+
+def bench_tilemap():
+    """Pygame dungeon Level.generate_tilemap time as the map grows, with FloorConnectivity doing the checks."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+
+    pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    print("tilemap: Level.generate_tilemap per map")
+    print(f"{'size':>9} {'level':>6} {'per map':>12} {'checks':>8} {'cells/check':>12}")
+    for width, height in ((20, 15), (50, 50), (100, 100), (200, 200)):
+        for level_number in (1, 3):
+            random.seed(0)
+            level = game.Level(level_number, (width, height))
+            repeat = max(1, 30000 // (width * height))
+            start = time.perf_counter()
+            for _ in range(repeat):
+                level.generate_tilemap()
+            per_map = (time.perf_counter() - start) / repeat
+            connectivity = level.connectivity
+            checks, visited = connectivity.checks, connectivity.visited
+            print(f"{width:>4}x{height:<4} {level_number:>6} {per_map * 1e3:>10.3f}ms {checks:>8} "
+                  f"{visited / max(checks, 1):>12.1f}")
+
+
+def bench_pathing():
+    """Pygame dungeon enemy pathing per frame while the player keeps changing tile."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import game
+
+    print("pathing: per-frame flow-field move for every enemy, player moving to a new tile every 10 frames")
+    print(f"{'level':>6} {'map':>6} {'enemies':>8} {'per frame':>12} {'per enemy':>12} {'flow':>12} "
+          f"{'moved':>7} {'reached':>8}")
+    # A 20x15 screen fits about 140 enemies, so the 200-enemy runs use a 60x45 map as bench_swarm does
+    for level_number, count, size in ((3, 7, None), (3, 50, None), (2, 50, None),
+                                      (3, 200, (60, 45)), (2, 200, (60, 45))):
+        dungeon = _dungeon(level_number, count, boss=level_number == 3, size=size)
+        player, level, enemies = dungeon.player, dungeon.level, dungeon.enemies
+        index = game.SpatialHash(game.TILE_SIZE, enemies)
+        spots = [(x * game.TILE_SIZE, y * game.TILE_SIZE)
+                 for y, row in enumerate(level.tilemap) for x, (tile, _) in enumerate(row)
+                 if tile == 'floor' and not level.hazards.at(x, y) and 2 <= x < len(row) - 2]
+        rng = random.Random(0)
+        moves = frames = reached = 0
+        elapsed = pathing = 0.0
+        for frame in range(200):
+            if frame % 10 == 0:
+                player.rect.topleft = rng.choice(spots)
+            before = [enemy.rect.topleft for enemy in enemies]
+            start = time.perf_counter()
+            for enemy in enemies:
+                _legacy_flow_move(enemy, player, level, index)
+            elapsed += time.perf_counter() - start
+            frames += 1
+            moves += sum(enemy.rect.topleft != spot for enemy, spot in zip(enemies, before))
+            reached += sum(enemy.rect.colliderect(player.rect) for enemy in enemies)
+
+            # The path-finding share: pointing the field at the player and every enemy's lookup
+            start = time.perf_counter()
+            flow = level.flow_towards(player.rect)
+            for enemy in enemies:
+                flow.step_from(enemy.rect.centerx // game.TILE_SIZE, enemy.rect.centery // game.TILE_SIZE)
+            pathing += time.perf_counter() - start
+        per_frame = elapsed / frames
+        print(f"{level_number:>6} {'{}x{}'.format(*level.size):>6} {len(enemies):>8} {per_frame * 1e3:>10.3f}ms {per_frame / len(enemies) * 1e6:>10.1f}us "
+              f"{pathing / frames * 1e3:>10.3f}ms {moves / (frames * len(enemies)):>6.0%} {reached:>8}")
+
+
+def bench_swarm():
+    """Pygame dungeon enemy movement per frame: one flow-field move per Enemy vs one EnemySwarm.step."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+
+    pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    print("swarm: level 2 on a 60x45 map, player moving to a new tile every 30 frames")
+    print(f"{'enemies':>8} {'objects':>12} {'swarm':>12} {'speedup':>9} {'moved':>7} {'overlaps':>9}")
+    random.seed(0)
+    level = game.Level(2, size=(60, 45))
+    spots = [(x * game.TILE_SIZE, y * game.TILE_SIZE)
+             for y, row in enumerate(level.tilemap) for x, (tile, _) in enumerate(row)
+             if tile == 'floor' and not level.hazards.at(x, y)]
+    for count in (10, 100, 1000):
+        rng = random.Random(count)
+        player = game.Player(*rng.choice(spots))
+        placed = rng.sample([spot for spot in spots if spot != player.rect.topleft], count)
+
+        def spawn():
+            enemies = [game.Enemy(x, y, 2) for x, y in placed]
+            for enemy in enemies:
+                enemy.move_delay = -1  # Move on every call, however fast the loop runs
+            return enemies
+
+        objects = spawn()
+        index = game.SpatialHash(game.TILE_SIZE, objects)
+        swarm = game.EnemySwarm(spawn(), game.PLAYER_SIZE, game.TILE_SIZE)
+        targets = [rng.choice(spots) for _ in range(10)]
+        per_object = batched = 0.0
+        moved = 0
+        frames = 300 if count < 1000 else 60
+        for frame in range(frames):
+            if frame % 30 == 0:
+                player.rect.topleft = targets[frame // 30 % len(targets)]
+                level.flow_towards(player.rect)  # Same rebuild for both, kept out of the timings
+            start = time.perf_counter()
+            for enemy in objects:
+                _legacy_flow_move(enemy, player, level, index)
+            per_object += time.perf_counter() - start
+            start = time.perf_counter()
+            moved += swarm.step(player.rect, level, pygame.time.get_ticks())
+            batched += time.perf_counter() - start
+        # No two enemies should end up on top of each other
+        overlaps = sum(len(swarm.query(enemy.rect, ignore=enemy)) for enemy in swarm.members) // 2
+        print(f"{count:>8} {per_object / frames * 1e3:>10.3f}ms {batched / frames * 1e3:>10.3f}ms "
+              f"{per_object / batched:>8.1f}x {moved / (frames * count):>6.0%} {overlaps:>9}")
+
+
+def _legacy_arrow_moves(arrows, level, enemy_index):
+    """One frame of the per-Arrow update and enemy loop used before ArrowPool; `arrows` holds [rect, direction]."""
+    hits = 0
+    for arrow in arrows[:]:
+        rect, direction = arrow
+        new_rect = rect.copy()
+        new_rect.x += direction[0] * 15
+        new_rect.y += direction[1] * 15
+        if level.wall_index.collides(new_rect):
+            arrows.remove(arrow)
+            continue
+        arrow[0] = new_rect
+        for enemy in enemy_index.query(new_rect):
+            if new_rect.colliderect(enemy.rect):
+                hits += 1
+                arrows.remove(arrow)
+                break
+    return hits
+
+
+def bench_arrows():
+    """Pygame dungeon arrows per frame: Arrow objects in a list vs one ArrowPool, kept topped up to N live arrows."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import game
+
+    screen = pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    print("arrows: level 2 on a 60x45 map with 100 enemies standing still")
+    print(f"{'arrows':>7} {'objects':>12} {'pool':>12} {'speedup':>9} {'pool draw':>12} {'hits':>7}")
+    random.seed(0)
+    level = game.Level(2, size=(60, 45))
+    spots = [(x * game.TILE_SIZE, y * game.TILE_SIZE)
+             for y, row in enumerate(level.tilemap) for x, (tile, _) in enumerate(row)
+             if tile == 'floor' and not level.hazards.at(x, y)]
+    rng = random.Random(0)
+    placed = rng.sample(spots, 100)
+    enemies = [game.Enemy(x, y, 2) for x, y in placed]
+    index = game.SpatialHash(game.TILE_SIZE, enemies)
+    swarm = game.EnemySwarm([game.Enemy(x, y, 2) for x, y in placed], game.PLAYER_SIZE, game.TILE_SIZE)
+    swarm.arrays['health'][:] = 10 ** 9  # Nobody dies, so every frame sees the same crowd
+    directions = [direction.value for direction in game.Direction]
+    shots = [(x + game.TILE_SIZE // 2, y + game.TILE_SIZE // 2, rng.choice(directions))
+             for x, y in rng.choices(spots, k=4096)]
+    for count in (10, 100, 1000):
+        arrows = []
+        pool = game.ArrowPool(tile_size=game.TILE_SIZE)
+        per_object = batched = drawing = 0.0
+        frames = 120
+        for frame in range(frames):
+            # Top both up with the same shots; not part of the timings
+            while len(arrows) < count:
+                x, y, direction = shots[(frame * count + len(arrows)) % len(shots)]
+                arrows.append([pygame.Rect(x, y, 8, 8), direction])
+            while len(pool) < count:
+                x, y, direction = shots[(frame * count + len(pool)) % len(shots)]
+                pool.fire(x, y, direction)
+            start = time.perf_counter()
+            _legacy_arrow_moves(arrows, level, index)
+            per_object += time.perf_counter() - start
+            start = time.perf_counter()
+            pool.update(level, swarm)
+            batched += time.perf_counter() - start
+            start = time.perf_counter()
+            pool.draw(screen, game.COLORS['yellow'])
+            drawing += time.perf_counter() - start
+        print(f"{count:>7} {per_object / frames * 1e3:>10.3f}ms {batched / frames * 1e3:>10.3f}ms "
+              f"{per_object / batched:>8.1f}x {drawing / frames * 1e3:>10.3f}ms {pool.hits / frames:>7.1f}")
+
+
+def bench_spawns():
+    """Pygame dungeon spawn queries against each level's SpawnIndex, on an empty map and a crowded one."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import game
+
+    dungeon = _dungeon(1, 0)
+    print("spawns: per-call cost of building the index and of each spawn query")
+    print(f"{'level':>6} {'index':>10} {'player':>10} {'enemies':>10} {'power-up':>10} {'crowded':>10} {'placed':>7}")
+    for level_number in (1, 2, 3):
+        random.seed(level_number)
+        dungeon.current_level = level_number
+        dungeon.level = level = game.Level(level_number)
+        dungeon.player = game.Player(*dungeon.find_safe_spawn())
+        dungeon.power_ups = []
+        walls = [(x, y) for y, row in enumerate(level.tilemap) for x, (tile, _) in enumerate(row) if tile == 'wall']
+        hazards = [(rect.x // game.TILE_SIZE, rect.y // game.TILE_SIZE) for rect in level.hazards.rects]
+        build = _timeit(lambda: game.SpawnIndex(*level.size, walls, hazards), 20)
+        player = _timeit(dungeon.find_safe_spawn, 200)
+        enemies = _timeit(dungeon.create_enemies, 50)
+        placed = len(dungeon.create_enemies())
+        power_up = _timeit(dungeon.find_power_up_position, 200)
+        # Fill the map with power-ups until no tile is left: the last queries have to give up
+        while True:
+            position = dungeon.find_power_up_position()
+            if position is None:
+                break
+            dungeon.power_ups.append(game.PowerUp(*position, game.PowerUpType.HEALTH_POTION))
+        crowded = _timeit(dungeon.find_power_up_position, 50)
+        print(f"{level_number:>6} {build * 1e3:>8.2f}ms {player * 1e3:>8.3f}ms {enemies * 1e3:>8.3f}ms "
+              f"{power_up * 1e3:>8.3f}ms {crowded * 1e3:>8.3f}ms {placed:>7}")
+
+
+def bench_transition():
+    """Pygame dungeon level switch: the frame that kills the last enemy, built inline vs prepared in the background."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import game
+
+    print("transition: cost of the switching frame (the new level's first draw included)")
+    print(f"{'to level':>9} {'inline':>10} {'prepared':>10} {'unready':>10} {'frame idle':>11} {'frame building':>15}")
+    for level_number in (1, 2):
+        random.seed(level_number)
+        dungeon = game.Game(start_level=level_number)
+
+        def inline():
+            # What Game.update did before advance_level: everything in the switching frame
+            level = game.Level(level_number + 1)
+            player = game.Player(*dungeon.find_safe_spawn(level))
+            enemies = dungeon.create_enemies(level, player.rect)
+            game.EnemySwarm(enemies, game.PLAYER_SIZE, game.TILE_SIZE)
+            level.draw(dungeon.screen)
+
+        def switch(wait):
+            dungeon.current_level = level_number
+            dungeon.prepare_next_level()
+            if wait:
+                dungeon.next_level.result()
+            start = time.perf_counter()
+            dungeon.advance_level()
+            dungeon.draw()
+            return time.perf_counter() - start
+
+        def frame():
+            start = time.perf_counter()
+            dungeon.update()
+            dungeon.draw()
+            return time.perf_counter() - start
+
+        before = _timeit(inline, 10)
+        prepared = sum(switch(True) for _ in range(10)) / 10
+        unready = sum(switch(False) for _ in range(10)) / 10
+
+        # What the build costs the frames played while it runs (it shares the GIL with them)
+        dungeon.current_level = level_number
+        dungeon.player.health = dungeon.player.max_health = 10 ** 9
+        idle = sum(frame() for _ in range(30)) / 30
+        frames = []
+        dungeon.prepare_next_level()
+        while not dungeon.next_level.done():
+            frames.append(frame())
+        busy = sum(frames) / len(frames) if frames else 0.0
+        print(f"{level_number + 1:>9} {before * 1e3:>8.1f}ms {prepared * 1e3:>8.1f}ms {unready * 1e3:>8.1f}ms "
+              f"{idle * 1e3:>9.1f}ms {busy * 1e3:>8.1f}ms x{len(frames)}")
+
+
+BENCHMARKS = {
+    'grid': bench_grid,
+    'slides': bench_slides,
+    'simulator': bench_simulator,
+    'solver': bench_solver,
+    'reachability': bench_reachability,
+    'engine': bench_engine,
+    'dungeon': bench_dungeon,
+    'level_draw': bench_level_draw,
+    'pillars': bench_pillars,
+    'assets': bench_assets,
+    'tilemap': bench_tilemap,
+    'pathing': bench_pathing,
+    'swarm': bench_swarm,
+    'arrows': bench_arrows,
+    'spawns': bench_spawns,
+    'transition': bench_transition,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,194 @@
+from array import array
+
+
+class CellLayer:
+    """One layer of the board (walls, coins, ...) stored as a flat byte plane.
+
+    Behaves like the old list of [x, y] lists so existing code can keep using
+    `in`, `append`, `remove`, `len` and iteration, but membership and mutation
+    are O(1) instead of list scans. A `watcher` (the SlideTable for walls and
+    placed blocks) is told about every change made through these methods.
+    """
+
+    def __init__(self, size, cells=()):
+        self.size = size
+        self.plane = bytearray(size * size)
+        self.watcher = None
+        self.assign(cells)
+
+    def index(self, x, y):
+        """Flat index of a cell, or -1 if it's off the board."""
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return y * self.size + x
+        return -1
+
+    def assign(self, cells):
+        """Replace the layer contents with the given [x, y] cells."""
+        self.plane[:] = bytes(len(self.plane))
+        for x, y in cells:
+            i = self.index(x, y)
+            if i >= 0:
+                self.plane[i] = 1
+        if self.watcher is not None:
+            self.watcher.rebuild()
+
+    def has(self, x, y):
+        i = self.index(x, y)
+        return i >= 0 and self.plane[i] == 1
+
+    def add(self, x, y):
+        self._set(x, y, 1)
+
+    def discard(self, x, y):
+        self._set(x, y, 0)
+
+    def _set(self, x, y, value):
+        i = self.index(x, y)
+        if i >= 0 and self.plane[i] != value:
+            self.plane[i] = value
+            if self.watcher is not None:
+                self.watcher.update_cell(x, y)
+
+    def count(self):
+        """Number of set cells, counted in C rather than Python."""
+        return self.plane.count(1)
+
+    # List compatibility
+
+    def __contains__(self, pos):
+        return self.has(pos[0], pos[1])
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        # bytearray.find skips empty cells in C, so sparse layers iterate quickly
+        plane = self.plane
+        i = plane.find(1)
+        while i != -1:
+            yield [i % self.size, i // self.size]
+            i = plane.find(1, i + 1)
+
+    def __eq__(self, other):
+        if isinstance(other, CellLayer):
+            return self.size == other.size and self.plane == other.plane
+        return sorted(self) == sorted(list(cell) for cell in other)
+
+    def __repr__(self):
+        return f"CellLayer({list(self)!r})"
+
+    def append(self, pos):
+        self.add(pos[0], pos[1])
+
+    def remove(self, pos):
+        if pos not in self:
+            raise ValueError(f"{pos} not in layer")
+        self.discard(pos[0], pos[1])
+
+
+class Board:
+    """Grid model with one byte plane per layer: walls, placed blocks, coins and visited."""
+
+    def __init__(self, size):
+        self.size = size
+        self.walls = CellLayer(size)
+        self.placed_blocks = CellLayer(size)
+        self.coins = CellLayer(size)
+        self.visited = CellLayer(size)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def is_blocked(self, x, y):
+        """True for off-board cells, walls and placed blocks."""
+        i = self.walls.index(x, y)
+        return i < 0 or self.walls.plane[i] == 1 or self.placed_blocks.plane[i] == 1
+
+    def sweep(self, x0, y0, x1, y1):
+        """Mark the straight path after (x0, y0) up to (x1, y1) visited and collect its coins.
+
+        Works on whole plane slices, so the cost doesn't grow with Python-level steps.
+        Returns the number of coins picked up.
+        """
+        start = y0 * self.size + x0
+        end = y1 * self.size + x1
+        step = 1 if y0 == y1 else self.size
+        if end > start:
+            path = slice(start + step, end + 1, step)
+        else:
+            path = slice(end, start, step)
+        length = len(range(*path.indices(len(self.visited.plane))))
+        self.visited.plane[path] = b'\x01' * length
+        collected = self.coins.plane[path].count(1)
+        if collected:
+            self.coins.plane[path] = bytes(length)
+        return collected
+
+    def visited_rows(self):
+        """Rows of the visited plane, indexable as grid[y][x] like the old nested lists."""
+        view = memoryview(self.visited.plane)
+        return [view[y * self.size:(y + 1) * self.size] for y in range(self.size)]
+
+
+class SlideTable:
+    """Where an ice slide stops, for every cell and direction.
+
+    Built once per level from the board and patched row/column-wise when a single
+    cell changes, so a move is a table lookup instead of a cell-by-cell walk.
+    It watches the wall and placed-block layers, so every change to them made
+    through CellLayer keeps the table current.
+    """
+
+    DIRECTIONS = {(0, -1): 0, (0, 1): 1, (-1, 0): 2, (1, 0): 3}
+
+    def __init__(self, board):
+        self.board = board
+        self.size = board.size
+        cells = board.size * board.size
+        self.stops = [array('i', range(cells)) for _ in self.DIRECTIONS]
+        board.walls.watcher = board.placed_blocks.watcher = self
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute the whole table."""
+        for y in range(self.size):
+            self._build_row(y)
+        for x in range(self.size):
+            self._build_column(x)
+
+    def update_cell(self, x, y):
+        """Patch the table after the cell at (x, y) was blocked or cleared."""
+        if self.board.in_bounds(x, y):
+            self._build_row(y)
+            self._build_column(x)
+
+    def stop(self, x, y, dx, dy):
+        """Cell where a slide from (x, y) in direction (dx, dy) ends."""
+        i = self.stops[self.DIRECTIONS[(dx, dy)]][y * self.size + x]
+        return i % self.size, i // self.size
+
+    def _build_line(self, first, step, backward, forward):
+        # A slide continues into a free neighbour, so each cell inherits its neighbour's stop
+        walls = self.board.walls.plane
+        placed = self.board.placed_blocks.plane
+        line = range(first, first + step * self.size, step)
+        prev = None
+        for i in line:
+            if prev is not None and not walls[prev] and not placed[prev]:
+                backward[i] = backward[prev]
+            else:
+                backward[i] = i
+            prev = i
+        prev = None
+        for i in reversed(line):
+            if prev is not None and not walls[prev] and not placed[prev]:
+                forward[i] = forward[prev]
+            else:
+                forward[i] = i
+            prev = i
+
+    def _build_row(self, y):
+        self._build_line(y * self.size, 1, self.stops[2], self.stops[3])
+
+    def _build_column(self, x):
+        self._build_line(x, self.size, self.stops[0], self.stops[1])
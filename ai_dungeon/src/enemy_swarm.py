@@ -0,0 +1,387 @@
+import numpy as np
+import pygame
+
+# Per-enemy state kept in the swarm's arrays, with their dtypes
+FIELDS = {
+    'speed': np.float64,
+    'health': np.int64,
+    'max_health': np.int64,
+    'damage': np.int64,
+    'last_damage_time': np.int64,
+    'damage_cooldown': np.int64,
+    'last_move_time': np.int64,
+    'move_delay': np.int64,
+}
+
+SEPARATION = 0.5  # How hard enemies closer than a tile push each other apart, relative to the chase
+DENSE_PAIRS = 48  # Up to this many enemies, check every pair instead of bucketing them by cell
+DENSE_HITS = 4096  # Same for first_hits, in rects times enemies
+
+
+class SwarmField:
+    """Enemy attribute that lives in its swarm's array while the enemy is in one, and on the instance otherwise."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        swarm = enemy.__dict__.get('swarm')
+        if swarm is None:
+            return enemy.__dict__[self.name]
+        return swarm.arrays[self.name][enemy.slot].item()
+
+    def __set__(self, enemy, value):
+        swarm = enemy.__dict__.get('swarm')
+        if swarm is None:
+            enemy.__dict__[self.name] = value
+        else:
+            swarm.arrays[self.name][enemy.slot] = value
+
+
+class SwarmRect:
+    """Enemy rect backed by the swarm's position arrays; reading it gives a fresh Rect."""
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        swarm = enemy.__dict__.get('swarm')
+        if swarm is None:
+            return enemy.__dict__['rect']
+        return swarm.rect(enemy.slot)
+
+    def __set__(self, enemy, rect):
+        swarm = enemy.__dict__.get('swarm')
+        if swarm is None:
+            enemy.__dict__['rect'] = rect
+        else:
+            swarm.x[enemy.slot] = rect.x
+            swarm.y[enemy.slot] = rect.y
+
+
+class EnemySwarm:
+    """All of a level's enemies as NumPy arrays, moved together once per frame.
+
+    step() does for every enemy at once what Enemy.move_towards once did
+    for one: read the next tile off the level's flow field, steer for it while
+    being pushed apart from close neighbours, slide along walls and hazards
+    when the straight step is blocked, and wait when another enemy is in
+    the way. The Enemy objects stay as thin views (SwarmField and SwarmRect)
+    for drawing and for the rest of Game.
+
+    It is also Game's only enemy index: query and collides answer the same
+    questions the enemy SpatialHash did, straight off the arrays.
+    """
+
+    def __init__(self, enemies=(), size=40, tile_size=40, capacity=64):
+        self.size = size  # Every enemy's rect is size x size
+        self.tile_size = tile_size
+        self.count = 0
+        self.capacity = capacity
+        self.x = np.zeros(capacity)  # Rect top-left, kept as floats so slow steps add up
+        self.y = np.zeros(capacity)
+        self.arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in FIELDS.items()}
+        self.members = []  # slot -> Enemy
+        self.level = None  # Level the blocked grid below was built for
+        self.blocked = None
+        self.steps = 0
+        for enemy in enemies:
+            self.insert(enemy)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in ('x', 'y'):
+            setattr(self, name, np.resize(getattr(self, name), self.capacity))
+        for name, array in self.arrays.items():
+            self.arrays[name] = np.resize(array, self.capacity)
+
+    def insert(self, enemy, rect=None):
+        """Move an enemy's state into the arrays and make it a view of its slot."""
+        if enemy.__dict__.get('swarm') is self:
+            return
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        state = enemy.__dict__
+        rect = rect or state['rect']
+        self.x[slot] = rect.x
+        self.y[slot] = rect.y
+        for name in FIELDS:
+            self.arrays[name][slot] = state.pop(name)
+        del state['rect']
+        enemy.swarm = self
+        enemy.slot = slot
+        self.members.append(enemy)
+        self.count += 1
+
+    def _detach(self, enemy):
+        """Copy the enemy's state back onto it and stop it being a view."""
+        slot = enemy.slot
+        state = enemy.__dict__
+        state['rect'] = self.rect(slot)
+        for name in FIELDS:
+            state[name] = self.arrays[name][slot].item()
+        enemy.swarm = None
+        enemy.slot = -1
+
+    def remove_many(self, enemies):
+        """Take out several enemies in one compaction pass, keeping the rest in order."""
+        keep = np.ones(self.count, dtype=bool)
+        for enemy in enemies:
+            if enemy.__dict__.get('swarm') is self:
+                keep[enemy.slot] = False
+                self._detach(enemy)
+        if keep.all():
+            return
+        n = self.count
+        self.count = int(keep.sum())
+        self.x[:self.count] = self.x[:n][keep]
+        self.y[:self.count] = self.y[:n][keep]
+        for array in self.arrays.values():
+            array[:self.count] = array[:n][keep]
+        self.members = [enemy for enemy, kept in zip(self.members, keep) if kept]
+        for slot, enemy in enumerate(self.members):
+            enemy.slot = slot
+
+    def rect(self, slot):
+        return pygame.Rect(int(self.x[slot]), int(self.y[slot]), self.size, self.size)
+
+    def _overlapping(self, rect):
+        n = self.count
+        left = self.x[:n].astype(np.int64)
+        top = self.y[:n].astype(np.int64)
+        return ((left < rect.right) & (left + self.size > rect.left) &
+                (top < rect.bottom) & (top + self.size > rect.top))
+
+    def query(self, rect, ignore=None):
+        """Enemies whose rects overlap `rect`, skipping `ignore`."""
+        return [self.members[i] for i in np.flatnonzero(self._overlapping(rect)) if self.members[i] is not ignore]
+
+    def collides(self, rect, ignore=None):
+        """True if any enemy other than `ignore` overlaps `rect`."""
+        hits = self._overlapping(rect)
+        if ignore is not None and ignore.__dict__.get('swarm') is self:
+            hits[ignore.slot] = False
+        return bool(hits.any())
+
+    def _blocked_grid(self, level):
+        """Walls and hazards per tile with a blocked one-tile border, rebuilt when the level changes."""
+        if level is not self.level:
+            width, height = level.size
+            grid = np.frombuffer(bytes(level.flow.blocked), dtype=np.uint8).reshape(height, width)
+            self.blocked = np.pad(grid.astype(bool), 1, constant_values=True)
+            self.level = level
+        return self.blocked
+
+    def _neighbours(self, item_x, item_y, query_x, query_y, cell):
+        """Index pairs (query, item) for items whose point is in the same cell as the query's or next to it."""
+        if not len(item_x) or not len(query_x):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        item_cell_x = item_x // cell
+        item_cell_y = item_y // cell
+        # Shift so every neighbour of an occupied cell has a key in the table
+        low_x = item_cell_x.min() - 1
+        low_y = item_cell_y.min() - 1
+        item_cell_x = item_cell_x - low_x
+        item_cell_y = item_cell_y - low_y
+        stride = int(item_cell_x.max()) + 2
+        rows = int(item_cell_y.max()) + 2
+        keys = item_cell_y * stride + item_cell_x
+        order = np.argsort(keys, kind='stable')
+        counts = np.bincount(keys, minlength=rows * stride)
+        starts = np.cumsum(counts) - counts
+
+        # Queries outside the occupied cells are pulled in to the edge; the
+        # neighbours they gain there get rejected by the caller's exact test
+        query_cell_x = np.minimum(np.maximum(query_x // cell - low_x, 1), stride - 2)
+        query_cell_y = np.minimum(np.maximum(query_y // cell - low_y, 1), rows - 2)
+        query_keys = query_cell_y * stride + query_cell_x
+
+        # Every query against each of the 9 cells around its own, all in one go
+        offsets = np.array([dy * stride + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+        wanted = (query_keys[None, :] + offsets[:, None]).ravel()
+        runs = counts[wanted]
+        total = int(runs.sum())
+        first = np.repeat(np.tile(np.arange(len(query_x)), len(offsets)), runs)
+        # Position of each pair within its run, added to where the cell's run starts
+        within = np.arange(total) - np.repeat(np.cumsum(runs) - runs, runs)
+        second = order[np.repeat(starts[wanted], runs) + within]
+        return first, second
+
+    def _pairs(self, cx, cy, cell):
+        """Index pairs (i, j), i != j, of enemies whose centres are in the same or neighbouring cells."""
+        n = len(cx)
+        if n <= DENSE_PAIRS:
+            # Few enough to pair everyone with everyone for less than sorting costs
+            first, second = np.nonzero(~np.eye(n, dtype=bool))
+            return first, second
+        first, second = self._neighbours(cx, cy, cx, cy, cell)
+        distinct = first != second
+        return first[distinct], second[distinct]
+
+    def first_hits(self, left, top, right, bottom):
+        """For each rect given as arrays of edges, the lowest slot of an enemy it overlaps, or -1."""
+        n = self.count
+        hits = np.full(len(left), -1, dtype=np.int64)
+        if not n or not len(left):
+            return hits
+        size = self.size
+        enemy_left = self.x[:n].astype(np.int64)
+        enemy_top = self.y[:n].astype(np.int64)
+        if len(left) * n <= DENSE_HITS:
+            # Small enough to test every rect against every enemy outright
+            overlap = ((left[:, None] < enemy_left + size) & (right[:, None] > enemy_left) &
+                       (top[:, None] < enemy_top + size) & (bottom[:, None] > enemy_top))
+            found = overlap.any(axis=1)
+            hits[found] = overlap[found].argmax(axis=1)
+            return hits
+        # Cells big enough that an overlapping enemy is never more than one cell away
+        extent = int(max((right - left).max(), (bottom - top).max()))
+        cell = size + max(size, extent)
+        query, slot = self._neighbours(enemy_left + size // 2, enemy_top + size // 2,
+                                       (left + right) // 2, (top + bottom) // 2, cell)
+        overlap = ((left[query] < enemy_left[slot] + size) & (right[query] > enemy_left[slot]) &
+                   (top[query] < enemy_top[slot] + size) & (bottom[query] > enemy_top[slot]))
+        query, slot = query[overlap], slot[overlap]
+        lowest = np.full(len(left), n, dtype=np.int64)
+        np.minimum.at(lowest, query, slot)
+        hits[lowest < n] = lowest[lowest < n]
+        return hits
+
+    def step(self, target_rect, level, current_time):
+        """Move every enemy whose move_delay has passed one step towards `target_rect`.
+
+        Returns the number of enemies that moved.
+        """
+        n = self.count
+        if not n:
+            return 0
+        self.steps += 1
+        arrays = self.arrays
+        size = self.size
+        half = size // 2
+        flow = level.flow_towards(target_rect)
+        tile_size = self.tile_size
+        width, height = level.size
+        blocked = self._blocked_grid(level)
+
+        left = self.x[:n].astype(np.int64)
+        top = self.y[:n].astype(np.int64)
+        due = (current_time - arrays['last_move_time'][:n]) >= arrays['move_delay'][:n]
+
+        # Goal: centre of the next tile on the flow field, or the target itself
+        # once next to it or when there is no path
+        cx = left + half
+        cy = top + half
+        tile_x = cx // tile_size
+        tile_y = cy // tile_size
+        inside = (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+        next_tiles = np.frombuffer(flow.next_tile, dtype=np.int32)
+        step = np.full(n, -1, dtype=np.int64)
+        step[inside] = next_tiles[(tile_y * width + tile_x)[inside]]
+        target_tile = flow.target[1] * width + flow.target[0]
+        direct = (step == -1) | (step == target_tile)
+        goal_x = np.where(direct, target_rect.centerx, step % width * tile_size + tile_size // 2)
+        goal_y = np.where(direct, target_rect.centery, step // width * tile_size + tile_size // 2)
+        dx = (goal_x - cx).astype(np.float64)
+        dy = (goal_y - cy).astype(np.float64)
+        distance = np.hypot(dx, dy)
+        due &= distance > 0
+        if not due.any():
+            return 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chase_x = np.where(due, dx / distance, 0.0)
+            chase_y = np.where(due, dy / distance, 0.0)
+
+        # Neighbours that can push or block each other this step: both may move
+        # up to their speed (plus a pixel from rounding the float position down to
+        # the rect), so anything further apart than that plus a rect is out
+        first, second = self._pairs(cx, cy, size * 2)
+        reach = size + 2 * (float(arrays['speed'][:n].max()) + 1)
+        near = (np.abs(cx[first] - cx[second]) < reach) & (np.abs(cy[first] - cy[second]) < reach)
+        first, second = first[near], second[near]
+
+        # Separation: enemies closer than a tile push each other apart
+        push_x = np.zeros(n)
+        push_y = np.zeros(n)
+        if len(first):
+            apart_x = (cx[first] - cx[second]).astype(np.float64)
+            apart_y = (cy[first] - cy[second]).astype(np.float64)
+            apart = np.hypot(apart_x, apart_y)
+            close = (apart > 0) & (apart < size)
+            weight = np.where(close, (1 - apart / size) / np.where(close, apart, 1), 0.0)
+            push_x = np.bincount(first, apart_x * weight, n)
+            push_y = np.bincount(first, apart_y * weight, n)
+        steer_x = chase_x + SEPARATION * push_x
+        steer_y = chase_y + SEPARATION * push_y
+        steer = np.hypot(steer_x, steer_y)
+        due &= steer > 0
+        length = np.minimum(arrays['speed'][:n], distance) / np.where(steer > 0, steer, 1)
+        move_x = np.where(due, steer_x * length, 0.0)
+        move_y = np.where(due, steer_y * length, 0.0)
+
+        # Wall sliding: take the first of the full step, x only, y only that
+        # changes the rect without touching a blocked tile
+        chosen = np.full(n, -1, dtype=np.int8)
+        new_x = self.x[:n].copy()
+        new_y = self.y[:n].copy()
+        tries = []
+        for option, (use_x, use_y) in enumerate(((1, 1), (1, 0), (0, 1))):
+            try_x = self.x[:n] + move_x * use_x
+            try_y = self.y[:n] + move_y * use_y
+            try_left = try_x.astype(np.int64)
+            try_top = try_y.astype(np.int64)
+            changed = (try_left != left) | (try_top != top)
+            # Off the map counts as the blocked border (np.clip is slow on small arrays)
+            x0 = np.minimum(np.maximum(try_left // tile_size + 1, 0), width + 1)
+            x1 = np.minimum(np.maximum((try_left + size - 1) // tile_size + 1, 0), width + 1)
+            y0 = np.minimum(np.maximum(try_top // tile_size + 1, 0), height + 1)
+            y1 = np.minimum(np.maximum((try_top + size - 1) // tile_size + 1, 0), height + 1)
+            hit = blocked[y0, x0] | blocked[y0, x1] | blocked[y1, x0] | blocked[y1, x1]
+            take = due & (chosen == -1) & changed & ~hit
+            chosen[take] = option
+            new_x[take] = try_x[take]
+            new_y[take] = try_y[take]
+            tries.append((try_x, try_y, changed, hit))
+        # Steps too small to change the rect yet still count
+        creep = due & (chosen == -1) & ((self.x[:n] + move_x).astype(np.int64) == left) & \
+            ((self.y[:n] + move_y).astype(np.int64) == top)
+        new_x[creep] += move_x[creep]
+        new_y[creep] += move_y[creep]
+        # Blocked on the full step and on one axis, with under a pixel to go on the
+        # other: keep that fraction so the slide adds up to a pixel over a few frames
+        # instead of stalling against the wall for good
+        for option, axis_move in ((1, move_x), (2, move_y)):
+            try_x, try_y, changed, hit = tries[option]
+            take = due & (chosen == -1) & ~creep & ~changed & ~hit & (axis_move != 0)
+            chosen[take] = option
+            new_x[take] = try_x[take]
+            new_y[take] = try_y[take]
+
+        # Enemy overlap: wait if the new rect would overlap another enemy where it
+        # stands, or where a lower slot is moving to this frame. Only slots not
+        # already waiting on where others stand count as moving, so two enemies
+        # that each want the other's spot don't both wait for good
+        moving = chosen >= 0
+        if len(first):
+            new_left = new_x.astype(np.int64)
+            new_top = new_y.astype(np.int64)
+            candidate = moving[first]
+            f, s = first[candidate], second[candidate]
+            on_current = (np.abs(new_left[f] - left[s]) < size) & (np.abs(new_top[f] - top[s]) < size)
+            waiting = np.zeros(n, dtype=bool)
+            waiting[f[on_current]] = True
+            moving &= ~waiting
+            on_new = ((s < f) & moving[s] &
+                      (np.abs(new_left[f] - new_left[s]) < size) & (np.abs(new_top[f] - new_top[s]) < size))
+            moving[f[on_new]] = False
+        moving |= creep
+
+        self.x[:n] = np.where(moving, new_x, self.x[:n])
+        self.y[:n] = np.where(moving, new_y, self.y[:n])
+        arrays['last_move_time'][:n][due] = current_time
+        return int(moving.sum())
@@ -0,0 +1,57 @@
+from array import array
+
+
+class FlowField:
+    """For every walkable tile, the next tile on a shortest 4-neighbour path to a target tile.
+
+    One breadth-first pass from the target fills the whole field, so any
+    number of chasers can read their next step with a single lookup. It is
+    only rebuilt when the target moves to another tile.
+    """
+
+    def __init__(self, width, height, blocked_tiles=()):
+        self.width = width
+        self.height = height
+        self.blocked = bytearray(width * height)
+        for x, y in blocked_tiles:
+            if 0 <= x < width and 0 <= y < height:
+                self.blocked[y * width + x] = 1
+        self.next_tile = array('i', [-1]) * (width * height)  # Tile index, -1 where the target can't be reached
+        self.target = None
+        self.builds = 0
+
+    def update(self, tile_x, tile_y):
+        """Point the field at (tile_x, tile_y). Returns True if it had to be rebuilt."""
+        if (tile_x, tile_y) == self.target:
+            return False
+        self.target = (tile_x, tile_y)
+        self.builds += 1
+        width = self.width
+        blocked = self.blocked
+        self.next_tile = next_tile = array('i', [-1]) * (width * self.height)
+        if not (0 <= tile_x < width and 0 <= tile_y < self.height):
+            return True
+
+        # The target tile itself may be blocked (standing in fire); paths still lead to it
+        start = tile_y * width + tile_x
+        next_tile[start] = start
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                x = i % width
+                for j in (i - width, i + width, i - 1 if x > 0 else -1, i + 1 if x < width - 1 else -1):
+                    if 0 <= j < len(blocked) and not blocked[j] and next_tile[j] == -1:
+                        next_tile[j] = i
+                        next_frontier.append(j)
+            frontier = next_frontier
+        return True
+
+    def step_from(self, tile_x, tile_y):
+        """Next tile towards the target as (x, y), the tile itself once there, or None if unreachable."""
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return None
+        i = self.next_tile[tile_y * self.width + tile_x]
+        if i == -1:
+            return None
+        return i % self.width, i // self.width
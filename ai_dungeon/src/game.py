@@ -4,11 +4,20 @@ import random
 import math
 import time
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from spatial_hash import SpatialHash
+from hazard_grid import HazardGrid
+from reachability import FloorConnectivity
+from flow_field import FlowField
+from assets import ASSETS
+from enemy_swarm import EnemySwarm, SwarmField, SwarmRect
+from projectiles import ArrowPool
+from spawn_index import SpawnIndex
 
 # Initialize Pygame with error handling
 try:
-    # Set SDL video driver explicitly
-    os.environ['SDL_VIDEODRIVER'] = 'x11'  # Try x11 first
+    # Set SDL video driver explicitly, unless one was chosen (e.g. 'dummy' for benchmarks)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'x11')  # Try x11 first
     pygame.init()
 except pygame.error:
     try:
@@ -56,35 +65,20 @@ class PowerUpType(Enum):
     HEALTH_POTION = 1
     MAGIC_STAFF = 2
 
-class Arrow:
-    def __init__(self, x, y, direction):
-        self.rect = pygame.Rect(x, y, 8, 8)  # Small arrow
-        self.direction = direction  # (dx, dy)
-        self.speed = 15
-        self.damage = 20
-        self.active = True
-    
-    def update(self, walls):
-        new_rect = self.rect.copy()
-        new_rect.x += self.direction[0] * self.speed
-        new_rect.y += self.direction[1] * self.speed
-        
-        # Check wall collisions
-        for wall in walls:
-            if new_rect.colliderect(wall):
-                self.active = False
-                return
-        
-        self.rect = new_rect
-    
-    def draw(self, screen):
-        pygame.draw.rect(screen, COLORS['yellow'], self.rect)
+# Builds upcoming levels in the background; one worker so builds never compete with each other
+LEVEL_BUILDER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-builder')
+
+# Every image the game draws, as (path, size), preloaded when the game starts
+SPRITE_ASSETS = (
+    [(f'../assets/images/sprites/{name}.png', PLAYER_SIZE) for name in ('player', 'enemy')] +
+    [(f'../assets/images/sprites/{name}.png', TILE_SIZE) for name in ('potion', 'staff')] +
+    [(f'../assets/images/tiles/{name}_{i}.png', TILE_SIZE) for name in ('floor', 'wall') for i in range(3)]
+)
 
 class Sprite:
     def __init__(self, image_path, size=None):
-        self.image = pygame.image.load(image_path).convert_alpha()
-        if size:
-            self.image = pygame.transform.scale(self.image, (size, size))
+        # Shared with every other Sprite of the same image; replace it rather than draw on it
+        self.image = ASSETS.image(image_path, size)
         self.rect = self.image.get_rect()
 
 class Direction(Enum):
@@ -136,7 +130,7 @@ class Player:
         self.grid_move_size = TILE_SIZE  # Move 1 tile at a time
         self.health = 100
         self.max_health = 100
-        self.arrows = []  # List of active arrows
+        self.arrows = ArrowPool(tile_size=TILE_SIZE)  # Active arrows
         self.last_shot_time = 0
         self.shoot_delay = 500  # Milliseconds between shots
         self.facing = Direction.RIGHT  # Default facing direction
@@ -146,7 +140,7 @@ class Player:
         self.is_moving = False  # Track if currently in a move
         self.damage_multiplier = 1.0  # For magic staff power-up
         
-    def move(self, dx, dy, walls):
+    def move(self, dx, dy, wall_index):
         if self.is_moving:
             return False  # Don't start a new move if one is in progress
             
@@ -160,11 +154,7 @@ class Player:
         new_rect = pygame.Rect(new_x, new_y, self.rect.width, self.rect.height)
         
         # Check wall collisions
-        can_move = True
-        for wall in walls:
-            if new_rect.colliderect(wall):
-                can_move = False
-                break
+        can_move = not wall_index.collides(new_rect)
         
         if can_move:
             self.rect.x = new_x
@@ -175,11 +165,7 @@ class Player:
             new_y = self.rect.y + dy * TILE_SIZE
             new_rect = pygame.Rect(new_x, new_y, self.rect.width, self.rect.height)
             
-            can_move = True
-            for wall in walls:
-                if new_rect.colliderect(wall):
-                    can_move = False
-                    break
+            can_move = not wall_index.collides(new_rect)
             
             if can_move:
                 self.rect.x = new_x
@@ -192,8 +178,7 @@ class Player:
         current_time = pygame.time.get_ticks()
         if current_time - self.last_shot_time >= self.shoot_delay:
             # Create new arrow at player position
-            arrow = Arrow(self.rect.centerx, self.rect.centery, direction)
-            self.arrows.append(arrow)
+            self.arrows.fire(self.rect.centerx, self.rect.centery, direction)
             self.last_shot_time = current_time
     
     def draw(self, screen):
@@ -212,8 +197,7 @@ class Player:
             pygame.draw.rect(screen, indicator_color, (self.rect.right + 1, self.rect.centery - 2, 4, 4))
         
         # Draw arrows
-        for arrow in self.arrows:
-            arrow.draw(screen)
+        self.arrows.draw(screen, COLORS['yellow'])
         
         # Draw health bar
         pygame.draw.rect(screen, COLORS['red'], (10, 10, 200, 20))
@@ -221,6 +205,19 @@ class Player:
                         (10, 10, 200 * (self.health / self.max_health), 20))
 
 class Enemy:
+    swarm = None  # EnemySwarm holding this enemy's state, and its slot there
+    slot = -1
+    # Stored in the enemy's EnemySwarm while it is in one (see enemy_swarm.py)
+    rect = SwarmRect()
+    speed = SwarmField()
+    health = SwarmField()
+    max_health = SwarmField()
+    damage = SwarmField()
+    last_damage_time = SwarmField()
+    damage_cooldown = SwarmField()
+    last_move_time = SwarmField()
+    move_delay = SwarmField()
+
     def __init__(self, x, y, level=1):
         self.sprite = Sprite('../assets/images/sprites/enemy.png', PLAYER_SIZE)
         self.rect = pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
@@ -250,88 +247,6 @@ class Enemy:
         # Draw foreground (green)
         pygame.draw.rect(screen, COLORS['green'],
                         (self.rect.x, health_y, health_width, health_height))
-    
-    def move_towards(self, target, walls, other_enemies, lava_tiles, fire_pillars):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_move_time < self.move_delay:
-            return
-        
-        # Calculate direction to player
-        dx = target.rect.centerx - self.rect.centerx
-        dy = target.rect.centery - self.rect.centery
-        
-        # Normalize direction
-        distance = math.sqrt(dx * dx + dy * dy)
-        if distance == 0:
-            return
-        
-        dx = (dx / distance) * self.speed
-        dy = (dy / distance) * self.speed
-        
-        # Try moving in both x and y directions
-        new_rect = self.rect.copy()
-        new_rect.x += dx
-        new_rect.y += dy
-        
-        # In Level 3, enemies can move freely but need to avoid poison
-        is_level_3 = hasattr(target, 'current_level') and target.current_level == 3
-        if is_level_3:
-            # First check if the new position would be too close to poison
-            can_move = True
-            for pillar in fire_pillars:
-                if hasattr(pillar, 'colors') and pillar.colors[0] == COLORS['poison']:
-                    # Check if we're getting too close to poison
-                    poison_center_x = pillar.rect.centerx
-                    poison_center_y = pillar.rect.centery
-                    new_center_x = new_rect.centerx
-                    new_center_y = new_rect.centery
-                    
-                    # Calculate distance to poison tile
-                    distance = ((poison_center_x - new_center_x) ** 2 + 
-                               (poison_center_y - new_center_y) ** 2) ** 0.5
-                    
-                    # If we're too close to poison, try to move away
-                    if distance < TILE_SIZE * 1.5:  # Keep 1.5 tiles away from poison
-                        can_move = False
-                        break
-            
-            if can_move:
-                self.rect = new_rect
-                self.last_move_time = current_time
-            return
-        
-        # For other levels, check all collisions
-        can_move = True
-        
-        # Check wall collisions
-        for wall in walls:
-            if new_rect.colliderect(wall):
-                can_move = False
-                break
-        
-        # Check fire pillar collisions
-        for pillar in fire_pillars:
-            if new_rect.colliderect(pillar.rect):
-                can_move = False
-                break
-        
-        # Check lava tile collisions
-        for lava in lava_tiles:
-            if new_rect.colliderect(lava):
-                can_move = False
-                break
-        
-        # Check other enemy collisions
-        for other in other_enemies:
-            if other != self and new_rect.colliderect(other.rect):
-                can_move = False
-                break
-        
-        # If we can move, update position
-        if can_move:
-            self.rect = new_rect
-        
-        self.last_move_time = current_time
 
 class Boss(Enemy):
     def __init__(self, x, y):
@@ -360,117 +275,6 @@ class Boss(Enemy):
         self.max_health = 120
         self.damage = 30  # Double enemy damage (15 * 2)
         
-    def move_towards(self, target, walls, other_enemies, lava_tiles, fire_pillars):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_move_time < self.move_delay:
-            return
-            
-        self.last_move_time = current_time
-        
-        dx = target.rect.x - self.rect.x
-        dy = target.rect.y - self.rect.y
-        dist = math.sqrt(dx * dx + dy * dy)
-        
-        if dist == 0:
-            return
-            
-        # Normalize direction vector
-        dx = dx / dist
-        dy = dy / dist
-        
-        # Check if near a wall
-        near_wall = False
-        wall_check_rect = self.rect.inflate(20, 20)  # Slightly larger rect to check wall proximity
-        for wall in walls:
-            if wall_check_rect.colliderect(wall):
-                near_wall = True
-                break
-        
-        # Create movement options with weighted preference for direct path
-        directions = [
-            (dx, dy),      # Direct path
-            (dx, dy),      # Try direct path again
-            (dx * 0.866, dy * 0.5),  # 30 degree offset
-            (dx * 0.5, dy * 0.866),  # 60 degree offset
-            (-dx * 0.5, dy * 0.866),  # -60 degree offset
-            (dx * 0.866, -dy * 0.5),  # Alternate 30 degree
-            (1, 0), (-1, 0), (0, 1), (0, -1),  # Cardinal directions
-            (0.707, 0.707), (-0.707, 0.707),    # 45 degree angles
-            (0.707, -0.707), (-0.707, -0.707)   # More 45 degree angles
-        ]
-        
-        # If near a wall, try more varied movements
-        if near_wall:
-            directions.extend([
-                (-dx, -dy),  # Try opposite direction
-                (-dx * 0.866, -dy * 0.5),  # Opposite 30 degree
-                (-dx * 0.5, -dy * 0.866),  # Opposite 60 degree
-                (dy, -dx), (-dy, dx)  # Perpendicular directions
-            ])
-        
-        # Try each direction with increasingly smaller steps
-        for direction in directions:
-            base_speed = self.speed * random.uniform(0.8, 1.0)  # Slight speed variation
-            
-            # Try different step sizes, use smaller steps when near walls
-            step_sizes = [0.5, 0.25, 0.125] if near_wall else [1.0, 0.75, 0.5, 0.25]
-            for step_size in step_sizes:
-                move_dx = direction[0] * base_speed * step_size
-                move_dy = direction[1] * base_speed * step_size
-                
-                # Test the movement
-                test_rect = self.rect.copy()
-                test_rect.x += move_dx
-                test_rect.y += move_dy
-                
-                # Check boundaries with some padding
-                padding = TILE_SIZE // 2
-                if (test_rect.left < padding or 
-                    test_rect.right > WINDOW_WIDTH - padding or
-                    test_rect.top < padding or 
-                    test_rect.bottom > WINDOW_HEIGHT - padding):
-                    continue
-                
-                # Check for collisions with a small buffer
-                test_rect.inflate_ip(4, 4)  # Add buffer
-                
-                # Quick collision checks
-                collision = False
-                
-                # Check walls
-                for wall in walls:
-                    if test_rect.colliderect(wall):
-                        collision = True
-                        break
-                if collision:
-                    continue
-                
-                # Check hazards (lava and fire pillars)
-                for hazard in lava_tiles + [p.rect for p in fire_pillars]:
-                    if test_rect.colliderect(hazard):
-                        collision = True
-                        break
-                if collision:
-                    continue
-                
-                # Check other enemies with reduced buffer
-                test_rect.inflate_ip(-2, -2)
-                for enemy in other_enemies:
-                    if enemy != self and test_rect.colliderect(enemy.rect):
-                        collision = True
-                        break
-                if collision:
-                    continue
-                
-                # Movement is valid, apply it with slight smoothing
-                self.rect.x += move_dx
-                self.rect.y += move_dy
-                return True
-        
-        return False
-
-
-
     def draw(self, screen):
         # Draw the enemy sprite
         screen.blit(self.sprite.image, self.rect)
@@ -495,60 +299,84 @@ class Boss(Enemy):
 
 
 
+# Fire pillar animation atlas: every pillar of a kind shares these frames
+PILLAR_PATTERNS = 8  # Different hole patterns for lava tiles
+PILLAR_FRAMES = 8  # Colour frames each pattern cycles through
+PILLAR_ATLAS = {}  # is_poison -> [pattern][frame] -> Surface
+
+
+def pillar_atlas(is_poison):
+    """Pre-rendered pillar frames, built on first use and shared by every pillar.
+
+    Game builds both atlases on the main thread before any level is built in the
+    background, so the level builder only ever reads them.
+    """
+    atlas = PILLAR_ATLAS.get(is_poison)
+    if atlas is not None:
+        return atlas
+    rng = random.Random(int(is_poison))  # Own generator, so the game's sequence is untouched
+    pixel_size = TILE_SIZE // 4  # 4x4 grid
+    if is_poison:
+        colors = [COLORS['poison'], COLORS['poison_light'], COLORS['poison_dark'], COLORS['obsidian']]
+        # Poison is solid, so one pattern covers it
+        patterns = [[(i, j) for i in range(4) for j in range(4)]]
+    else:
+        colors = [COLORS['dark_red'], COLORS['red'], COLORS['orange']]
+        # Lava tiles have an 80% chance of a pixel in each cell
+        patterns = [[(i, j) for i in range(4) for j in range(4) if rng.random() > 0.2]
+                    for _ in range(PILLAR_PATTERNS)]
+    atlas = []
+    for pattern in patterns:
+        frames = []
+        for _ in range(PILLAR_FRAMES):
+            frame = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            frame.fill(COLORS['dark_red'])  # Base
+            for i, j in pattern:
+                frame.fill(rng.choice(colors), (i * pixel_size, j * pixel_size, pixel_size, pixel_size))
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert()  # Match the screen so blits are straight copies
+            frames.append(frame)
+        atlas.append(frames)
+    PILLAR_ATLAS[is_poison] = atlas
+    return atlas
+
+
 class FirePillar:
-    def __init__(self, x, y, is_poison=False):
+    def __init__(self, x, y, is_poison=False, rng=random):
         self.x = x
         self.y = y
         self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        self.pixels = []
-        self.next_update = 0
+        self.is_poison = is_poison
         self.update_delay = 400  # Slower updates (was 150)
         if is_poison:
             self.colors = [COLORS['poison'], COLORS['poison_light'], COLORS['poison_dark'], COLORS['obsidian']]
-            # For poison, use a solid color instead of pixels
-            self.fixed_pattern = [(i, j) for i in range(4) for j in range(4)]
         else:
             self.colors = [COLORS['dark_red'], COLORS['red'], COLORS['orange']]
-            # Generate a fixed pattern for lava tile
-            self.fixed_pattern = [(i, j) for i in range(4) for j in range(4) 
-                                 if random.random() > 0.2]  # 80% chance of pixel
-        self.generate_pixels()
+        # Which pattern of the shared atlas to use, and where in its cycle to start
+        # so neighbouring pillars don't flicker in step
+        patterns = pillar_atlas(is_poison)
+        self.frames = patterns[rng.randrange(len(patterns))]
+        self.phase = rng.randrange(PILLAR_FRAMES)
+        self.frame = self.phase
     
-    def generate_pixels(self):
-        # Use the fixed pattern but randomize colors
-        self.pixels = []
-        pixel_size = TILE_SIZE // 4  # 4x4 grid
-        
-        for i, j in self.fixed_pattern:
-            self.pixels.append({
-                'x': self.x + i * pixel_size,
-                'y': self.y + j * pixel_size,
-                'size': pixel_size,
-                'color': random.choice(self.colors)
-            })
-    
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        if current_time > self.next_update:
-            self.generate_pixels()
-            self.next_update = current_time + self.update_delay
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        self.frame = (current_time // self.update_delay + self.phase) % PILLAR_FRAMES
     
     def draw(self, screen):
-        # Draw base
-        pygame.draw.rect(screen, COLORS['dark_red'], self.rect)
-        
-        # Draw retro pixel pattern
-        for pixel in self.pixels:
-            pygame.draw.rect(screen, pixel['color'],
-                           (pixel['x'], pixel['y'], 
-                            pixel['size'], pixel['size']))
+        screen.blit(self.frames[self.frame], self.rect)
 
 class Level:
-    def __init__(self, level_number):
+    def __init__(self, level_number, size=None, rng=random):
         self.level_number = level_number
+        # Layout, pillars, floor texture and spawns all draw from this, so a
+        # level built on the builder thread can be reproduced from its seed
+        self.rng = rng
+        # Map size in tiles, one screen by default
+        self.size = size or (WINDOW_WIDTH // TILE_SIZE, WINDOW_HEIGHT // TILE_SIZE)
         self.walls = []  # Initialize walls list first
         self.fire_pillars = []
-        self.lava_tiles = []  # Track lava tile positions
         self.tiles = {
             'floor': [Sprite(f'../assets/images/tiles/floor_{i}.png', TILE_SIZE) for i in range(3)],
             'wall': [Sprite(f'../assets/images/tiles/wall_{i}.png', TILE_SIZE) for i in range(3)]
@@ -562,24 +390,36 @@ class Level:
             self.is_poison_level = False
         self.tilemap = self.generate_tilemap()
         
+        # Collision lookup over the finished layout (hazards are indexed in generate_tilemap)
+        self.wall_index = SpatialHash(TILE_SIZE, self.walls)
+        # Shared enemy pathing around walls and hazards
+        self.flow = FlowField(*self.size, (
+            (x, y) for y, row in enumerate(self.tilemap) for x, (tile_type, _) in enumerate(row)
+            if tile_type == 'wall' or self.hazards.at(x, y)))
+        # Room for the player, enemies and power-ups
+        self.spawns = SpawnIndex(
+            *self.size,
+            ((x, y) for y, row in enumerate(self.tilemap) for x, (tile_type, _) in enumerate(row) if tile_type == 'wall'),
+            ((rect.x // TILE_SIZE, rect.y // TILE_SIZE) for rect in self.hazards.rects))
+        self.background = None  # Floor and walls, rendered by the first draw
+        self.layer = None  # Background with the current pillar frames on top
+        self.layer_stale = True
+        
     def is_accessible(self, tilemap, start_x, start_y):
+        """True if every floor tile can be walked to from (start_x, start_y), walls blocking."""
         width = len(tilemap[0])
         height = len(tilemap)
-        visited = set()
-        
-        def flood_fill(x, y):
-            if (x, y) in visited:
-                return
-            if (x < 0 or x >= width or y < 0 or y >= height):
-                return
-            if tilemap[y][x][0] == 'wall':
-                return
-            visited.add((x, y))
+        visited = {(start_x, start_y)}
+        stack = [(start_x, start_y)]
+        # Iterative flood fill, so big maps don't hit the recursion limit
+        while stack:
+            x, y = stack.pop()
             for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                flood_fill(x + dx, y + dy)
-        
-        # Start flood fill from given position
-        flood_fill(start_x, start_y)
+                nx, ny = x + dx, y + dy
+                if (0 <= nx < width and 0 <= ny < height and (nx, ny) not in visited and
+                        tilemap[ny][nx][0] != 'wall'):
+                    visited.add((nx, ny))
+                    stack.append((nx, ny))
         
         # Check if all floor tiles are reachable
         for y in range(height):
@@ -589,64 +429,52 @@ class Level:
         return True
     
     def generate_tilemap(self):
-        width = WINDOW_WIDTH // TILE_SIZE
-        height = WINDOW_HEIGHT // TILE_SIZE
+        width, height = self.size
+        # Obstacle and pool counts are tuned for a 20x15 screen; bigger maps get proportionally more
+        scale = max(1, (width * height) // 300)
         tilemap = []
         self.walls = []
         self.fire_pillars = []
+        hazard_tiles = set()
+        
+        def add_pillar(tile_x, tile_y, is_poison=False):
+            # Overlapping pools and the border corners would otherwise stack pillars
+            if (tile_x, tile_y) not in hazard_tiles:
+                hazard_tiles.add((tile_x, tile_y))
+                self.fire_pillars.append(FirePillar(tile_x * TILE_SIZE, tile_y * TILE_SIZE, is_poison, self.rng))
         
         # Create empty tilemap with floor tiles
+        floors = [('floor', variant) for variant in range(3)]
         for y in range(height):
-            row = []
-            for x in range(width):
-                variant = random.randint(0, 2)
-                row.append(('floor', variant))
-            tilemap.append(row)
+            tilemap.append(self.rng.choices(floors, k=width))
         
         if self.level_number == 3:
-            # Level 3: Create maze-like pattern of poison pools
-            num_pools = random.randint(6, 8)  # Number of poison pool clusters
+            # Level 3: Create maze-like pattern of poison pools. Poison is
+            # deadly, so pools count as blocking when checking the floor stays connected
+            connectivity = FloorConnectivity(width, height)
+            num_pools = self.rng.randint(6, 8) * scale  # Number of poison pool clusters
             for _ in range(num_pools):
-                x = random.randint(2, width-3)
-                y = random.randint(2, height-3)
-                size = random.randint(3, 4)  # Size of each poison pool cluster
-                
-                # Create temporary map to test accessibility
-                temp_tilemap = [row[:] for row in tilemap]
+                x = self.rng.randint(2, width-3)
+                y = self.rng.randint(2, height-3)
+                size = self.rng.randint(3, 4)  # Size of each poison pool cluster
                 
                 # Try to add poison pool cluster
+                pool = []
                 for i in range(size):
                     for j in range(size):
-                        if random.random() < 0.7:  # 70% chance to add a poison pool in the cluster
+                        if self.rng.random() < 0.7:  # 70% chance to add a poison pool in the cluster
                             if 0 <= y+i < height-1 and 0 <= x+j < width-1:
-                                temp_tilemap[y+i][x+j] = ('poison', 0)
+                                pool.append((x+j, y+i))
                 
-                # Check if map is still accessible
-                start_x = start_y = None
-                for test_y in range(1, height-1):
-                    for test_x in range(1, width-1):
-                        if temp_tilemap[test_y][test_x][0] == 'floor':
-                            start_x = test_x
-                            start_y = test_y
-                            break
-                    if start_x is not None:
-                        break
-                
-                if start_x is not None and self.is_accessible(temp_tilemap, start_x, start_y):
-                    # If accessible, apply changes and add poison pillars
-                    for i in range(size):
-                        for j in range(size):
-                            if 0 <= y+i < height-1 and 0 <= x+j < width-1:
-                                if temp_tilemap[y+i][x+j][0] == 'poison':
-                                    px = (x+j) * TILE_SIZE
-                                    py = (y+i) * TILE_SIZE
-                                    self.fire_pillars.append(FirePillar(px, py, is_poison=True))
-                                    self.lava_tiles.append(pygame.Rect(px, py, TILE_SIZE, TILE_SIZE))
+                # Only keep the pool if the floor is still all one region
+                if connectivity.block(pool):
+                    for tile_x, tile_y in pool:
+                        add_pillar(tile_x, tile_y, is_poison=True)
         else:
             # Level 1 and 2: Regular walls and fire
             # Add walls around edges
             for x in range(width):
-                variant = random.randint(0, 2)
+                variant = self.rng.randint(0, 2)
                 tilemap[0][x] = ('wall', variant)
                 tilemap[height-1][x] = ('wall', variant)
                 self.walls.append(pygame.Rect(x * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE))
@@ -654,11 +482,11 @@ class Level:
                 
                 # Add continuous fire along top and bottom
                 if x > 0 and x < width-1:
-                    self.fire_pillars.append(FirePillar(x * TILE_SIZE, TILE_SIZE))
-                    self.fire_pillars.append(FirePillar(x * TILE_SIZE, (height-2) * TILE_SIZE))
+                    add_pillar(x, 1)
+                    add_pillar(x, height-2)
             
             for y in range(height):
-                variant = random.randint(0, 2)
+                variant = self.rng.randint(0, 2)
                 tilemap[y][0] = ('wall', variant)
                 tilemap[y][width-1] = ('wall', variant)
                 self.walls.append(pygame.Rect(0, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
@@ -666,68 +494,65 @@ class Level:
                 
                 # Add continuous fire along left and right
                 if y > 0 and y < height-1:
-                    self.fire_pillars.append(FirePillar(TILE_SIZE, y * TILE_SIZE))
-                    self.fire_pillars.append(FirePillar((width-2) * TILE_SIZE, y * TILE_SIZE))
+                    add_pillar(1, y)
+                    add_pillar(width-2, y)
             
             # Add random obstacles with validation
-            num_obstacles = random.randint(5, 8)  # Reduced max obstacles
+            connectivity = FloorConnectivity(width, height, (
+                (x, y) for y in range(height) for x in range(width) if tilemap[y][x][0] == 'wall'))
+            num_obstacles = self.rng.randint(5, 8) * scale  # Reduced max obstacles
             for _ in range(num_obstacles):
-                x = random.randint(2, width-3)
-                y = random.randint(2, height-3)
-                size = random.randint(2, 3)  # Reduced max size
-                
-                # Create temporary map to test accessibility
-                temp_tilemap = [row[:] for row in tilemap]
+                x = self.rng.randint(2, width-3)
+                y = self.rng.randint(2, height-3)
+                size = self.rng.randint(2, 3)  # Reduced max size
                 
                 # Try to add obstacle
+                obstacle = []
                 for i in range(size):
                     for j in range(size):
                         if 0 <= y+i < height and 0 <= x+j < width:
-                            temp_tilemap[y+i][x+j] = ('wall', random.randint(0, 2))
-                
-                # Check if map is still accessible
-                start_x = start_y = None
-                for test_y in range(1, height-1):
-                    for test_x in range(1, width-1):
-                        if temp_tilemap[test_y][test_x][0] == 'floor':
-                            start_x = test_x
-                            start_y = test_y
-                            break
-                    if start_x is not None:
-                        break
+                            obstacle.append((x+j, y+i, self.rng.randint(0, 2)))
                 
-                if start_x is not None and self.is_accessible(temp_tilemap, start_x, start_y):
-                    # If accessible, apply changes to real tilemap
-                    for i in range(size):
-                        for j in range(size):
-                            if 0 <= y+i < height and 0 <= x+j < width:
-                                tilemap[y+i][x+j] = temp_tilemap[y+i][x+j]
-                                self.walls.append(pygame.Rect((x+j) * TILE_SIZE, (y+i) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-        
-        # Validate final map
-        start_x = start_y = None
-        for y in range(1, height-1):
-            for x in range(1, width-1):
-                if tilemap[y][x][0] == 'floor':
-                    start_x = x
-                    start_y = y
-                    break
-            if start_x is not None:
-                break
-        
-        if start_x is not None and self.is_accessible(tilemap, start_x, start_y):
-            return tilemap
-        
-        # If map is not accessible, return an empty map
-        return [[('floor', random.randint(0, 2)) for _ in range(width)] for _ in range(height)]
+                # Only keep the obstacle if the floor is still all one region
+                if connectivity.block((tile_x, tile_y) for tile_x, tile_y, _ in obstacle):
+                    for tile_x, tile_y, variant in obstacle:
+                        if tilemap[tile_y][tile_x][0] != 'wall':
+                            tilemap[tile_y][tile_x] = ('wall', variant)
+                            self.walls.append(pygame.Rect(tile_x * TILE_SIZE, tile_y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        
+        # Hazards never change once the layout is done
+        self.hazards = HazardGrid(TILE_SIZE, width, height, hazard_tiles)
+        
+        # block() never lets the floor split, so the finished map needs no final flood fill
+        self.connectivity = connectivity
+        return tilemap
     
-    def update(self):
-        # Update fire pillars
+    def flow_towards(self, rect):
+        """The flow field pointed at the tile under `rect`'s centre, rebuilt only if that tile changed."""
+        self.flow.update(rect.centerx // TILE_SIZE, rect.centery // TILE_SIZE)
+        return self.flow
+    
+    def update(self, current_time=None):
+        # Update fire pillars, all against the same clock
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         for pillar in self.fire_pillars:
-            pillar.update()
+            frame = pillar.frame
+            pillar.update(current_time)
+            if pillar.frame != frame:
+                self.layer_stale = True
     
-    def draw(self, screen):
-        # Draw base tiles
+    def render_tiles(self, screen=None):
+        """Draw the floor and walls, which never change during a level, into a surface.
+
+        The surface matches `screen`'s pixel format when one is given; the level
+        builder passes none, and advance_level converts it on the main thread.
+        """
+        if screen is None:
+            surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        else:
+            surface = pygame.Surface(screen.get_size()).convert(screen)
+        surface.fill(COLORS['black'])
         for y, row in enumerate(self.tilemap):
             for x, (tile_type, variant) in enumerate(row):
                 screen_x = x * TILE_SIZE
@@ -736,57 +561,65 @@ class Level:
                 if self.level_number == 3:
                     # Level 3: Draw obsidian floor
                     if tile_type == 'floor':
-                        pygame.draw.rect(screen, COLORS['obsidian'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+                        pygame.draw.rect(surface, COLORS['obsidian'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
                         # Add slight variation to create texture
                         for _ in range(2):
-                            px = screen_x + random.randint(2, TILE_SIZE-4)
-                            py = screen_y + random.randint(2, TILE_SIZE-4)
-                            pygame.draw.circle(screen, COLORS['very_dark_gray'], (px, py), 2)
+                            px = screen_x + self.rng.randint(2, TILE_SIZE-4)
+                            py = screen_y + self.rng.randint(2, TILE_SIZE-4)
+                            pygame.draw.circle(surface, COLORS['very_dark_gray'], (px, py), 2)
                 else:
                     # Other levels: Draw normal floor
-                    pygame.draw.rect(screen, COLORS['light_brown'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
-                    pygame.draw.rect(screen, COLORS['very_light_brown'], 
+                    pygame.draw.rect(surface, COLORS['light_brown'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+                    pygame.draw.rect(surface, COLORS['very_light_brown'], 
                                    (screen_x + 2, screen_y + 2, TILE_SIZE - 4, TILE_SIZE - 4))
                 
                 # Draw walls with muddy appearance
                 if tile_type == 'wall':
-                    pygame.draw.rect(screen, COLORS['dark_brown'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+                    pygame.draw.rect(surface, COLORS['dark_brown'], (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
                     
-                    # Use deterministic seed for consistent cracks
-                    crack_seed = hash(f"{screen_x},{screen_y}") # Hash based on position
-                    random.seed(crack_seed)
+                    # Cracks come from their own generator seeded by position,
+                    # leaving the game's random sequence alone
+                    crack_random = random.Random(hash(f"{screen_x},{screen_y}"))
                     
                     # Add fixed mud cracks
                     for _ in range(3):  # 3 cracks per tile
                         # Start point of crack
-                        start_x = screen_x + random.randint(5, TILE_SIZE-5)
-                        start_y = screen_y + random.randint(5, TILE_SIZE-5)
+                        start_x = screen_x + crack_random.randint(5, TILE_SIZE-5)
+                        start_y = screen_y + crack_random.randint(5, TILE_SIZE-5)
                         
                         # Create 2-3 segments per crack
-                        for _ in range(random.randint(2, 3)):
-                            end_x = start_x + random.randint(-8, 8)
-                            end_y = start_y + random.randint(-8, 8)
+                        for _ in range(crack_random.randint(2, 3)):
+                            end_x = start_x + crack_random.randint(-8, 8)
+                            end_y = start_y + crack_random.randint(-8, 8)
                             
                             # Keep crack within tile bounds
                             end_x = max(screen_x + 2, min(screen_x + TILE_SIZE - 2, end_x))
                             end_y = max(screen_y + 2, min(screen_y + TILE_SIZE - 2, end_y))
                             
-                            pygame.draw.line(screen, COLORS['black'],
+                            pygame.draw.line(surface, COLORS['black'],
                                            (start_x, start_y), (end_x, end_y), 2)
                             
                             start_x, start_y = end_x, end_y
-                    
-                    # Restore the random seed
-                    random.seed()
-        
-        # Draw fire pillars
-        for pillar in self.fire_pillars:
-            pillar.draw(screen)
-            # Store lava tile positions for collision detection
-            self.lava_tiles.append(pillar.rect)
+        return surface
+    
+    def draw(self, screen):
+        # Floor and walls are rendered once, on the first frame of the level
+        if self.background is None:
+            self.background = self.render_tiles(screen)
+        
+        # Pillars only change frame every update_delay ms, so they are composited
+        # over the tiles when one does and the result reused until the next
+        if self.layer is None:
+            self.layer = self.background.copy()
+            self.layer_stale = True
+        if self.layer_stale:
+            self.layer.blit(self.background, (0, 0))
+            self.layer.blits([(pillar.frames[pillar.frame], pillar.rect) for pillar in self.fire_pillars], False)
+            self.layer_stale = False
+        screen.blit(self.layer, (0, 0))
 
 class Game:
-    def __init__(self):
+    def __init__(self, start_level=3):
         try:
             self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
             pygame.display.set_caption("AI Dungeon")
@@ -794,17 +627,21 @@ class Game:
             print(f"Could not initialize display: {e}")
             pygame.quit()
             exit(1)
+        ASSETS.preload(SPRITE_ASSETS)
+        # Pillar frames are converted to the screen here, never on the level builder
+        for is_poison in (False, True):
+            pillar_atlas(is_poison)
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = GameState.COMBAT
-        self.current_level = 3  # Temporarily set to level 3 for testing
+        self.current_level = start_level  # Defaults to level 3 for testing
         self.level = Level(self.current_level)
         
         # Find safe spawn for player
         spawn_x, spawn_y = self.find_safe_spawn()
         self.player = Player(spawn_x, spawn_y)
         
-        self.enemies = self.create_enemies()
+        self.spawn_enemies()
         
         # Power-up management
         self.power_ups = []
@@ -816,128 +653,24 @@ class Game:
         # Current intervals (will be adjusted based on level)
         self.potion_spawn_interval = self.base_potion_interval
         self.staff_spawn_interval = self.base_staff_interval
-    
-    def find_safe_spawn(self):
-        # Get all valid floor positions
-        valid_positions = []
-        
-        # Start a bit away from the edges
-        for y in range(TILE_SIZE * 2, WINDOW_HEIGHT - TILE_SIZE * 2, TILE_SIZE):
-            for x in range(TILE_SIZE * 2, WINDOW_WIDTH - TILE_SIZE * 2, TILE_SIZE):
-                # First check if this position is on a floor tile
-                tile_x = x // TILE_SIZE
-                tile_y = y // TILE_SIZE
-                
-                if (tile_y < len(self.level.tilemap) and 
-                    tile_x < len(self.level.tilemap[tile_y]) and 
-                    self.level.tilemap[tile_y][tile_x][0] != 'wall'):
-                    
-                    # Then check for wall collisions with the actual player rect
-                    test_rect = pygame.Rect(x - PLAYER_SIZE//2, y - PLAYER_SIZE//2, 
-                                           PLAYER_SIZE, PLAYER_SIZE)
-                    collision = False
-                    
-                    # Check wall collisions
-                    for wall in self.level.walls:
-                        if test_rect.colliderect(wall):
-                            collision = True
-                            break
-                    
-                    # Check fire pillar collisions
-                    for pillar in self.level.fire_pillars:
-                        if test_rect.colliderect(pillar.rect):
-                            collision = True
-                            break
-                    
-                    if not collision:
-                        valid_positions.append((x, y))
         
-        if valid_positions:
-            # Choose a random valid position away from center
-            center_x = WINDOW_WIDTH // 2
-            center_y = WINDOW_HEIGHT // 2
-            
-            # Sort positions by distance from center (furthest first)
-            valid_positions.sort(key=lambda pos: -((pos[0] - center_x)**2 + (pos[1] - center_y)**2))
-            
-            # Take one of the first 3 positions (they'll be furthest from center)
-            return random.choice(valid_positions[:3])
+        # Level transitions: how long each switch took, and the next level being built meanwhile
+        self.transition_times = []
+        self.prepare_next_level()
+    
+    def find_safe_spawn(self, level=None):
+        # A floor tile away from walls and hazards, a bit away from the edges
+        level = level or self.level
+        width, height = level.size
+        corners = level.spawns.farthest(width // 2, height // 2, 3, min_wall=1, min_hazard=2, margin=2)
+        if corners:
+            # Take one of the 3 tiles furthest from the center
+            tile_x, tile_y = level.rng.choice(corners)
+            return tile_x * TILE_SIZE, tile_y * TILE_SIZE
         
         # If no valid positions found, try the center as last resort
         return WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2
     
-    def is_valid_spawn_position(self, x, y):
-        # Create a test rect for collision checking
-        test_rect = pygame.Rect(x - PLAYER_SIZE//2, y - PLAYER_SIZE//2, 
-                               PLAYER_SIZE, PLAYER_SIZE)
-        
-        # Check wall collisions for all levels
-        for wall in self.level.walls:
-            if test_rect.colliderect(wall):
-                return False
-
-        # Check boundaries for all levels
-        buffer = TILE_SIZE * 2
-        if (x < buffer or x > WINDOW_WIDTH - buffer or 
-            y < buffer or y > WINDOW_HEIGHT - buffer):
-            return False
-
-        # In Level 3, check for poison tiles with extra buffer
-        if self.current_level == 3:
-            # Check a 5x5 grid of tiles around the spawn point
-            tile_x = x // TILE_SIZE
-            tile_y = y // TILE_SIZE
-            
-            for dy in range(-2, 3):
-                for dx in range(-2, 3):
-                    check_x = (tile_x + dx) * TILE_SIZE
-                    check_y = (tile_y + dy) * TILE_SIZE
-                    
-                    # Check each fire pillar at this position
-                    for pillar in self.level.fire_pillars:
-                        if (hasattr(pillar, 'colors') and 
-                            pillar.colors[0] == COLORS['poison'] and
-                            abs(pillar.rect.centerx - (check_x + TILE_SIZE//2)) < TILE_SIZE and
-                            abs(pillar.rect.centery - (check_y + TILE_SIZE//2)) < TILE_SIZE):
-                            return False
-        else:
-            # For other levels, just check direct collisions
-            for pillar in self.level.fire_pillars:
-                if test_rect.colliderect(pillar.rect):
-                    return False
-        
-        # Check if too close to edge
-        buffer = TILE_SIZE * 2
-        if (x < buffer or x > WINDOW_WIDTH - buffer or 
-            y < buffer or y > WINDOW_HEIGHT - buffer):
-            return False
-        
-        # Get tile coordinates
-        tile_x = x // TILE_SIZE
-        tile_y = y // TILE_SIZE
-        
-        # Check if position is on a floor tile
-        if (tile_y >= len(self.level.tilemap) or
-            tile_x >= len(self.level.tilemap[tile_y]) or
-            self.level.tilemap[tile_y][tile_x][0] == 'wall'):
-            return False
-            
-        # Check adjacent tiles for walls
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                check_x = tile_x + dx
-                check_y = tile_y + dy
-                # Skip checking the tile itself
-                if dx == 0 and dy == 0:
-                    continue
-                # Check if adjacent tile is within bounds and is a wall
-                if (check_y < len(self.level.tilemap) and
-                    check_x < len(self.level.tilemap[check_y]) and
-                    self.level.tilemap[check_y][check_x][0] == 'wall'):
-                    return False
-        
-        return True
-        
     def is_valid_position(self, x, y):
         # Create a test rect
         test_rect = pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
@@ -960,103 +693,52 @@ class Game:
             
         return True
     
-    def create_enemies(self):
+    def create_enemies(self, level=None, player_rect=None):
+        # Defaults to the current level and player; advance_level passes the next ones
+        level = level or self.level
+        player_rect = player_rect or self.player.rect
         enemies = []
+        spawns = level.spawns
+        player_tile = (player_rect.centerx // TILE_SIZE, player_rect.centery // TILE_SIZE, 6)
         
-        if self.current_level == 3:
-            # Level 3: 1 boss and 8 normal enemies
-            # Spawn boss in the center
-            center_x = ((WINDOW_WIDTH // TILE_SIZE) // 2) * TILE_SIZE
-            center_y = ((WINDOW_HEIGHT // TILE_SIZE) // 2) * TILE_SIZE
+        if level.level_number == 3:
+            # Level 3: 1 boss and 6 normal enemies, kept 3 tiles clear of poison
+            avoid = [player_tile]  # At least 6 tiles from player
+            clearance = {'min_wall': 2, 'min_hazard': 3, 'margin': 3}
             
-            # Try to spawn boss in center first
-            if self.is_valid_spawn_position(center_x, center_y):
-                enemies.append(Boss(center_x, center_y))
+            # Try to spawn boss in the center first
+            width, height = level.size
+            if spawns.is_clear(width // 2, height // 2, **clearance):
+                boss_tiles = [(width // 2, height // 2)]
             else:
-                # If center is not valid, find another spot for boss
-                attempts = 0
-                while attempts < 100:
-                    tile_x = random.randint(3, (WINDOW_WIDTH // TILE_SIZE) - 3)
-                    tile_y = random.randint(3, (WINDOW_HEIGHT // TILE_SIZE) - 3)
-                    x = tile_x * TILE_SIZE
-                    y = tile_y * TILE_SIZE
-                    if self.is_valid_spawn_position(x, y):
-                        enemies.append(Boss(x, y))
-                        break
-                    attempts += 1
+                boss_tiles = spawns.sample(1, rng=level.rng, **clearance)
+            for tile_x, tile_y in boss_tiles:
+                enemies.append(Boss(tile_x * TILE_SIZE, tile_y * TILE_SIZE))
+                avoid.append((tile_x, tile_y, 6))  # At least 6 tiles from the boss
             
-            # Add exactly 6 normal enemies
-            enemies_spawned = 0
-            while enemies_spawned < 6:
-                attempts = 0
-                while attempts < 100 and enemies_spawned < 6:
-                    tile_x = random.randint(3, (WINDOW_WIDTH // TILE_SIZE) - 3)
-                    tile_y = random.randint(3, (WINDOW_HEIGHT // TILE_SIZE) - 3)
-                    x = tile_x * TILE_SIZE
-                    y = tile_y * TILE_SIZE
-                    
-                    if self.is_valid_spawn_position(x, y):
-                        # Check distance from player, boss, and other enemies
-                        player_dist = math.sqrt((x - self.player.rect.centerx)**2 + 
-                                              (y - self.player.rect.centery)**2)
-                        
-                        too_close = False
-                        if player_dist < TILE_SIZE * 6:  # At least 6 tiles from player
-                            too_close = True
-                        
-                        for enemy in enemies:
-                            min_dist = TILE_SIZE * 6 if isinstance(enemy, Boss) else TILE_SIZE * 4
-                            enemy_dist = math.sqrt((x - enemy.rect.centerx)**2 + 
-                                                  (y - enemy.rect.centery)**2)
-                            if enemy_dist < min_dist:
-                                too_close = True
-                                break
-                        
-                        if not too_close:
-                            enemies.append(Enemy(x, y, self.current_level))
-                            enemies_spawned += 1
-                            break  # Break the inner attempts loop
-                    
-                    attempts += 1
+            # Add 6 normal enemies, spread at least 4 tiles apart. Poison rarely
+            # leaves room for all of them 3 tiles clear, so let them closer if needed
+            tiles = []
+            for min_hazard in (3, 2, 1):
+                tiles += spawns.sample(6 - len(tiles), min_wall=2, min_hazard=min_hazard, margin=3,
+                                       avoid=avoid, spacing=4, taken=tiles, rng=level.rng)
+            for tile_x, tile_y in tiles:
+                enemies.append(Enemy(tile_x * TILE_SIZE, tile_y * TILE_SIZE, level.level_number))
         else:
             # Level 1 and 2: Regular enemies
-            num_enemies = 6 if self.current_level == 2 else 3  # Exactly 3 enemies for level 1
-            for _ in range(num_enemies):
-                attempts = 0
-                while attempts < 100:
-                    x = random.randint(TILE_SIZE * 3, WINDOW_WIDTH - TILE_SIZE * 3)
-                    y = random.randint(TILE_SIZE * 3, WINDOW_HEIGHT - TILE_SIZE * 3)
-                    
-                    if self.is_valid_spawn_position(x, y):
-                        player_dist = math.sqrt((x - self.player.rect.centerx)**2 + 
-                                              (y - self.player.rect.centery)**2)
-                        
-                        too_close = False
-                        # Check distance from other enemies
-                        for enemy in enemies:
-                            enemy_dist = math.sqrt((x - enemy.rect.centerx)**2 + 
-                                                  (y - enemy.rect.centery)**2)
-                            if enemy_dist < TILE_SIZE * 4:  # Keep enemies spread out
-                                too_close = True
-                                break
-                        if player_dist < TILE_SIZE * 6:
-                            too_close = True
-                        
-                        for enemy in enemies:
-                            enemy_dist = math.sqrt((x - enemy.rect.centerx)**2 + 
-                                                  (y - enemy.rect.centery)**2)
-                            if enemy_dist < TILE_SIZE * 4:
-                                too_close = True
-                                break
-                        
-                        if not too_close:
-                            enemies.append(Enemy(x, y, self.current_level))
-                            break
-                    
-                    attempts += 1
+            num_enemies = 6 if level.level_number == 2 else 3  # Exactly 3 enemies for level 1
+            tiles = spawns.sample(num_enemies, min_wall=2, min_hazard=1, margin=3,
+                                  avoid=[player_tile], spacing=4, rng=level.rng)  # Keep enemies spread out
+            for tile_x, tile_y in tiles:
+                enemies.append(Enemy(tile_x * TILE_SIZE, tile_y * TILE_SIZE, level.level_number))
         
         return enemies
     
+    def spawn_enemies(self):
+        """Create the level's enemies and the spatial hash that tracks them as they move."""
+        self.enemies = self.create_enemies()
+        self.swarm = EnemySwarm(self.enemies, PLAYER_SIZE, TILE_SIZE)
+    
     def handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -1073,73 +755,38 @@ class Game:
             elif event.type == pygame.KEYDOWN and self.state == GameState.COMBAT:  # Only handle key press when alive
                 if event.key == pygame.K_a:
                     self.player.facing = Direction.LEFT
-                    self.player.move(-1, 0, self.level.walls)
+                    self.player.move(-1, 0, self.level.wall_index)
                 elif event.key == pygame.K_d:
                     self.player.facing = Direction.RIGHT
-                    self.player.move(1, 0, self.level.walls)
+                    self.player.move(1, 0, self.level.wall_index)
                 elif event.key == pygame.K_w:
                     self.player.facing = Direction.UP
-                    self.player.move(0, -1, self.level.walls)
+                    self.player.move(0, -1, self.level.wall_index)
                 elif event.key == pygame.K_s:
                     self.player.facing = Direction.DOWN
-                    self.player.move(0, 1, self.level.walls)
+                    self.player.move(0, 1, self.level.wall_index)
                 elif event.key == pygame.K_SPACE:
                     self.player.shoot(self.player.facing.value)
     
     def find_power_up_position(self):
-        while True:
-            x = random.randint(TILE_SIZE, WINDOW_WIDTH - TILE_SIZE)
-            y = random.randint(TILE_SIZE, WINDOW_HEIGHT - TILE_SIZE)
-            tile_x = x // TILE_SIZE
-            tile_y = y // TILE_SIZE
-            
-            # Check if position is on a floor tile
-            if (tile_y < len(self.level.tilemap) and
-                tile_x < len(self.level.tilemap[tile_y]) and
-                self.level.tilemap[tile_y][tile_x][0] == 'floor'):
-                
-                # Align to grid
-                x = tile_x * TILE_SIZE
-                y = tile_y * TILE_SIZE
-                
-                # Check for collisions with walls and other objects
-                test_rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                collision = False
-                
-                # Check wall collisions
-                for wall in self.level.walls:
-                    if test_rect.colliderect(wall):
-                        collision = True
-                        break
-                
-                # Check lava collisions
-                for pillar in self.level.fire_pillars:
-                    if test_rect.colliderect(pillar.rect):
-                        collision = True
-                        break
-                
-                # Check other power-ups
-                for power_up in self.power_ups:
-                    if test_rect.colliderect(power_up.rect):
-                        collision = True
-                        break
-                
-                # Check if too close to player
-                player_dist = math.sqrt((x - self.player.rect.centerx)**2 + 
-                                      (y - self.player.rect.centery)**2)
-                if player_dist < TILE_SIZE * 3:  # At least 3 tiles from player
-                    collision = True
-                
-                if not collision:
-                    return x, y
+        """A free floor tile at least 3 tiles from the player, or None if the level has no room left."""
+        taken = [(power_up.rect.x // TILE_SIZE, power_up.rect.y // TILE_SIZE) for power_up in self.power_ups]
+        player_tile = (self.player.rect.centerx // TILE_SIZE, self.player.rect.centery // TILE_SIZE, 3)
+        tiles = self.level.spawns.sample(1, min_wall=1, min_hazard=1, margin=1,
+                                         avoid=[player_tile], spacing=1, taken=taken)
+        if not tiles:
+            return None
+        tile_x, tile_y = tiles[0]
+        return tile_x * TILE_SIZE, tile_y * TILE_SIZE
     
     def update(self):
         current_time = time.time()
         
         # Spawn health potion
         if current_time - self.last_potion_spawn >= self.potion_spawn_interval:
-            x, y = self.find_power_up_position()
-            self.power_ups.append(PowerUp(x, y, PowerUpType.HEALTH_POTION))
+            position = self.find_power_up_position()
+            if position:  # Skipped this time if the level is full
+                self.power_ups.append(PowerUp(*position, PowerUpType.HEALTH_POTION))
             self.last_potion_spawn = current_time
         
         # Spawn magic staff
@@ -1148,13 +795,11 @@ class Game:
             staff_interval = 10  # Spawn more frequently
             
         if current_time - self.last_staff_spawn >= staff_interval:
-            x, y = self.find_power_up_position()
-            self.power_ups.append(PowerUp(x, y, PowerUpType.MAGIC_STAFF))
+            position = self.find_power_up_position()
+            if position:
+                self.power_ups.append(PowerUp(*position, PowerUpType.MAGIC_STAFF))
             self.last_staff_spawn = current_time
         
-        # Clear lava tiles list before updating
-        self.level.lava_tiles = []
-        
         # Update level
         self.level.update()
         
@@ -1163,23 +808,18 @@ class Game:
         
         # In Level 3, check if player is touching poison (instant death)
         if self.current_level == 3:
-            for pillar in self.level.fire_pillars:
-                if self.player.rect.colliderect(pillar.rect):
-                    self.player.health = 0
-                    self.state = GameState.GAME_OVER
-                    return
+            if self.level.hazards.collides(self.player.rect):
+                self.player.health = 0
+                self.state = GameState.GAME_OVER
+                return
         
         # Check if invulnerability has expired
         if self.player.invulnerable and current_time - self.player.invulnerable_time >= self.player.invulnerable_duration:
             self.player.invulnerable = False
         
-        touching_enemies = []
-        
-        for enemy in self.enemies:
-            enemy.move_towards(self.player, self.level.walls, self.enemies, 
-                             self.level.lava_tiles, self.level.fire_pillars)
-            if self.player.rect.colliderect(enemy.rect):
-                touching_enemies.append(enemy)
+        # Move the whole swarm in one batch, then see who reached the player
+        self.swarm.step(self.player.rect, self.level, current_time)
+        touching_enemies = self.swarm.query(self.player.rect)
         
         # Apply damage from touching enemies
         if touching_enemies and not self.player.invulnerable:
@@ -1200,17 +840,9 @@ class Game:
                     self.state = GameState.GAME_OVER
         
         # Check if player is in lava
-        for pillar in self.level.fire_pillars:
-            if self.player.rect.colliderect(pillar.rect):
-                self.player.health = 0  # Instant death in lava
-                self.state = GameState.GAME_OVER
-                break  # No need to check other lava tiles
-        # Also check lava tiles
-        for lava in self.level.lava_tiles:
-            if self.player.rect.colliderect(lava):
-                self.player.health = 0  # Instant death in lava
-                self.state = GameState.GAME_OVER
-                break  # No need to check other lava tiles
+        if self.level.hazards.collides(self.player.rect):
+            self.player.health = 0  # Instant death in lava
+            self.state = GameState.GAME_OVER
                 
         # Check power-up collisions
         for power_up in self.power_ups[:]:
@@ -1222,73 +854,70 @@ class Game:
                     self.player.damage_multiplier = 1.5
                     power_up.effect_active = True
                     # Apply damage to all enemies on screen
-                    for enemy in self.enemies[:]:
+                    killed = []
+                    for enemy in self.enemies:
                         enemy.health -= 20  # Base damage multiplied by 1.5
                         if enemy.health <= 0:
-                            self.enemies.remove(enemy)
-                            # Check if all enemies are defeated
-                            if not self.enemies:
-                                if self.current_level < 3:  # Allow progression to level 3
-                                    # Advance to next level
-                                    self.current_level += 1
-                                    self.level = Level(self.current_level)
-                                    # Reset player position but keep health
-                                    current_health = self.player.health
-                                    spawn_x, spawn_y = self.find_safe_spawn()
-                                    self.player = Player(spawn_x, spawn_y)
-                                    self.player.health = current_health
-                                    # Create new enemies
-                                    self.enemies = self.create_enemies()
-                                    # Reset power-ups for new level
-                                    self.power_ups = []
-                                    # Adjust power-up spawn intervals based on level
-                                    if self.current_level == 2:
-                                        self.potion_spawn_interval = self.base_potion_interval * 0.8
-                                        self.staff_spawn_interval = self.base_staff_interval * 0.8
-                                    elif self.current_level == 3:
-                                        self.potion_spawn_interval = self.base_potion_interval * 0.6
-                                        self.staff_spawn_interval = self.base_staff_interval * 0.6
+                            killed.append(enemy)
+                    self.remove_enemies(killed)
                 self.power_ups.remove(power_up)
 
-        # Update arrows
-        for arrow in self.player.arrows[:]:  # Use slice copy to safely remove while iterating
-            arrow.update(self.level.walls)
-            if not arrow.active:
-                self.player.arrows.remove(arrow)
-                continue
-                
-            # Check enemy collisions
-            for enemy in self.enemies[:]:  # Use slice copy to safely remove while iterating
-                if arrow.rect.colliderect(enemy.rect):
-                    enemy.health -= arrow.damage * self.player.damage_multiplier
-                    arrow.active = False
-                    self.player.arrows.remove(arrow)
-                    
-                    if enemy.health <= 0:
-                        self.enemies.remove(enemy)
-                        # Check if all enemies are defeated
-                        if not self.enemies:
-                            if self.current_level < 3:  # Allow progression to level 3
-                                # Advance to next level
-                                self.current_level += 1
-                                self.level = Level(self.current_level)
-                                # Reset player position but keep health
-                                current_health = self.player.health
-                                spawn_x, spawn_y = self.find_safe_spawn()
-                                self.player = Player(spawn_x, spawn_y)
-                                self.player.health = current_health
-                                # Create new enemies
-                                self.enemies = self.create_enemies()
-                                # Reset power-ups for new level
-                                self.power_ups = []
-                                # Adjust power-up spawn intervals based on level
-                                if self.current_level == 2:
-                                    self.potion_spawn_interval = self.base_potion_interval * 0.8
-                                    self.staff_spawn_interval = self.base_staff_interval * 0.8
-                                elif self.current_level == 3:
-                                    self.potion_spawn_interval = self.base_potion_interval * 0.6
-                                    self.staff_spawn_interval = self.base_staff_interval * 0.6
-                    break
+        # Update arrows: move and resolve them all, then take out the dead in one pass
+        self.remove_enemies(self.player.arrows.update(self.level, self.swarm, self.player.damage_multiplier))
+        
+        # Check if all enemies are defeated
+        if not self.enemies and self.current_level < 3:  # Allow progression to level 3
+            self.advance_level()
+    
+    def remove_enemies(self, killed):
+        """Take dead enemies out of the level in one pass."""
+        if killed:
+            self.swarm.remove_many(killed)
+            self.enemies = [enemy for enemy in self.enemies if enemy.swarm is not None]
+    
+    def prepare_next_level(self):
+        """Start building the level after this one on the level builder thread, while this one is played."""
+        self.next_level = None
+        if self.current_level < 3:
+            # Seeded from the game's generator here, so random.seed still decides every level
+            seed = random.getrandbits(32)
+            self.next_level = LEVEL_BUILDER.submit(self.build_level, self.current_level + 1, seed)
+    
+    def build_level(self, level_number, seed=None):
+        """The level, player spawn point and enemies for `level_number`, built off the main thread."""
+        level = Level(level_number, rng=random.Random(seed))
+        level.background = level.render_tiles()  # So its first frame doesn't have to
+        spawn_x, spawn_y = self.find_safe_spawn(level)
+        enemies = self.create_enemies(level, pygame.Rect(spawn_x, spawn_y, PLAYER_SIZE, PLAYER_SIZE))
+        return level, (spawn_x, spawn_y), enemies
+    
+    def advance_level(self):
+        """Switch to the next level, prepared in the background since this one started."""
+        start = time.perf_counter()
+        if self.next_level is None:
+            self.prepare_next_level()
+        # Only waits if the build hasn't finished yet
+        level, spawn, enemies = self.next_level.result()
+        self.current_level += 1
+        level.background = level.background.convert(self.screen)
+        self.level = level
+        # Reset player position but keep health
+        current_health = self.player.health
+        self.player = Player(*spawn)
+        self.player.health = current_health
+        self.enemies = enemies
+        self.swarm = EnemySwarm(self.enemies, PLAYER_SIZE, TILE_SIZE)
+        # Reset power-ups for new level
+        self.power_ups = []
+        # Adjust power-up spawn intervals based on level
+        if self.current_level == 2:
+            self.potion_spawn_interval = self.base_potion_interval * 0.8
+            self.staff_spawn_interval = self.base_staff_interval * 0.8
+        elif self.current_level == 3:
+            self.potion_spawn_interval = self.base_potion_interval * 0.6
+            self.staff_spawn_interval = self.base_staff_interval * 0.6
+        self.transition_times.append(time.perf_counter() - start)
+        self.prepare_next_level()
     
     def create_pixelated_text(self, text, size, color):
         # Create a surface for the text
@@ -1412,16 +1041,16 @@ class Game:
                         self.running = False
                     elif event.key == pygame.K_a:
                         self.player.facing = Direction.LEFT
-                        self.player.move(-1, 0, self.level.walls)
+                        self.player.move(-1, 0, self.level.wall_index)
                     elif event.key == pygame.K_d:
                         self.player.facing = Direction.RIGHT
-                        self.player.move(1, 0, self.level.walls)
+                        self.player.move(1, 0, self.level.wall_index)
                     elif event.key == pygame.K_w:
                         self.player.facing = Direction.UP
-                        self.player.move(0, -1, self.level.walls)
+                        self.player.move(0, -1, self.level.wall_index)
                     elif event.key == pygame.K_s:
                         self.player.facing = Direction.DOWN
-                        self.player.move(0, 1, self.level.walls)
+                        self.player.move(0, 1, self.level.wall_index)
                     elif event.key == pygame.K_SPACE:
                         self.player.shoot(self.player.facing.value)
             
@@ -1,4 +1,5 @@
 from enum import Enum
+from board import Board, SlideTable
 
 class GameState(Enum):
     PLAYING = 0
@@ -40,24 +41,50 @@ class Game:
         self.blocks_destroyed = 0  # Counter for destroy cost
         self.player = Player()
         self.cursor = Cursor()
-        self.grid = [[False] * 10 for _ in range(10)]
-        self.walls = []
-        self.coin_positions = []
-        self.player_placed_blocks = []
         self.grid_size = 10
+        self.board = Board(self.grid_size)
+        self.slides = SlideTable(self.board)
+        self.grid = self.board.visited_rows()  # grid[y][x] is truthy for visited cells
+
+    # The board layers also work as the old lists of [x, y] for the renderer
+
+    @property
+    def walls(self):
+        return self.board.walls
+
+    @walls.setter
+    def walls(self, cells):
+        self.board.walls.assign(cells)
+
+    @property
+    def coin_positions(self):
+        return self.board.coins
+
+    @coin_positions.setter
+    def coin_positions(self, cells):
+        self.board.coins.assign(cells)
+
+    @property
+    def player_placed_blocks(self):
+        return self.board.placed_blocks
+
+    @player_placed_blocks.setter
+    def player_placed_blocks(self, cells):
+        self.board.placed_blocks.assign(cells)
 
     def init_level(self, maze_data):
         """Initialize level with maze data."""
-        self.walls = maze_data['walls']
-        self.coin_positions = maze_data['coins']
+        self.grid_size = maze_data['size']
+        self.board = Board(self.grid_size)  # Fresh board, so placed blocks are reset too
+        self.board.walls.assign(maze_data['walls'])
+        self.board.coins.assign(maze_data['coins'])
+        self.slides = SlideTable(self.board)  # Built once, patched by the layers when blocks change
         self.player.x = maze_data['start'][0]
         self.player.y = maze_data['start'][1]
         self.cursor.x = maze_data['start'][0]
         self.cursor.y = maze_data['start'][1]
-        self.grid = [[False] * maze_data['size'] for _ in range(maze_data['size'])]
-        self.player_placed_blocks = []  # Reset placed blocks for new level
-        self.grid[self.player.y][self.player.x] = True
-        self.grid_size = maze_data['size']
+        self.grid = self.board.visited_rows()
+        self.board.visited.add(self.player.x, self.player.y)
         # Don't reset block counters - they persist until game restart
 
     def get_next_block_cost(self):
@@ -71,13 +98,13 @@ class Game:
     def try_place_block(self):
         """Try to place a block at cursor position."""
         block_cost = self.get_next_block_cost()
-        pos = [self.cursor.x, self.cursor.y]
-        if (pos not in self.walls and
-            pos not in self.coin_positions and
-            pos != [self.player.x, self.player.y] and
-            pos not in self.player_placed_blocks and
+        x, y = self.cursor.x, self.cursor.y
+        if (not self.board.walls.has(x, y) and
+            not self.board.coins.has(x, y) and
+            (x, y) != (self.player.x, self.player.y) and
+            not self.board.placed_blocks.has(x, y) and
             self.coins >= block_cost):  # Only check if we have enough coins
-            self.player_placed_blocks.append(pos)
+            self.board.placed_blocks.add(x, y)
             self.coins -= block_cost
             self.blocks_placed += 1  # Increment counter for next cost
             return True
@@ -86,21 +113,19 @@ class Game:
     def try_destroy_block(self):
         """Try to destroy a block or wall at cursor position, turning it into free space."""
         destroy_cost = self.get_next_destroy_cost()
-        pos = [self.cursor.x, self.cursor.y]
+        x, y = self.cursor.x, self.cursor.y
         
         # Can destroy either placed blocks or walls
-        can_destroy = (pos in self.player_placed_blocks or pos in self.walls)
+        can_destroy = self.board.placed_blocks.has(x, y) or self.board.walls.has(x, y)
         
         if (can_destroy and self.coins >= destroy_cost):
             # Remove block/wall and make space free
-            if pos in self.player_placed_blocks:
-                self.player_placed_blocks.remove(pos)
-            if pos in self.walls:
-                self.walls.remove(pos)
+            self.board.placed_blocks.discard(x, y)
+            self.board.walls.discard(x, y)
             self.coins -= destroy_cost
             self.blocks_destroyed += 1  # Increment counter for next cost
             # Make sure the space is marked as passable
-            self.grid[pos[1]][pos[0]] = True
+            self.board.visited.add(x, y)
             return True
         return False
 
@@ -110,31 +135,13 @@ class Game:
 
     def start_movement(self, dx, dy):
         """Start player movement in the given direction."""
-        current_x = self.player.x
-        current_y = self.player.y
-        
-        # Keep moving until hitting a wall, block, or boundary
-        while True:
-            new_x = current_x + dx
-            new_y = current_y + dy
-            
-            # Check if movement is valid
-            if (0 <= new_x < len(self.grid) and 0 <= new_y < len(self.grid) and
-                [new_x, new_y] not in self.walls and
-                [new_x, new_y] not in self.player_placed_blocks):
-                current_x = new_x
-                current_y = new_y
-                self.grid[current_y][current_x] = True
-                
-                # Collect any coins along the path
-                if [current_x, current_y] in self.coin_positions:
-                    self.coin_positions.remove([current_x, current_y])
-                    self.coins += 1
-            else:
-                break
+        # Slide until hitting a wall, block, or boundary - looked up, not walked
+        current_x, current_y = self.slides.stop(self.player.x, self.player.y, dx, dy)
         
         # Update final position
         if (current_x != self.player.x or current_y != self.player.y):
+            # Mark the path visited and collect any coins along it
+            self.coins += self.board.sweep(self.player.x, self.player.y, current_x, current_y)
             self.player.moving = True
             self.player.x = current_x
             self.player.y = current_y
@@ -154,8 +161,8 @@ class Game:
 
     def check_game_over(self):
         """Check if player has lost."""
-        player_pos = [self.player.x, self.player.y]
-        if player_pos in self.walls or player_pos in self.player_placed_blocks:
+        x, y = self.player.x, self.player.y
+        if self.board.walls.has(x, y) or self.board.placed_blocks.has(x, y):
             self.state = GameState.GAME_OVER
 
     def check_level_complete(self):
@@ -0,0 +1,49 @@
+import pygame
+
+
+class HazardGrid:
+    """Which tiles of a level are lava or poison, fixed once the level is built.
+
+    Hazards fill whole tiles, so a rect touches one exactly when one of the
+    tiles it covers is flagged in the grid. That makes a collision check a few
+    lookups however many hazards there are. `rects` keeps one rect per hazard
+    tile for code that needs the shapes.
+    """
+
+    def __init__(self, tile_size, width, height, tiles=()):
+        self.tile_size = tile_size
+        self.width = width
+        self.height = height
+        grid = [bytearray(width) for _ in range(height)]
+        rects = []
+        for tile_x, tile_y in tiles:
+            if 0 <= tile_x < width and 0 <= tile_y < height and not grid[tile_y][tile_x]:
+                grid[tile_y][tile_x] = 1
+                rects.append(pygame.Rect(tile_x * tile_size, tile_y * tile_size, tile_size, tile_size))
+        self.grid = tuple(bytes(row) for row in grid)
+        self.rects = tuple(rects)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def at(self, tile_x, tile_y):
+        """True if the tile is a hazard; tiles off the map are not."""
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height and bool(self.grid[tile_y][tile_x])
+
+    def collides(self, rect):
+        """True if `rect` overlaps any hazard tile."""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        size = self.tile_size
+        # right/bottom are exclusive, like colliderect
+        x0 = max(rect.left // size, 0)
+        x1 = min((rect.right - 1) // size, self.width - 1)
+        y0 = max(rect.top // size, 0)
+        y1 = min((rect.bottom - 1) // size, self.height - 1)
+        if x1 < x0 or y1 < y0:
+            return False  # Entirely off the map
+        for row in self.grid[y0:y1 + 1]:
+            if any(row[x0:x1 + 1]):
+                return True
+        return False
+
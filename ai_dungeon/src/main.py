@@ -229,6 +229,8 @@ class Game:
         self.ui_manager = UIManager()
 =======
 from maze_generator import MazeGenerator
+from maze_cache import MazeCache
+from maze_pipeline import MazePipeline
 from game_state import Game, GameState, Player
 
 class MazeGame:
@@ -255,16 +257,23 @@ class MazeGame:
 >>>>>>> arun_branch
         
         # Initialize game components
-        self.maze_generator = MazeGenerator()
+        self.maze_cache = MazeCache()
+        self.maze_generator = MazeGenerator(cache=self.maze_cache)
         self.game = Game()
         
 <<<<<<< HEAD
         # Initialize first level
         self.setup_combat()
 =======
+        # Build upcoming mazes in the background while a level is played
+        self.maze_pipeline = MazePipeline(self.maze_generator, size=self.GRID_SIZE)
+        
         # Start first level
         self.init_level()
         self.game.state = GameState.PLAYING
+        
+        # Fill the maze cache for the opening levels of future runs
+        self.maze_pipeline.when_idle(self.maze_cache.warm_start, self.maze_generator, 3, self.GRID_SIZE)
 >>>>>>> arun_branch
         
         # Start the game loop
@@ -363,8 +372,10 @@ class MazeGame:
 =======
     def init_level(self):
         """Initialize a new level."""
-        maze_data = self.maze_generator.generate_maze(self.game.current_level)
+        maze_data = self.maze_pipeline.take(self.game.current_level)
         self.game.init_level(maze_data)
+        # Start building the next levels while this one is played
+        self.maze_pipeline.prefetch(self.game.current_level)
     
 >>>>>>> arun_branch
     def update(self):
@@ -563,11 +574,13 @@ class MazeGame:
                 
         elif self.game.state == GameState.GAME_OVER:
             if pyxel.btnp(pyxel.KEY_R):
+                self.maze_pipeline.cancel()
                 self.game.reset_game()
                 self.init_level()
                 
         elif self.game.state == GameState.BLOCKCIDE:
             if pyxel.btnp(pyxel.KEY_R):
+                self.maze_pipeline.cancel()
                 self.game.reset_game()
                 self.init_level()
     
@@ -789,6 +802,7 @@ class MazeGame:
         
     def reset_game(self):
         """Reset the game state without reinitializing Pyxel."""
+        self.maze_pipeline.cancel()
         self.game = Game()
         self.init_level()
         self.game.state = GameState.PLAYING
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache')
+
+
+class MazeCache:
+    """On-disk store of validated mazes keyed by a hash of prompt, model and validator."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=500, variants_per_key=5,
+                 reuse_ratio=0.7):
+        self.max_entries = max_entries  # LRU eviction beyond this many mazes
+        self.variants_per_key = variants_per_key  # Different mazes kept for the same prompt
+        self.reuse_ratio = reuse_ratio  # Chance of reusing a stored maze vs asking for a fresh one
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'mazes.sqlite3')
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS mazes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS mazes_key ON mazes (key)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS mazes_last_used ON mazes (last_used)")
+        self.db.commit()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt, model_name, validator_version):
+        """Hash everything that decides what a valid maze for this request looks like."""
+        content = f"{model_name}\n{validator_version}\n{prompt}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def count(self, key):
+        """Number of stored mazes for a key."""
+        with self.lock:
+            row = self.db.execute("SELECT COUNT(*) FROM mazes WHERE key = ?", (key,)).fetchone()
+        return row[0]
+
+    def lookup(self, key):
+        """Return a stored maze for `key`, or None when a fresh one should be generated."""
+        with self.lock:
+            rows = self.db.execute("SELECT id, data FROM mazes WHERE key = ?", (key,)).fetchall()
+
+            # Keep asking for new mazes until we have enough variety for this key
+            if not rows or (len(rows) < self.variants_per_key and random.random() >= self.reuse_ratio):
+                self.misses += 1
+                return None
+
+            maze_id, data = random.choice(rows)
+            self.db.execute("UPDATE mazes SET last_used = ? WHERE id = ?", (time.time(), maze_id))
+            self.db.commit()
+            self.hits += 1
+        return json.loads(data)
+
+    def store(self, key, level, size, maze_data):
+        """Save a validated maze and evict the least recently used ones if over budget."""
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO mazes (key, level, size, data, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, level, size, json.dumps(maze_data), time.time())
+            )
+            # Drop the oldest variant once a key has more than it needs
+            self.db.execute("""
+                DELETE FROM mazes WHERE id IN (
+                    SELECT id FROM mazes WHERE key = ? ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (key, self.variants_per_key))
+            self.db.execute("""
+                DELETE FROM mazes WHERE id IN (
+                    SELECT id FROM mazes ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.db.commit()
+
+    def warm_start(self, maze_generator, levels, size=10):
+        """Make sure the first `levels` levels have a stored maze, generating missing ones.
+
+        The missing levels are asked for together with generate_mazes, which
+        batches them into as few Gemini calls as it can and stores each valid
+        maze here. Calls into `maze_generator`, so run it where nothing else is
+        using it, e.g. through MazePipeline.when_idle.
+        """
+        missing = [level for level in range(1, levels + 1)
+                   if self.count(maze_generator.cache_key(level, size)) == 0]
+        if missing:
+            maze_generator.generate_mazes(missing, size)
+
+    def stats(self):
+        """Get cache counters."""
+        with self.lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM mazes").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
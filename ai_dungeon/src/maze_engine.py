@@ -0,0 +1,191 @@
+import random
+
+from reachability import ReachabilityIndex
+
+ALGORITHMS = ('backtracker', 'prim', 'wilson', 'cellular')
+
+
+class MazeEngine:
+    """Local, seeded maze generator producing the dict Game.init_level consumes.
+
+    Corridor mazes are carved on a lattice of cells two apart, anchored on the
+    start corner, so they are connected by construction. Caves from the cellular
+    automaton are checked with a ReachabilityIndex and tunnelled through when the
+    exit is cut off, so no generator needs a retry loop. Coins only go on cells
+    reachable from the start. The same seed always gives the same mazes.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self._lattices = {}  # size -> (lattice nodes, neighbour lists), shared by every maze
+
+    def generate(self, level, size=10, algorithm=None, seed=None):
+        """Generate one maze. `seed` reproduces a single maze regardless of the engine's own seed."""
+        rng = random.Random(self.rng.getrandbits(32) if seed is None else seed)
+        if algorithm is None:
+            algorithm = rng.choice(ALGORITHMS)
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown maze algorithm: {algorithm}")
+
+        if algorithm == 'cellular':
+            grid = self._cellular(rng, size, level)
+        else:
+            grid = getattr(self, '_' + algorithm)(rng, size)
+            self._braid(rng, grid, size, level)
+        return self._finish(rng, grid, size, level)
+
+    # Level scaling
+
+    def braid_ratio(self, level):
+        """Fraction of corridor walls knocked out; more loops make early levels easier."""
+        return max(0.0, 0.3 - 0.04 * (level - 1))
+
+    def fill_ratio(self, level):
+        """Initial wall density for the cellular automaton."""
+        return min(0.55, 0.38 + 0.02 * level)
+
+    def coin_count(self, level):
+        return min(level + 2, 8)
+
+    # Lattice algorithms, each returning a bytearray with 1 for walls
+
+    def _lattice(self, size):
+        """All-wall grid plus the lattice nodes and each node's lattice neighbours."""
+        if size not in self._lattices:
+            nodes = [y * size + x for y in range(size - 1, -1, -2) for x in range(0, size, 2)]
+            node_set = set(nodes)
+            neighbours = {}
+            for i in nodes:
+                x, y = i % size, i // size
+                neighbours[i] = [ny * size + nx for nx, ny in ((x, y - 2), (x, y + 2), (x - 2, y), (x + 2, y))
+                                 if 0 <= nx < size and 0 <= ny < size and ny * size + nx in node_set]
+            self._lattices[size] = nodes, neighbours
+        nodes, neighbours = self._lattices[size]
+        return bytearray(b'\x01' * (size * size)), nodes, neighbours
+
+    @staticmethod
+    def _carve(grid, a, b):
+        grid[a] = grid[b] = grid[(a + b) // 2] = 0
+
+    def _backtracker(self, rng, size):
+        grid, nodes, neighbours = self._lattice(size)
+        start = nodes[0]
+        grid[start] = 0
+        stack = [start]
+        while stack:
+            node = stack[-1]
+            options = [n for n in neighbours[node] if grid[n]]
+            if not options:
+                stack.pop()
+                continue
+            nxt = rng.choice(options)
+            self._carve(grid, node, nxt)
+            stack.append(nxt)
+        return grid
+
+    def _prim(self, rng, size):
+        grid, nodes, neighbours = self._lattice(size)
+        start = nodes[0]
+        grid[start] = 0
+        frontier = [(start, n) for n in neighbours[start]]
+        while frontier:
+            # Swap-remove a random frontier edge
+            k = rng.randrange(len(frontier))
+            frontier[k], frontier[-1] = frontier[-1], frontier[k]
+            node, nxt = frontier.pop()
+            if not grid[nxt]:
+                continue
+            self._carve(grid, node, nxt)
+            frontier.extend((nxt, n) for n in neighbours[nxt] if grid[n])
+        return grid
+
+    def _wilson(self, rng, size):
+        grid, nodes, neighbours = self._lattice(size)
+        in_maze = {nodes[0]}
+        grid[nodes[0]] = 0
+        for node in nodes:
+            if node in in_maze:
+                continue
+            # Loop-erased random walk: remembering only the last exit from each
+            # node erases loops for free
+            walk = {}
+            current = node
+            while current not in in_maze:
+                walk[current] = rng.choice(neighbours[current])
+                current = walk[current]
+            current = node
+            while current not in in_maze:
+                in_maze.add(current)
+                self._carve(grid, current, walk[current])
+                current = walk[current]
+        return grid
+
+    def _braid(self, rng, grid, size, level):
+        if size % 2 == 0:
+            # An even size leaves a spare top row and right column beside the lattice
+            for i in range(size):
+                if rng.random() < 0.5:
+                    grid[i] = 0
+                if rng.random() < 0.5:
+                    grid[i * size + size - 1] = 0
+        ratio = self.braid_ratio(level)
+        if not ratio:
+            return
+        for i in range(size * size):
+            if not grid[i]:
+                continue
+            x, y = i % size, i // size
+            # Only walls separating two open cells in a line, so a hole joins corridors
+            horizontal = 0 < x < size - 1 and not grid[i - 1] and not grid[i + 1]
+            vertical = 0 < y < size - 1 and not grid[i - size] and not grid[i + size]
+            if (horizontal or vertical) and rng.random() < ratio:
+                grid[i] = 0
+
+    def _cellular(self, rng, size, level, steps=4):
+        fill = self.fill_ratio(level)
+        # Work on a grid with a one-cell wall border so caves close off at the edges
+        width = size + 2
+        grid = bytearray(b'\x01' * (width * width))
+        inner = [(y + 1) * width + x + 1 for y in range(size) for x in range(size)]
+        for i in inner:
+            grid[i] = 1 if rng.random() < fill else 0
+        everywhere = range(1, len(grid) - 1)
+        for _ in range(steps):
+            # 3x3 wall counts as a horizontal 3-sum, then a vertical sum of those
+            row_sums = [0] + [grid[i - 1] + grid[i] + grid[i + 1] for i in everywhere] + [0]
+            for i in inner:
+                grid[i] = row_sums[i - width] + row_sums[i] + row_sums[i + width] >= 5
+        return bytearray(grid[i] for i in inner)
+
+    def _finish(self, rng, grid, size, level):
+        """Turn a wall grid into a connected maze dict with coins."""
+        start, exit_pos = [0, size - 1], [size - 1, 0]
+        # Keep the start, the exit and the cells leading into the exit open
+        for x, y in ((0, size - 1), (size - 1, 0), (size - 2, 0), (size - 1, 1)):
+            grid[y * size + x] = 0
+        walls = [[i % size, i // size] for i in range(size * size) if grid[i]]
+
+        # Carved mazes are connected already, so usually one flood confirms it;
+        # separate caves get joined by a random up/right tunnel from start to exit
+        index = ReachabilityIndex(size, walls, start, exit_pos)
+        if not index.connected():
+            x, y = start
+            while (x, y) != (size - 1, 0):
+                if y == 0 or (x < size - 1 and rng.random() < 0.5):
+                    x += 1
+                else:
+                    y -= 1
+                grid[y * size + x] = 0
+            walls = [[i % size, i // size] for i in range(size * size) if grid[i]]
+            index = ReachabilityIndex(size, walls, start, exit_pos)
+
+        open_cells = [cell for cell in index.reachable_list() if cell not in (start, exit_pos)]
+        coins = rng.sample(open_cells, min(self.coin_count(level), len(open_cells)))
+
+        return {
+            "walls": walls,
+            "coins": coins,
+            "start": start,
+            "exit": exit_pos,
+            "size": size
+        }
@@ -5,25 +5,41 @@ import os
 import random
 >>>>>>> arun_branch
 import json
+import re
+import time
 from dotenv import load_dotenv
+from maze_cache import MazeCache
+from maze_solver import meets_difficulty
+from maze_engine import MazeEngine
+from reachability import ReachabilityIndex
 
 # Load environment variables
 load_dotenv()
 
-from collections import deque
+# Bump whenever _validate_maze changes so mazes cached under the old rules aren't reused
+VALIDATOR_VERSION = 2
 
 class MazeGenerator:
-    def __init__(self):
+    def __init__(self, cache=None, seed=None):
 <<<<<<< HEAD
         # Configure Gemini API
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in .env file")
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('models/gemini-1.5-pro')
+        self.model_name = 'models/gemini-1.5-pro'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.cache = cache  # Optional MazeCache of previously validated mazes
+        self.maze_pool = {}  # (level, size) -> validated mazes left over from generate_mazes
+        self.batch_stats = {}
+        self.engine = MazeEngine(seed)  # Local mazes when Gemini can't deliver
 
-    def generate_maze(self, level, size=10):
-        """Generate a maze with walls, coins, and start/exit positions using Gemini."""
+    def cache_key(self, level, size=10):
+        """Get the cache key for the prompt this level and size would send."""
+        return MazeCache.make_key(self._build_prompt(level, size), self.model_name, VALIDATOR_VERSION)
+
+    def _build_prompt(self, level, size):
+        """Render the Gemini prompt for a level."""
         # Calculate complexity factors based on level
         min_walls = (size * 2) + (level * 5)  # More walls at higher levels
         min_turns = 2 + level         # More required turns at higher levels
@@ -62,8 +78,22 @@ class MazeGenerator:
         - Make it feel like level {level} but keep it solvable
         """
         
-        # Add a unique seed to prevent duplicate mazes
-        prompt += f"\nUnique seed: {level * 1000 + hash(str(size)) % 1000}"
+        # Add a unique seed to prevent duplicate mazes (stable across runs so it can be cached)
+        prompt += f"\nUnique seed: {level * 1000 + size}"
+        return prompt
+
+    def generate_maze(self, level, size=10):
+        """Generate a maze with walls, coins, and start/exit positions using Gemini."""
+        pooled = self._take_pooled(level, size)
+        if pooled is not None:
+            return pooled
+
+        prompt = self._build_prompt(level, size)
+        cache_key = self.cache_key(level, size)
+        if self.cache is not None:
+            cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                return cached
 
         max_attempts = 3
         for attempt in range(max_attempts):
@@ -72,7 +102,6 @@ class MazeGenerator:
                 text = response.text.strip()
                 
                 # Extract and validate JSON
-                import re
                 json_match = re.search(r'\{.*\}', text, re.DOTALL)
                 if not json_match:
                     continue
@@ -80,14 +109,21 @@ class MazeGenerator:
                 maze_data = json.loads(json_match.group(0))
                 
                 # Validate maze data
-                if self._validate_maze(maze_data):
+                if self._validate_maze(maze_data) and meets_difficulty(maze_data, level):
+                    if self.cache is not None:
+                        self.cache.store(cache_key, level, size, maze_data)
                     return maze_data
                     
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {e}")
                 
         # If all attempts fail, return a simple solvable maze
-        return self._generate_fallback_maze(level, size)
+        return self.generate_fallback_maze(level, size)
+    
+    def _is_valid_for_level(self, maze_data, level, size):
+        """Check a single maze from a batch response against this level's rules."""
+        return (maze_data.get('size') == size and self._validate_maze(maze_data) and
+                meets_difficulty(maze_data, level))
     
     def _validate_maze(self, maze_data):
         """Validate maze data and ensure it's solvable."""
@@ -111,117 +147,68 @@ class MazeGenerator:
             if start != [0, size-1] or exit_pos != [size-1, 0]:
                 return False
 
-            # Verify that walls don't block the entire path
-            # We'll be more lenient with wall placement but ensure path exists
-            border_points = set((x, y) for x, y in walls)
-            
-            # Check if there's a path from start to end
-            if not self._has_valid_path(start, exit_pos, walls, size):
-                return False
-            
-            # Ensure start and exit aren't blocked
-            if (start[0], start[1]) in border_points or (exit_pos[0], exit_pos[1]) in border_points:
-                return False
-
-            # Check if path exists from start to exit
-            if not self._has_valid_path(start, exit_pos, walls, size):
-                return False
-
-            return True
+            # One connectivity pass covers a walled-in start or exit as well as a missing path
+            return ReachabilityIndex(size, walls, start, exit_pos).connected()
 
         except Exception:
             return False
 
-    def _has_valid_path(self, start, end, walls, size):
-        """Check if there's a valid path from start to end using BFS."""
-        walls_set = {tuple(w) for w in walls}
-        queue = deque([(start[0], start[1])])
-        visited = {(start[0], start[1])}
-
-        while queue:
-            x, y = queue.popleft()
-            if [x, y] == end:
-                return True
-
-            # Try all four directions
-            for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < size and 0 <= new_y < size and 
-                    (new_x, new_y) not in walls_set and 
-                    (new_x, new_y) not in visited):
-                    queue.append((new_x, new_y))
-                    visited.add((new_x, new_y))
-
-        return False
-
-    def _generate_fallback_maze(self, level, size):
+    def generate_fallback_maze(self, level, size=10):
         """Generate a simple solvable maze as fallback."""
-        walls = []
-        coins = []
-        
-        # First, create a guaranteed path from start to exit
-        path_points = set()
-        x, y = 0, size-1  # Start position
-        
-        # Generate a simple path that goes up and right
-        while x < size-1 or y > 0:
-            path_points.add((x, y))
-            if x < size-1 and (level == 1 or random.random() > 0.5):
-                x += 1
-            elif y > 0:
-                y -= 1
-            path_points.add((x, y))
-        
-        # Add some walls around the path
-        for i in range(size):
-            for j in range(size):
-                if (i, j) not in path_points and random.random() < 0.3:
-                    # Don't block start or exit
-                    if not (i == 0 and j == size-1) and not (i == size-1 and j == 0):
-                        walls.append([i, j])
-        
-        # Add coins near the path
-        path_list = list(path_points)
-        for _ in range(min(level + 3, len(path_list))):
-            if path_list:
-                point = random.choice(path_list)
-                coins.append([point[0], point[1]])
-                path_list.remove(point)
-        
-        return {
-            "walls": walls,
-            "coins": coins,
-            "start": [0, size-1],
-            "exit": [size-1, 0],
-            "size": size
-        }
+        return self.engine.generate(level, size)
 =======
         """Initialize the maze generator with Gemini API."""
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
         genai.configure(api_key=api_key)
+        self.model_name = 'gemini-pro'
         try:
-            self.model = genai.GenerativeModel('gemini-pro')
+            self.model = genai.GenerativeModel(self.model_name)
         except Exception as e:
             print(f"Warning: Could not initialize Gemini model: {e}")
             self.model = None
+        self.cache = cache  # Optional MazeCache of previously validated mazes
+        self.maze_pool = {}  # (level, size) -> validated mazes left over from generate_mazes
+        self.batch_stats = {}
+        self.engine = MazeEngine(seed)  # Local mazes when Gemini can't deliver
 
-    def generate_maze(self, level, size=10):
-        """Generate a maze with walls, coins, and start/exit positions."""
-        # Scale difficulty with level
+    def cache_key(self, level, size=10):
+        """Get the cache key for the prompt this level and size would send."""
+        return MazeCache.make_key(self._build_prompt(level, size), self.model_name, VALIDATOR_VERSION)
+
+    def _build_prompt(self, level, size):
+        """Render the Gemini prompt for a level."""
         min_coins = min(3, level)  # Cap coins at 3 per level
         min_walls = 10 + (level * 2)  # More walls per level
-        
-        # Try to generate maze with Gemini
-        try:
-            prompt = f"""Generate a {size}x{size} maze with:
+        return f"""Generate a {size}x{size} maze with:
             - At least {min_walls} walls
             - At least {min_coins} coins
             - One start position at bottom-left [0, {size-1}]
             - Ensure at least one coin is reachable from start
             - DO NOT include an exit position
             Format as JSON with 'walls', 'coins', 'start' lists of [x,y] coordinates"""
+
+    def generate_maze(self, level, size=10):
+        """Generate a maze with walls, coins, and start/exit positions."""
+        # Scale difficulty with level
+        min_coins = min(3, level)  # Cap coins at 3 per level
+        min_walls = 10 + (level * 2)  # More walls per level
+        
+        pooled = self._take_pooled(level, size)
+        if pooled is not None:
+            return pooled
+        
+        # Reuse a previously validated maze for this prompt when possible
+        cache_key = self.cache_key(level, size)
+        if self.cache is not None:
+            cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Try to generate maze with Gemini
+        try:
+            prompt = self._build_prompt(level, size)
             
             if self.model is not None:
                 response = self.model.generate_content(prompt)
@@ -231,7 +218,10 @@ class MazeGenerator:
                         maze_data = json.loads(response.text)
                         if self._validate_maze(maze_data, min_coins, min_walls):
                             maze_data['size'] = size
-                            return maze_data
+                            if meets_difficulty(maze_data, level):
+                                if self.cache is not None:
+                                    self.cache.store(cache_key, level, size, maze_data)
+                                return maze_data
                     except json.JSONDecodeError:
                         pass
                     
@@ -241,6 +231,15 @@ class MazeGenerator:
         # Fallback to manual generation if Gemini fails
         return self.generate_fallback_maze(level, size)
         
+    def _is_valid_for_level(self, maze_data, level, size):
+        """Check a single maze from a batch response against this level's rules."""
+        min_coins = min(3, level)
+        min_walls = 10 + (level * 2)
+        if not self._validate_maze(maze_data, min_coins, min_walls):
+            return False
+        maze_data['size'] = size
+        return meets_difficulty(maze_data, level)
+        
     def _validate_maze(self, maze_data, min_coins, min_walls):
         """Validate maze data meets requirements."""
         if not isinstance(maze_data, dict):
@@ -283,46 +282,92 @@ class MazeGenerator:
 
     def generate_fallback_maze(self, level, size=10):
         """Generate a fallback maze when API fails."""
-        # Initialize empty maze
-        maze = {
-            'walls': [],
-            'coins': [],
-            'start': [0, size-1],  # Bottom-left corner
-            'size': size
-        }
-        
-        # Add walls (avoiding start, goal, and adjacent to goal)
-        num_walls = 10 + (level * 2)
-        goal_pos = [size - 1, 0]
-        goal_adjacent = [
-            [size - 2, 0],  # Left of goal
-            [size - 1, 1]   # Below goal
-        ]
-        
-        while len(maze['walls']) < num_walls:
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
-            pos = [x, y]
-            
-            # Don't place walls at start, goal, or adjacent to goal
-            if (pos != maze['start'] and 
-                pos != goal_pos and 
-                pos not in goal_adjacent and
-                pos not in maze['walls']):
-                maze['walls'].append(pos)
-        
-        # Add coins (avoiding walls and other coins)
-        num_coins = min(3, level)  # Cap coins at 3 per level
-        while len(maze['coins']) < num_coins:
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
-            pos = [x, y]
-            
-            if (pos not in maze['walls'] and 
-                pos != maze['start'] and
-                pos != goal_pos and
-                pos not in maze['coins']):
-                maze['coins'].append(pos)
-        
-        return maze
+        return self.engine.generate(level, size)
 >>>>>>> arun_branch
+
+    def _take_pooled(self, level, size):
+        """Pop a maze left over from a batch request, if there is one."""
+        pool = self.maze_pool.get((level, size))
+        if pool:
+            return pool.pop()
+        return None
+
+    def _build_batch_prompt(self, levels, size):
+        """Render one prompt asking for a maze per entry in `levels`."""
+        prompt = (f"Generate {len(levels)} independent mazes. Return only a JSON array with one "
+                  f"object per maze, in the order listed below. Add a \"level\" field to each "
+                  f"object with the level number it was made for.\n")
+        for i, level in enumerate(levels):
+            prompt += f"\nMAZE {i + 1} (level {level}):\n{self._build_prompt(level, size)}\n"
+        return prompt
+
+    def generate_mazes(self, levels, size=10, n=1, batch_size=8, max_calls=10):
+        """Fill the pool with `n` validated mazes for each level using batched Gemini calls.
+
+        Each call asks for a JSON array of up to `batch_size` mazes. Every maze is
+        validated on its own, the good ones are kept and only the missing ones are
+        requested again. Returns {level: [maze, ...]}, which may hold fewer than `n`
+        mazes for a level if `max_calls` runs out.
+        """
+        levels = list(levels)
+        for level in levels:
+            self.maze_pool.setdefault((level, size), [])
+
+        calls = 0
+        valid = 0
+        invalid = 0
+        start = time.perf_counter()
+
+        while calls < max_calls and self.model is not None:
+            # Only ask for what's still missing
+            wanted = []
+            for level in levels:
+                deficit = n - len(self.maze_pool[(level, size)])
+                wanted.extend([level] * max(0, deficit))
+            if not wanted:
+                break
+            wanted = wanted[:batch_size]
+
+            calls += 1
+            try:
+                response = self.model.generate_content(self._build_batch_prompt(wanted, size))
+                json_match = re.search(r'\[.*\]', response.text, re.DOTALL)
+                if not json_match:
+                    continue
+                mazes = json.loads(json_match.group(0))
+            except Exception as e:
+                print(f"Batch maze call {calls} failed: {e}")
+                continue
+            if not isinstance(mazes, list):
+                continue
+
+            for i, maze_data in enumerate(mazes[:len(wanted)]):
+                if not isinstance(maze_data, dict):
+                    invalid += 1
+                    continue
+                level = maze_data.pop('level', wanted[i])
+                if level not in wanted:
+                    level = wanted[i]
+                pool = self.maze_pool[(level, size)]
+                if len(pool) >= n or not self._is_valid_for_level(maze_data, level, size):
+                    invalid += 1
+                    continue
+                pool.append(maze_data)
+                valid += 1
+                if self.cache is not None:
+                    self.cache.store(self.cache_key(level, size), level, size, maze_data)
+
+        elapsed = time.perf_counter() - start
+        self.batch_stats = {
+            'calls': calls,
+            'valid': valid,
+            'invalid': invalid,
+            'seconds': elapsed,
+            'mazes_per_call': valid / calls if calls else 0.0,
+            'mazes_per_second': valid / elapsed if elapsed > 0 else 0.0,
+        }
+        print(f"Generated {valid} valid mazes ({invalid} rejected) in {calls} calls, "
+              f"{self.batch_stats['mazes_per_call']:.1f}/call, "
+              f"{self.batch_stats['mazes_per_second']:.2f}/s")
+
+        return {level: list(self.maze_pool[(level, size)]) for level in levels}
@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+
+from maze_engine import MazeEngine
+
+
+class MazePipeline:
+    """Generate upcoming mazes on a background thread while the current level is played."""
+
+    def __init__(self, maze_generator, size=10, lookahead=2, wait_timeout=0.0, seed=None):
+        self.maze_generator = maze_generator
+        self.size = size
+        self.lookahead = lookahead  # How many levels ahead to build (N+1, N+2, ...)
+        self.wait_timeout = wait_timeout  # Seconds take() may wait on an in-flight maze
+
+        # Bounded job queue - never more than `lookahead` levels waiting, plus a when_idle wake-up
+        self.jobs = queue.Queue(maxsize=lookahead + 1)
+        self.lock = threading.Lock()
+        self.ready = {}  # level -> maze_data
+        self.pending = set()  # levels queued or being generated
+        self.done = threading.Condition(self.lock)
+        self.epoch = 0  # Bumped by cancel() so stale results get dropped
+        self.chores = []  # (task, args) the worker runs once no level is queued
+        # The generator isn't thread-safe, so every call into it from here holds this
+        self.generating = threading.Lock()
+        # Prefetch misses build locally with their own engine, so they never wait
+        # behind a Gemini call holding `generating`
+        self.fallback = MazeEngine(seed)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.cold = 0
+        self.wait_time = 0.0
+
+        self.running = True
+        self.worker = threading.Thread(target=self._run, name="maze-pipeline", daemon=True)
+        self.worker.start()
+
+    def prefetch(self, level):
+        """Schedule levels after `level` to be generated in the background."""
+        for next_level in range(level + 1, level + 1 + self.lookahead):
+            # Mark the level pending before the worker can see its job, all under the
+            # lock, so neither the worker nor cancel() can slip in between
+            with self.lock:
+                if next_level in self.ready or next_level in self.pending:
+                    continue
+                self.pending.add(next_level)
+                try:
+                    self.jobs.put_nowait((self.epoch, next_level))
+                except queue.Full:
+                    self.pending.discard(next_level)
+                    break
+
+    def when_idle(self, task, *args):
+        """Run `task(*args)` on the worker once no queued level is waiting, e.g. a cache warm-up.
+
+        Going through the worker keeps it from calling the generator while a
+        prefetch is using it.
+        """
+        with self.lock:
+            self.chores.append((task, args))
+        try:
+            self.jobs.put_nowait((self.epoch, None))  # Wake the worker if it is idle
+        except queue.Full:
+            pass  # It is busy with levels and looks at the chores after each one
+
+    def take(self, level):
+        """Return the maze for `level`, using a prefetched one when available."""
+        start = time.perf_counter()
+        with self.lock:
+            if level not in self.ready and level in self.pending and self.wait_timeout > 0:
+                self.done.wait_for(lambda: level in self.ready or level not in self.pending,
+                                   timeout=self.wait_timeout)
+            maze_data = self.ready.pop(level, None)
+            was_scheduled = level in self.pending
+            self.pending.discard(level)  # A late result for this level is no longer wanted
+            for stale_level in [l for l in self.ready if l < level]:
+                del self.ready[stale_level]
+            if maze_data is not None:
+                self.hits += 1
+            elif was_scheduled:
+                self.misses += 1
+            else:
+                self.cold += 1
+
+        if maze_data is None:
+            if was_scheduled:
+                # Prefetch miss - don't freeze the game waiting for Gemini
+                maze_data = self.fallback.generate(level, self.size)
+            else:
+                # Nothing was ever requested for this level (e.g. first level), build it now
+                with self.generating:
+                    maze_data = self.maze_generator.generate_maze(level, self.size)
+
+        with self.lock:
+            self.wait_time += time.perf_counter() - start
+        return maze_data
+
+    def cancel(self):
+        """Drop all queued and finished work, e.g. when the game is reset."""
+        with self.lock:
+            self.epoch += 1
+            self.ready.clear()
+            self.pending.clear()
+            self.done.notify_all()
+        while True:
+            try:
+                self.jobs.get_nowait()
+            except queue.Empty:
+                break
+
+    def shutdown(self):
+        """Stop the worker thread."""
+        self.cancel()
+        self.running = False
+        try:
+            self.jobs.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def hit_rate(self):
+        """Fraction of prefetched levels that were ready when needed."""
+        with self.lock:
+            return self._hit_rate()
+
+    def _hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        """Get pipeline counters."""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'cold': self.cold,
+                'hit_rate': self._hit_rate(),
+                'wait_time': self.wait_time,
+                'ready': sorted(self.ready),
+            }
+
+    def _next_job(self):
+        """The next queued job, running chores in between whenever the queue is empty."""
+        while True:
+            try:
+                return self.jobs.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                chore = self.chores.pop(0) if self.chores else None
+            if chore is None:
+                return self.jobs.get()
+            task, args = chore
+            try:
+                with self.generating:
+                    task(*args)
+            except Exception as e:
+                print(f"Background chore {getattr(task, '__name__', task)} failed: {e}")
+
+    def _run(self):
+        while self.running:
+            job = self._next_job()
+            if job is None:
+                break
+            epoch, level = job
+            with self.lock:
+                if level is None or epoch != self.epoch or level not in self.pending:
+                    continue  # A wake-up from when_idle, or a cancelled level
+
+            with self.generating:
+                try:
+                    maze_data = self.maze_generator.generate_maze(level, self.size)
+                except Exception as e:
+                    print(f"Background maze generation for level {level} failed: {e}")
+                    maze_data = self.maze_generator.generate_fallback_maze(level, self.size)
+
+            with self.lock:
+                if epoch == self.epoch and level in self.pending:
+                    self.ready[level] = maze_data
+                    self.pending.discard(level)
+                    self.done.notify_all()
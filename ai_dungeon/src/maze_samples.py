@@ -0,0 +1,38 @@
+"""Random mazes and a reference path check shared by the benchmarks and the tests."""
+import random
+from collections import deque
+
+
+def random_maze(size, seed=0, wall_density=0.2, coin_density=0.05):
+    """Build a random maze dict in the format Game.init_level expects."""
+    rng = random.Random(seed)
+    walls, coins = [], []
+    for y in range(size):
+        for x in range(size):
+            if (x, y) in ((0, size - 1), (size - 1, 0)):
+                continue
+            roll = rng.random()
+            if roll < wall_density:
+                walls.append([x, y])
+            elif roll < wall_density + coin_density:
+                coins.append([x, y])
+    return {'walls': walls, 'coins': coins, 'start': [0, size - 1], 'exit': [size - 1, 0], 'size': size}
+
+
+def bfs_has_path(start, end, walls, size):
+    """The 4-neighbour BFS MazeGenerator._validate_maze ran (twice) before ReachabilityIndex."""
+    walls_set = {tuple(w) for w in walls}
+    queue = deque([(start[0], start[1])])
+    visited = {(start[0], start[1])}
+    while queue:
+        x, y = queue.popleft()
+        if [x, y] == end:
+            return True
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            new_x, new_y = x + dx, y + dy
+            if (0 <= new_x < size and 0 <= new_y < size and
+                (new_x, new_y) not in walls_set and
+                (new_x, new_y) not in visited):
+                queue.append((new_x, new_y))
+                visited.add((new_x, new_y))
+    return False
@@ -0,0 +1,361 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+EXACT_SIZE = 16  # Boards up to this size are searched exactly (the game plays 10x10)
+LARGE_BOARD_VARIANTS = 4  # Changed boards explored per position and counters above EXACT_SIZE
+PLACED_STOP_SLIDES = 2  # What a slide stopped by a placed block counts as when steering big boards
+DESTROYED_WALL_SLIDES = 2  # Extra a slide counts as per wall it needs destroyed, likewise
+LARGE_BOARD_SECONDS = 0.8  # Default search time limit above EXACT_SIZE, keeping a solve under a second
+
+
+class MazeSolver:
+    """Solver for the ice-slide rules in game_state.Game.
+
+    Runs A* on (moves, spend) over states of (position, collected coins,
+    blocks placed, blocks destroyed), using the escalating costs of
+    Game.get_next_block_cost and get_next_destroy_cost. Costs only depend on
+    how many blocks were placed/destroyed and money never goes down by waiting,
+    so a change to the board can always be postponed until just before the slide
+    it affects. The only placements worth trying are on the next slide's path,
+    and the only wall worth destroying is the one that ends it. States that
+    could not reach the exit even walking through every wall they can still
+    afford to destroy are dropped.
+
+    States also carry the cells changed so far, so returned paths always replay
+    in Game. Boards up to EXACT_SIZE are searched exactly. Above that the
+    changed boards grow too fast, so only the first `board_variants` boards
+    reaching a position with the same counters are explored and the search is
+    steered by plain-slide distances to the exit: the route found is valid but
+    can be a few slides or coins above optimal, and 'exact' is False. Those
+    searches also give up after LARGE_BOARD_SECONDS.
+    """
+
+    def __init__(self, maze_data, money=1, blocks_placed=0, blocks_destroyed=0, board_variants=None):
+        self.size = size = maze_data['size']
+        self.start = maze_data['start'][1] * size + maze_data['start'][0]
+        # Game always completes the level in the top-right corner, whatever 'exit' says
+        self.exit = size - 1
+        self.money = money
+        self.blocks_placed = blocks_placed
+        self.blocks_destroyed = blocks_destroyed
+        if board_variants is None and size > EXACT_SIZE:
+            board_variants = LARGE_BOARD_VARIANTS
+        self.board_variants = board_variants  # None searches every board
+
+        self.walls = bytearray(size * size)
+        for x, y in maze_data['walls']:
+            if 0 <= x < size and 0 <= y < size:
+                self.walls[y * size + x] = 1
+
+        # Each coin gets a bit in the collected-coins mask
+        self.coin_bit = {}
+        for x, y in maze_data['coins']:
+            if 0 <= x < size and 0 <= y < size and (y * size + x) not in self.coin_bit:
+                self.coin_bit[y * size + x] = 1 << len(self.coin_bit)
+
+        self._ray_cache = {}
+        self.walls_to_exit = self._walls_to_exit()
+        self.slides_to_exit = self._slides_to_exit() if board_variants is not None else None
+
+    def _walls_to_exit(self):
+        """Fewest walls a 4-neighbour walk from each cell to the exit passes through."""
+        size, walls = self.size, self.walls
+        distance = [size * size] * (size * size)
+        distance[self.exit] = 0
+        queue = deque([self.exit])
+        while queue:
+            i = queue.popleft()
+            x, y = i % size, i // size
+            # Walking back out of i means having walked into it, which costs a wall if it is one
+            through = distance[i] + walls[i]
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if 0 <= nx < size and 0 <= ny < size and through < distance[ny * size + nx]:
+                    distance[ny * size + nx] = through
+                    if walls[i]:
+                        queue.append(ny * size + nx)
+                    else:
+                        queue.appendleft(ny * size + nx)
+        return distance
+
+    def _slides_to_exit(self):
+        """Slides from each cell to the exit, for steering big boards.
+
+        A slide that needs a placed block to stop counts as PLACED_STOP_SLIDES
+        and one through a destroyed wall as DESTROYED_WALL_SLIDES more. None
+        where every route needs a slide through two walls.
+        """
+        size, walls = self.size, self.walls
+        distance = [None] * (size * size)
+        buckets = [[self.exit]]
+        distance[self.exit] = 0
+        cost = 0
+        while cost < len(buckets):
+            for i in buckets[cost]:
+                if distance[i] != cost:
+                    continue
+                x, y = i % size, i // size
+                for dx, dy in DIRECTIONS:
+                    # Sliding into i along (dx, dy) stops there by itself at a wall or the edge
+                    nx, ny = x + dx, y + dy
+                    natural = not (0 <= nx < size and 0 <= ny < size) or walls[ny * size + nx]
+                    step = cost + (1 if natural else PLACED_STOP_SLIDES)
+                    px, py = x - dx, y - dy
+                    through = False
+                    while 0 <= px < size and 0 <= py < size:
+                        j = py * size + px
+                        if walls[j]:
+                            if through:
+                                break
+                            through = True
+                            step += DESTROYED_WALL_SLIDES
+                        elif distance[j] is None or step < distance[j]:
+                            distance[j] = step
+                            while len(buckets) <= step:
+                                buckets.append([])
+                            buckets[step].append(j)
+                        px, py = px - dx, py - dy
+            cost += 1
+        return distance
+
+    def _base_ray(self, pos, d):
+        """Cells a slide passes through on the unchanged board, the cell that stops
+        it (-1 for the edge) and the coins collected by each cell along the way."""
+        ray = self._ray_cache.get((pos, d))
+        if ray is None:
+            size = self.size
+            dx, dy = DIRECTIONS[d]
+            x, y = pos % size, pos // size
+            cells = []
+            masks = []
+            mask = 0
+            stopper = -1
+            while True:
+                x += dx
+                y += dy
+                if not (0 <= x < size and 0 <= y < size):
+                    break
+                i = y * size + x
+                if self.walls[i]:
+                    stopper = i
+                    break
+                cells.append(i)
+                mask |= self.coin_bit.get(i, 0)
+                masks.append(mask)
+            ray = self._ray_cache[(pos, d)] = (cells, stopper, masks)
+        return ray
+
+    def _ray(self, pos, d, placed, destroyed):
+        """Like _base_ray, with the `placed` blocks added and the `destroyed` cells cleared."""
+        cells, stopper, masks = self._base_ray(pos, d)
+        if placed:
+            # The nearest placed block on the path cuts it short
+            size = self.size
+            dx, dy = DIRECTIONS[d]
+            x, y = pos % size, pos // size
+            cut = len(cells)
+            for block in placed:
+                bx, by = block % size, block // size
+                if by == y and dy == 0:
+                    step = (bx - x) * dx
+                elif bx == x and dx == 0:
+                    step = (by - y) * dy
+                else:
+                    continue
+                if 0 < step <= cut:
+                    cut = step - 1
+                    stopper = block
+            if cut < len(cells):
+                return cells[:cut], stopper, masks[:cut]
+        if stopper >= 0 and stopper in destroyed:
+            # Slide on through the cleared cell
+            hole = stopper
+            more, stopper, more_masks = self._ray(hole, d, placed, destroyed)
+            mask = (masks[-1] if masks else 0) | self.coin_bit.get(hole, 0)
+            return cells + [hole] + more, stopper, masks + [mask] + [mask | m for m in more_masks]
+        return cells, stopper, masks
+
+    def _slides_left(self, pos):
+        # Lower bound on slides to the exit: one along a shared row/column, else two
+        if pos == self.exit:
+            return 0
+        if pos % self.size == self.exit % self.size or pos // self.size == self.exit // self.size:
+            return 1
+        return 2
+
+    def _estimate(self, pos, affordable, destroyed):
+        """Slides still needed from `pos`, or None if the exit is out of reach with `affordable` more destroys.
+
+        Exact searches get a lower bound; above EXACT_SIZE plain-slide distance steers instead.
+        """
+        # Walking freely, every wall in the way still has to be destroyed (cleared cells no longer count)
+        if self.walls_to_exit[pos] - len(destroyed) > affordable:
+            return None
+        if self.slides_to_exit is None or self.slides_to_exit[pos] is None:
+            return self._slides_left(pos)
+        return max(self._slides_left(pos), self.slides_to_exit[pos])
+
+    def _money(self, collected, placed_count, destroyed_count):
+        # Costs are 1, 2, 3, ... so n actions cost n(n+1)/2 beyond the starting counters
+        spent_place = (placed_count * (placed_count + 1) -
+                       self.blocks_placed * (self.blocks_placed + 1)) // 2
+        spent_destroy = (destroyed_count * (destroyed_count + 1) -
+                         self.blocks_destroyed * (self.blocks_destroyed + 1)) // 2
+        return self.money + bin(collected).count('1') - spent_place - spent_destroy
+
+    @staticmethod
+    def _destroys_affordable(budget, destroyed_count):
+        # How many more destroys `budget` pays for at costs destroyed_count + 1, + 2, ...
+        count = 0
+        while budget >= destroyed_count + count + 1:
+            count += 1
+            budget -= destroyed_count + count
+        return count
+
+    def solve(self, max_states=200000, time_limit=None):
+        """Find the fewest slides (then least spend) from start to exit.
+
+        Gives up after `max_states` expanded states or `time_limit` seconds;
+        boards above EXACT_SIZE default to LARGE_BOARD_SECONDS. Returns a dict
+        with 'solvable', 'moves', 'spend', 'path', 'states' (number of states
+        expanded) and 'exact' (False when the answer may be above optimal, or
+        the search gave up before proving there is no route). 'path' lists
+        ('slide', dx, dy), ('place', x, y) and ('destroy', x, y) steps.
+        """
+        if time_limit is None and self.board_variants is not None:
+            time_limit = LARGE_BOARD_SECONDS
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        start_key = (self.start, 0, self.blocks_placed, self.blocks_destroyed, (), ())
+        counter = itertools.count()
+        heap = [(0, 0, next(counter), 0, 0, start_key)]
+        best = {start_key: (0, 0)}
+        parents = {start_key: None}
+        # Collecting more coins never hurts, so drop states whose coins are a subset
+        # of an already-expanded state's on the same board at no lower cost
+        seen_masks = {}
+        boards_seen = {}
+        variants = self.board_variants
+        exact = variants is None
+        expanded = 0
+
+        while heap and expanded < max_states:
+            if deadline is not None and expanded % 64 == 0 and time.perf_counter() > deadline:
+                break
+            _, _, _, moves, spend, key = heapq.heappop(heap)
+            if best[key] != (moves, spend):
+                continue
+            pos, collected, placed_count, destroyed_count, placed, destroyed = key
+
+            masks = seen_masks.setdefault((pos, placed_count, destroyed_count, placed, destroyed), [])
+            if any(other | collected == other and other_cost <= (moves, spend) for other, other_cost in masks):
+                continue
+            if not exact:
+                # Only the cheapest few boards are explored per position and counters
+                boards = boards_seen.setdefault((pos, placed_count, destroyed_count), set())
+                if (placed, destroyed) not in boards:
+                    if len(boards) >= variants:
+                        continue
+                    boards.add((placed, destroyed))
+            masks.append((collected, (moves, spend)))
+
+            expanded += 1
+            if pos == self.exit and moves > 0:
+                return {
+                    'solvable': True,
+                    'moves': moves,
+                    'spend': spend,
+                    'path': self._path(parents, key),
+                    'states': expanded,
+                    'exact': exact,
+                }
+
+            money = self._money(collected, placed_count, destroyed_count)
+            # Best case from here: every coin left gets collected and nothing else is bought
+            budget = money + len(self.coin_bit) - bin(collected).count('1')
+            affordable = {}  # (spend on the next step, destroyed count after it) -> destroys still affordable
+            for d, (dx, dy) in enumerate(DIRECTIONS):
+                cells, stopper, ray_masks = self._ray(pos, d, placed, destroyed)
+                successors = []
+
+                # Plain slide
+                if cells:
+                    successors.append(((cells[-1], collected | ray_masks[-1], placed_count, destroyed_count,
+                                        placed, destroyed), 1, 0, [('slide', dx, dy)]))
+
+                # Place a block on the path to stop early
+                place_cost = placed_count + 1
+                if money >= place_cost:
+                    for j in range(1, len(cells)):
+                        block = cells[j]
+                        if not exact and len(boards_seen.get((cells[j - 1], placed_count + 1,
+                                                             destroyed_count), ())) >= variants:
+                            continue
+                        if block in self.coin_bit and not collected & self.coin_bit[block]:
+                            continue
+                        successors.append(((cells[j - 1], collected | ray_masks[j - 1], placed_count + 1,
+                                            destroyed_count, tuple(sorted(placed + (block,))), destroyed),
+                                           1, place_cost, [('place', block % self.size, block // self.size),
+                                                           ('slide', dx, dy)]))
+
+                # Destroy whatever stops the slide, then decide again from the same cell
+                destroy_cost = destroyed_count + 1
+                if stopper >= 0 and money >= destroy_cost:
+                    successors.append(((pos, collected, placed_count, destroyed_count + 1,
+                                        tuple(i for i in placed if i != stopper),
+                                        tuple(sorted(destroyed + (stopper,)))), 0, destroy_cost,
+                                       [('destroy', stopper % self.size, stopper // self.size)]))
+
+                for next_key, add_moves, add_spend, steps in successors:
+                    cost = (moves + add_moves, spend + add_spend)
+                    if next_key not in best or cost < best[next_key]:
+                        spent = (add_spend, next_key[3])
+                        if spent not in affordable:
+                            affordable[spent] = self._destroys_affordable(budget - add_spend, next_key[3])
+                        estimate = self._estimate(next_key[0], affordable[spent], next_key[5])
+                        if estimate is None:
+                            continue
+                        best[next_key] = cost
+                        parents[next_key] = (key, steps)
+                        heapq.heappush(heap, (cost[0] + estimate, cost[1] if exact else estimate,
+                                              next(counter), cost[0], cost[1], next_key))
+
+        return {'solvable': False, 'moves': None, 'spend': None, 'path': [], 'states': expanded,
+                'exact': exact and not heap}
+
+    @staticmethod
+    def _path(parents, state):
+        steps = []
+        while parents[state] is not None:
+            state, state_steps = parents[state]
+            steps[:0] = state_steps
+        return steps
+
+
+def solve_maze(maze_data, money=1, blocks_placed=0, blocks_destroyed=0):
+    """Solve a maze dict in the format Game.init_level consumes."""
+    return MazeSolver(maze_data, money, blocks_placed, blocks_destroyed).solve()
+
+
+def difficulty_score(solution):
+    """Single number for how hard a solved maze is; unsolvable mazes score infinity."""
+    if not solution['solvable']:
+        return float('inf')
+    # Spending coins means the player had to find a block trick, weigh it above a slide
+    return solution['moves'] + 2 * solution['spend']
+
+
+def difficulty_target(level):
+    """(min, max) difficulty score wanted for a level."""
+    return 1 + level, 6 + level * 4
+
+
+def meets_difficulty(maze_data, level, money=1, blocks_placed=0, blocks_destroyed=0):
+    """Check a maze is solvable and lands inside the difficulty band for its level.
+
+    `money`, `blocks_placed` and `blocks_destroyed` are the player's coins and
+    counters going into the level; the defaults are a fresh run.
+    """
+    low, high = difficulty_target(level)
+    return low <= difficulty_score(solve_maze(maze_data, money, blocks_placed, blocks_destroyed)) <= high
@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+
+ARROW_SIZE = 8  # Small arrow
+ARROW_SPEED = 15
+ARROW_DAMAGE = 20
+
+
+class ArrowPool:
+    """Every live arrow as NumPy arrays, moved and resolved together once per frame.
+
+    update() sweeps each arrow along its step against a grid of wall tiles,
+    then against the enemy swarm's cell buckets, and only afterwards applies
+    the damage and drops spent arrows in one compaction pass. Nothing is
+    removed from a list while it is being walked.
+    """
+
+    def __init__(self, size=ARROW_SIZE, tile_size=40, capacity=64):
+        self.size = size
+        self.tile_size = tile_size
+        self.count = 0
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.int64)  # Rect top-left
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.dx = np.zeros(capacity, dtype=np.int64)  # Direction, e.g. (0, -1) for up
+        self.dy = np.zeros(capacity, dtype=np.int64)
+        self.speed = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.level = None  # Level the wall grid below was built for
+        self.walls = None
+        self.fired = 0
+        self.hits = 0
+
+    def __len__(self):
+        return self.count
+
+    def fire(self, x, y, direction, speed=ARROW_SPEED, damage=ARROW_DAMAGE):
+        """Add an arrow with its top-left at (x, y) flying in `direction`."""
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for name in ('x', 'y', 'dx', 'dy', 'speed', 'damage'):
+                setattr(self, name, np.resize(getattr(self, name), self.capacity))
+        i = self.count
+        self.x[i], self.y[i] = x, y
+        self.dx[i], self.dy[i] = direction
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.count += 1
+        self.fired += 1
+
+    def clear(self):
+        self.count = 0
+
+    def _wall_grid(self, level):
+        """Wall tiles with a walled one-tile border (arrows leaving the map stop), rebuilt per level."""
+        if level is not self.level:
+            width, height = level.size
+            grid = np.zeros((height + 2, width + 2), dtype=bool)
+            grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = True
+            for wall in level.walls:
+                tile_x, tile_y = wall.x // self.tile_size, wall.y // self.tile_size
+                if 0 <= tile_x < width and 0 <= tile_y < height:
+                    grid[tile_y + 1, tile_x + 1] = True
+            self.walls = grid
+            self.level = level
+        return self.walls
+
+    def _hits_wall(self, walls, left, top):
+        """True for each rect of this pool's size at (left, top) that touches a wall tile."""
+        height, width = walls.shape
+        size, tile_size = self.size, self.tile_size
+        x0 = np.minimum(np.maximum(left // tile_size + 1, 0), width - 1)
+        x1 = np.minimum(np.maximum((left + size - 1) // tile_size + 1, 0), width - 1)
+        y0 = np.minimum(np.maximum(top // tile_size + 1, 0), height - 1)
+        y1 = np.minimum(np.maximum((top + size - 1) // tile_size + 1, 0), height - 1)
+        return walls[y0, x0] | walls[y0, x1] | walls[y1, x0] | walls[y1, x1]
+
+    def update(self, level, swarm, damage_multiplier=1.0):
+        """Move every arrow one step and resolve what it runs into.
+
+        Arrows that would reach a wall are dropped without moving; the rest
+        damage the first enemy their swept path overlaps, and are dropped too
+        if they hit one. Returns the enemies that died, still in `swarm`, for
+        the caller to take out.
+        """
+        n = self.count
+        if not n:
+            return []
+        walls = self._wall_grid(level)
+        x, y = self.x[:n], self.y[:n]
+        step_x = (self.dx[:n] * self.speed[:n]).astype(np.int64)
+        step_y = (self.dy[:n] * self.speed[:n]).astype(np.int64)
+
+        # Swept wall test: check the rect at sub-steps no longer than a tile, so
+        # a fast arrow can't jump over a wall between one frame and the next
+        substeps = max(1, math.ceil(float(np.abs(np.concatenate((step_x, step_y))).max()) / self.tile_size))
+        stopped = np.zeros(n, dtype=bool)
+        for i in range(1, substeps + 1):
+            stopped |= self._hits_wall(walls, x + step_x * i // substeps, y + step_y * i // substeps)
+        flying = ~stopped
+        new_x = np.where(flying, x + step_x, x)
+        new_y = np.where(flying, y + step_y, y)
+
+        # Enemies: the box swept from the old rect to the new one, for arrows still flying
+        slot = np.full(n, -1, dtype=np.int64)
+        if len(swarm) and flying.any():
+            moving = np.flatnonzero(flying)
+            left = np.minimum(x, new_x)[moving]
+            top = np.minimum(y, new_y)[moving]
+            right = np.maximum(x, new_x)[moving] + self.size
+            bottom = np.maximum(y, new_y)[moving] + self.size
+            slot[moving] = swarm.first_hits(left, top, right, bottom)
+        hit = slot >= 0
+
+        dead = []
+        if hit.any():
+            self.hits += int(hit.sum())
+            damage = np.bincount(slot[hit], self.damage[:n][hit] * damage_multiplier, len(swarm))
+            health = swarm.arrays['health'][:len(swarm)]
+            health[:] = (health - damage).astype(np.int64)
+            for enemy_slot in np.flatnonzero((damage > 0) & (health <= 0)):
+                dead.append(swarm.members[enemy_slot])
+
+        # Compaction: keep the arrows still flying, packed at the front
+        keep = flying & ~hit
+        self.count = int(keep.sum())
+        for name in ('dx', 'dy', 'speed', 'damage'):
+            array = getattr(self, name)
+            array[:self.count] = array[:n][keep]
+        self.x[:self.count] = new_x[keep]
+        self.y[:self.count] = new_y[keep]
+        return dead
+
+    def draw(self, screen, color):
+        size = self.size
+        fill = screen.fill
+        for x, y in zip(self.x[:self.count].tolist(), self.y[:self.count].tolist()):
+            fill(color, (x, y, size, size))
@@ -0,0 +1,409 @@
+from array import array
+
+
+class ReachabilityIndex:
+    """4-neighbour connectivity of a maze, built once and queried in O(1).
+
+    A flood fill from the start records which cells are reachable and keeps one
+    start->exit path. Walls added off that path can't disconnect it, and a wall
+    on it is first routed around with a small local search, so the full flood
+    is only redone when no nearby detour exists.
+
+    The cells every start->exit path goes through (where a wall would cut it)
+    come from one Tarjan lowlink pass. Adding walls only removes paths, so a
+    cut cell stays a cut cell: add_wall keeps the marks and flags them as
+    possibly incomplete, and the pass is only rerun when a query lands on an
+    unmarked path cell after the walls changed.
+
+    The grid is stored with a one-cell wall border so neighbours never need
+    bounds checks.
+    """
+
+    def __init__(self, size, walls=(), start=None, exit_pos=None):
+        self.size = size
+        self.width = width = size + 2
+        start = start or [0, size - 1]
+        exit_pos = exit_pos or [size - 1, 0]
+        self.start = self._index(*start)
+        self.exit = self._index(*exit_pos)
+
+        self.walls = bytearray(b'\x01' * (width * width))
+        for y in range(size):
+            row = (y + 1) * width + 1
+            self.walls[row:row + size] = bytes(size)
+        for x, y in walls:
+            if 0 <= x < size and 0 <= y < size:
+                self.walls[(y + 1) * width + x + 1] = 1
+
+        self.rebuilds = 0
+        self.cut_passes = 0
+        self.rebuild()
+
+    def _index(self, x, y):
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return (y + 1) * self.width + x + 1
+        return -1
+
+    def rebuild(self):
+        """Flood fill from the start, pick a shortest path to the exit and forget the cut cells."""
+        self.cuts = bytearray(len(self.walls))
+        self.cuts_stale = True
+        self._flood()
+
+    def _flood(self):
+        self.rebuilds += 1
+        self.dirty = False
+        cells = len(self.walls)
+        walls = self.walls
+        width = self.width
+        parent = array('i', [-1]) * cells
+        self.reachable_cells = reachable = bytearray(cells)
+        self.path_cells = bytearray(cells)
+        self.path_list = []
+        self.path_order = {}
+        if walls[self.start]:
+            return
+
+        reachable[self.start] = 1
+        frontier = [self.start]
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                for j in (i - width, i + width, i - 1, i + 1):
+                    if not walls[j] and not reachable[j]:
+                        reachable[j] = 1
+                        parent[j] = i
+                        next_frontier.append(j)
+            frontier = next_frontier
+        if not reachable[self.exit]:
+            return
+
+        # Breadth-first parents give a shortest path back from the exit
+        i = self.exit
+        while i != -1:
+            self.path_list.append(i)
+            i = parent[i]
+        self.path_list.reverse()
+        self._index_path()
+
+    def _index_path(self):
+        self.path_cells = bytearray(len(self.walls))
+        self.path_order = {}
+        for n, i in enumerate(self.path_list):
+            self.path_cells[i] = 1
+            self.path_order[i] = n
+
+    def _detour(self, i, limit, window=16):
+        """Reroute the kept path around a new wall at path cell i, searching at most `limit` cells.
+
+        The search starts from the last `window` path cells before the wall, so
+        it isn't boxed in when the path doubles back next to itself.
+        """
+        walls = self.walls
+        path_cells = self.path_cells
+        path_order = self.path_order
+        order = path_order[i]
+        steps = (-self.width, self.width, -1, 1)
+        sources = self.path_list[max(0, order - window):order]
+        came_from = dict.fromkeys(sources, -1)
+        frontier = sources
+        while frontier and len(came_from) < limit:
+            next_frontier = []
+            for node in frontier:
+                for step in steps:
+                    j = node + step
+                    if walls[j] or j in came_from:
+                        continue
+                    if path_cells[j]:
+                        # Rejoin the path anywhere past the wall
+                        if path_order[j] > order:
+                            route = []
+                            while came_from[node] != -1:
+                                route.append(node)
+                                node = came_from[node]
+                            route.append(node)
+                            route.reverse()
+                            self.path_list[path_order[node]:path_order[j]] = route
+                            self._index_path()
+                            return True
+                        continue
+                    came_from[j] = node
+                    next_frontier.append(j)
+            frontier = next_frontier
+        return False
+
+    def _refresh(self):
+        if self.dirty:
+            self._flood()
+
+    def _mark_cuts(self):
+        """Mark the open cells every start->exit path goes through (Tarjan's lowlink)."""
+        self._refresh()
+        self.cut_passes += 1
+        self.cuts_stale = False
+        if not self.reachable_cells[self.exit]:
+            return
+        cells = len(self.walls)
+        walls = self.walls
+        steps = (-self.width, self.width, -1, 1)
+        order = array('i', [-1]) * cells
+        low = array('i', [0]) * cells
+        parent = array('i', [-1]) * cells
+
+        # Iterative DFS so big boards don't hit the recursion limit; each stack
+        # entry is a cell and how many of its neighbours have been tried
+        counter = 0
+        order[self.start] = low[self.start] = 0
+        stack = [[self.start, 0]]
+        while stack:
+            top = stack[-1]
+            node = top[0]
+            if top[1] < 4:
+                nxt = node + steps[top[1]]
+                top[1] += 1
+                if walls[nxt]:
+                    continue
+                if order[nxt] == -1:
+                    counter += 1
+                    order[nxt] = low[nxt] = counter
+                    parent[nxt] = node
+                    stack.append([nxt, 0])
+                elif nxt != parent[node] and order[nxt] < low[node]:
+                    low[node] = order[nxt]
+            else:
+                stack.pop()
+                if stack and low[node] < low[stack[-1][0]]:
+                    low[stack[-1][0]] = low[node]
+
+        # Walk the DFS tree back from the exit: an ancestor cuts the path when the
+        # subtree holding the exit has no edge climbing above it
+        cuts = self.cuts
+        child = self.exit
+        while parent[child] != -1:
+            node = parent[child]
+            if node != self.start and low[child] >= order[node]:
+                cuts[node] = 1
+            child = node
+
+    def reachable(self, x, y):
+        """True if (x, y) can be walked to from the start."""
+        self._refresh()
+        i = self._index(x, y)
+        return i >= 0 and self.reachable_cells[i] == 1
+
+    def connected(self):
+        """True if the exit can be walked to from the start."""
+        self._refresh()
+        return self.reachable_cells[self.exit] == 1
+
+    def cuts_path(self, x, y):
+        """True if walling (x, y) would disconnect the start from the exit."""
+        i = self._index(x, y)
+        if i < 0 or self.walls[i]:
+            return False
+        if i in (self.start, self.exit):
+            return self.connected()
+        if not self.path_cells[i]:
+            # Off the kept path, so that path survives the wall
+            return False
+        if not self.cuts[i] and self.cuts_stale:
+            self._mark_cuts()
+        return self.cuts[i] == 1
+
+    def add_wall(self, x, y):
+        """Wall (x, y) unless it would disconnect start and exit. Returns True if added."""
+        i = self._index(x, y)
+        if i < 0 or self.walls[i] or i in (self.start, self.exit) or self.cuts[i]:
+            return False
+        self.walls[i] = 1
+        self.cuts_stale = True
+        if not self.path_cells[i]:
+            # Reachability may shrink but the path holds; refresh on the next query
+            self.dirty = True
+            return True
+
+        # On the path: try a local detour first, then flood again with the wall in
+        # place and back out if it cut
+        if self._detour(i, self.size * 8):
+            self.dirty = True
+            return True
+        previous = (self.reachable_cells, self.path_cells, self.path_list, self.path_order, self.dirty)
+        self._flood()
+        if self.reachable_cells[self.exit]:
+            return True
+        self.walls[i] = 0
+        (self.reachable_cells, self.path_cells, self.path_list, self.path_order, self.dirty) = previous
+        self.cuts[i] = 1  # Learned the hard way; it stays a cut as more walls go in
+        return False
+
+    def reachable_list(self):
+        """All cells reachable from the start as [x, y] lists."""
+        self._refresh()
+        return self._cells_of(self.reachable_cells)
+
+    def path(self):
+        """Cells on the kept start->exit path as [x, y] lists (empty if none)."""
+        self._refresh()
+        return self._cells_of(self.path_cells)
+
+    def _cells_of(self, plane):
+        cells = []
+        i = plane.find(1)
+        while i != -1:
+            cells.append([i % self.width - 1, i // self.width - 1])
+            i = plane.find(1, i + 1)
+        return cells
+
+
+class FloorConnectivity:
+    """Keeps the open cells of a tile grid in one 4-connected region as cells get blocked.
+
+    block() only checks around the cells being blocked: their open neighbours
+    are flood filled in lockstep, one layer each, until they have all met (still
+    connected) or one group runs out of cells (it got sealed off). A block that
+    something routes around a few tiles away is accepted after looking at a
+    few tiles, and a pocket it would cut off is found after filling just the
+    pocket, so no check walks the whole map.
+
+    Like ReachabilityIndex the grid has a one-cell blocked border, and the
+    per-check visited marks are stamped rather than cleared.
+    """
+
+    def __init__(self, width, height, blocked=()):
+        self.width = width
+        self.height = height
+        self.stride = stride = width + 2
+        self.blocked = bytearray(b'\x01' * (stride * (height + 2)))
+        for y in range(height):
+            row = (y + 1) * stride + 1
+            self.blocked[row:row + width] = bytes(width)
+        for x, y in blocked:
+            i = self._index(x, y)
+            if i >= 0:
+                self.blocked[i] = 1
+        self.open_count = self.blocked.count(0)
+
+        self.seen = array('i', [0]) * len(self.blocked)  # Stamp of the check that reached each cell
+        self.owner = array('i', [0]) * len(self.blocked)  # Which search got there first
+        self.stamp = 0
+        self.checks = 0
+        self.visited = 0
+
+    def _index(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (y + 1) * self.stride + x + 1
+        return -1
+
+    def is_blocked(self, x, y):
+        i = self._index(x, y)
+        return i < 0 or self.blocked[i] == 1
+
+    def connected(self):
+        """True if there are open cells and they form a single region (full flood fill)."""
+        start = self.blocked.find(0)
+        if start == -1:
+            return False
+        blocked = self.blocked
+        stride = self.stride
+        self.stamp += 1
+        stamp = self.stamp
+        seen = self.seen
+        seen[start] = stamp
+        stack = [start]
+        count = 0
+        while stack:
+            i = stack.pop()
+            count += 1
+            for j in (i - stride, i + stride, i - 1, i + 1):
+                if not blocked[j] and seen[j] != stamp:
+                    seen[j] = stamp
+                    stack.append(j)
+        return count == self.open_count
+
+    def can_block(self, cells):
+        """True if blocking the (x, y) cells leaves the open cells connected and not empty."""
+        newly = {i for i in (self._index(x, y) for x, y in cells) if i >= 0 and not self.blocked[i]}
+        if not newly:
+            return True
+        if len(newly) >= self.open_count:
+            return False
+        for i in newly:
+            self.blocked[i] = 1
+        try:
+            return self._still_connected(newly)
+        finally:
+            for i in newly:
+                self.blocked[i] = 0
+
+    def block(self, cells):
+        """Block the (x, y) cells unless that would split or empty the open region. Returns True if blocked."""
+        cells = list(cells)
+        if not self.can_block(cells):
+            return False
+        for x, y in cells:
+            i = self._index(x, y)
+            if i >= 0 and not self.blocked[i]:
+                self.blocked[i] = 1
+                self.open_count -= 1
+        return True
+
+    def _still_connected(self, newly):
+        """Whether the open neighbours of the just-blocked cells can still reach each other."""
+        self.checks += 1
+        blocked = self.blocked
+        stride = self.stride
+        seen = self.seen
+        owner = self.owner
+        self.stamp += 1
+        stamp = self.stamp
+
+        sources = []
+        for i in newly:
+            for j in (i - stride, i + stride, i - 1, i + 1):
+                if not blocked[j] and seen[j] != stamp:
+                    seen[j] = stamp
+                    owner[j] = len(sources)
+                    sources.append(j)
+        if len(sources) <= 1:
+            return True
+
+        # Union-find over the searches, merged when they touch
+        parent = list(range(len(sources)))
+
+        def find(n):
+            while parent[n] != n:
+                parent[n] = parent[parent[n]]
+                n = parent[n]
+            return n
+
+        # One frontier per group; a group that meets another takes over its frontier
+        frontiers = {n: [source] for n, source in enumerate(sources)}
+        while True:
+            for root in list(frontiers):
+                frontier = frontiers.get(root)
+                if frontier is None:
+                    continue  # Merged into another group earlier this round
+                next_frontier = []
+                for i in frontier:
+                    for j in (i - stride, i + stride, i - 1, i + 1):
+                        if blocked[j]:
+                            continue
+                        if seen[j] != stamp:
+                            seen[j] = stamp
+                            owner[j] = root
+                            next_frontier.append(j)
+                            continue
+                        other = owner[j]
+                        if other == root:
+                            continue
+                        other = find(other)
+                        if other != root:
+                            parent[other] = root
+                            next_frontier.extend(frontiers.pop(other))
+                            if len(frontiers) == 1:
+                                return True
+                if not next_frontier:
+                    # Filled a region none of the other groups reached
+                    return False
+                self.visited += len(next_frontier)
+                frontiers[root] = next_frontier
@@ -0,0 +1,158 @@
+import numpy as np
+
+from game_state import GameState
+
+# Action codes for Simulator.step
+NOOP = 0
+UP = 1
+DOWN = 2
+LEFT = 3
+RIGHT = 4
+PLACE = 5
+DESTROY = 6
+
+# (dx, dy) per action code, NOOP/PLACE/DESTROY don't move
+ACTION_DX = np.array([0, 0, 0, -1, 1, 0, 0], dtype=np.int32)
+ACTION_DY = np.array([0, -1, 1, 0, 0, 0, 0], dtype=np.int32)
+
+
+class Simulator:
+    """Headless, batched version of the game_state.Game rules.
+
+    Steps many independent games in lockstep. All state lives in NumPy arrays
+    indexed by game, so there are no per-game Python objects on the hot path.
+    """
+
+    def __init__(self, mazes, batch_size=None):
+        """Create a batch from a list of maze dicts, or one maze repeated `batch_size` times."""
+        if isinstance(mazes, dict):
+            mazes = [mazes] * (batch_size or 1)
+        self.batch_size = len(mazes)
+        self.size = mazes[0]['size']
+        if any(maze['size'] != self.size for maze in mazes):
+            raise ValueError("All mazes in a batch must have the same size")
+
+        shape = (self.batch_size, self.size, self.size)
+        self.walls = np.zeros(shape, dtype=bool)
+        self.placed = np.zeros(shape, dtype=bool)
+        self.coin_cells = np.zeros(shape, dtype=bool)
+        self.visited = np.zeros(shape, dtype=bool)
+
+        self.player_x = np.zeros(self.batch_size, dtype=np.int32)
+        self.player_y = np.zeros(self.batch_size, dtype=np.int32)
+        self.coins = np.ones(self.batch_size, dtype=np.int32)  # Start with 1 coin like Game
+        self.blocks_placed = np.zeros(self.batch_size, dtype=np.int32)
+        self.blocks_destroyed = np.zeros(self.batch_size, dtype=np.int32)
+        self.moves = np.zeros(self.batch_size, dtype=np.int32)
+        self.state = np.full(self.batch_size, GameState.PLAYING.value, dtype=np.int8)
+
+        for i, maze in enumerate(mazes):
+            self._load(i, maze)
+
+        self.batch = np.arange(self.batch_size)
+
+    def _load(self, i, maze):
+        for layer, cells in ((self.walls, maze['walls']), (self.coin_cells, maze['coins'])):
+            for x, y in cells:
+                if 0 <= x < self.size and 0 <= y < self.size:
+                    layer[i, y, x] = True
+        self.player_x[i], self.player_y[i] = maze['start']
+        self.visited[i, self.player_y[i], self.player_x[i]] = True
+
+    @property
+    def done(self):
+        """Mask of games that are no longer playing."""
+        return self.state != GameState.PLAYING.value
+
+    def step(self, actions, targets=None):
+        """Apply one action per game.
+
+        `actions` is an int array of action codes. PLACE and DESTROY act on the
+        cell given by `targets`, an (n, 2) array of [x, y] like the cursor.
+        """
+        actions = np.asarray(actions, dtype=np.int32)
+        playing = ~self.done
+
+        if targets is not None:
+            targets = np.asarray(targets, dtype=np.int32)
+            self._place(playing & (actions == PLACE), targets)
+            self._destroy(playing & (actions == DESTROY), targets)
+
+        dx = ACTION_DX[actions]
+        dy = ACTION_DY[actions]
+        self._slide(playing & ((dx != 0) | (dy != 0)), dx, dy)
+
+    def _slide(self, mask, dx, dy):
+        b = self.batch[mask]
+        if b.size == 0:
+            return
+        x = self.player_x[b]
+        y = self.player_y[b]
+        dx = dx[b]
+        dy = dy[b]
+        start_x = x.copy()
+        start_y = y.copy()
+
+        # Advance every still-sliding game one cell per pass; at most `size` passes
+        active = np.ones(b.size, dtype=bool)
+        for _ in range(self.size):
+            nx = x + dx
+            ny = y + dy
+            inside = (nx >= 0) & (nx < self.size) & (ny >= 0) & (ny < self.size)
+            cx = np.clip(nx, 0, self.size - 1)
+            cy = np.clip(ny, 0, self.size - 1)
+            free = inside & ~self.walls[b, cy, cx] & ~self.placed[b, cy, cx]
+            active &= free
+            if not active.any():
+                break
+            x = np.where(active, nx, x)
+            y = np.where(active, ny, y)
+
+            # Visit and collect coins on the cells entered this pass
+            ab, ax, ay = b[active], x[active], y[active]
+            self.visited[ab, ay, ax] = True
+            got = self.coin_cells[ab, ay, ax]
+            self.coins[ab[got]] += 1
+            self.coin_cells[ab[got], ay[got], ax[got]] = False
+
+        self.player_x[b] = x
+        self.player_y[b] = y
+        moved = (x != start_x) | (y != start_y)
+        self.moves[b[moved]] += 1
+
+        # Reaching the top-right corner completes the level
+        won = b[moved & (x == self.size - 1) & (y == 0)]
+        self.state[won] = GameState.LEVEL_COMPLETE.value
+
+    def _in_bounds_targets(self, mask, targets):
+        b = self.batch[mask]
+        tx = targets[b, 0]
+        ty = targets[b, 1]
+        ok = (tx >= 0) & (tx < self.size) & (ty >= 0) & (ty < self.size)
+        return b[ok], tx[ok], ty[ok]
+
+    def _place(self, mask, targets):
+        b, tx, ty = self._in_bounds_targets(mask, targets)
+        cost = self.blocks_placed[b] + 1
+        ok = (~self.walls[b, ty, tx] & ~self.coin_cells[b, ty, tx] & ~self.placed[b, ty, tx] &
+              ((tx != self.player_x[b]) | (ty != self.player_y[b])) &
+              (self.coins[b] >= cost))
+        b, tx, ty = b[ok], tx[ok], ty[ok]
+        self.placed[b, ty, tx] = True
+        self.coins[b] -= cost[ok]
+        self.blocks_placed[b] += 1
+
+    def _destroy(self, mask, targets):
+        b, tx, ty = self._in_bounds_targets(mask, targets)
+        cost = self.blocks_destroyed[b] + 1
+        ok = (self.walls[b, ty, tx] | self.placed[b, ty, tx]) & (self.coins[b] >= cost)
+        b, tx, ty = b[ok], tx[ok], ty[ok]
+        self.walls[b, ty, tx] = False
+        self.placed[b, ty, tx] = False
+        self.visited[b, ty, tx] = True
+        self.coins[b] -= cost[ok]
+        self.blocks_destroyed[b] += 1
+
+    def wall_counts(self):
+        """Walls left in each game."""
+        return self.walls.sum(axis=(1, 2))
@@ -0,0 +1,107 @@
+class SpatialHash:
+    """Uniform grid mapping each cell to the items whose rects overlap it.
+
+    Items are anything with a pygame.Rect: walls are stored as their own rect,
+    pillars and enemies under their object. A query only looks at the cells
+    the query rect covers, so collision cost depends on what is nearby rather
+    than on how much is in the level. Moving items are re-bucketed with move(),
+    which only touches the grid when the item crosses into other cells.
+
+    The game itself only indexes static walls now (enemies live in an
+    EnemySwarm); move() and remove() stay for the per-enemy baselines in
+    benchmarks.py that the swarm is measured against.
+    """
+
+    def __init__(self, cell_size, items=()):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell x, cell y) -> list of items
+        self.entries = {}  # id(item) -> (item, rect, cell range)
+        for item in items:
+            self.insert(item)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        # right/bottom are exclusive, like colliderect
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _cells(self, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                yield cx, cy
+
+    def insert(self, item, rect=None):
+        """Add an item, indexed by `rect` or else by item.rect (or the item itself if it is a Rect)."""
+        if rect is None:
+            rect = getattr(item, 'rect', item)
+        cell_range = self._cell_range(rect)
+        self.entries[id(item)] = (item, rect, cell_range)
+        for cell in self._cells(cell_range):
+            self.cells.setdefault(cell, []).append(item)
+
+    def remove(self, item):
+        entry = self.entries.pop(id(item), None)
+        if entry is None:
+            return
+        for cell in self._cells(entry[2]):
+            bucket = self.cells[cell]
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, item, rect=None):
+        """Update an item after its rect moved or was replaced."""
+        if rect is None:
+            rect = getattr(item, 'rect', item)
+        entry = self.entries.get(id(item))
+        if entry is None:
+            self.insert(item, rect)
+            return
+        cell_range = self._cell_range(rect)
+        if cell_range == entry[2]:
+            self.entries[id(item)] = (item, rect, cell_range)
+            return
+        self.remove(item)
+        self.insert(item, rect)
+
+    def query(self, rect, ignore=None):
+        """Items whose rects overlap `rect`, each once, skipping `ignore`."""
+        size = self.cell_size
+        cells = self.cells
+        entries = self.entries
+        found = []
+        seen = set()
+        x0, x1 = rect.left // size, (rect.right - 1) // size + 1
+        for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cx in range(x0, x1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    key = id(item)
+                    if key in seen or item is ignore:
+                        continue
+                    seen.add(key)
+                    if entries[key][1].colliderect(rect):
+                        found.append(item)
+        return found
+
+    def collides(self, rect, ignore=None):
+        """True if any item other than `ignore` overlaps `rect`."""
+        size = self.cell_size
+        cells = self.cells
+        entries = self.entries
+        x0, x1 = rect.left // size, (rect.right - 1) // size + 1
+        for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cx in range(x0, x1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if item is not ignore and entries[id(item)][1].colliderect(rect):
+                        return True
+        return False
@@ -0,0 +1,119 @@
+import math
+import random
+
+import numpy as np
+
+MAX_DISTANCE = 8  # Distances are only worked out this far; anything further reads as 8
+SAMPLE_ATTEMPTS = 30  # Random draws allowed per tile asked for before sample() gives up
+
+
+def chebyshev_distance(blocked, edge_blocked):
+    """Tiles from each tile to the nearest blocked one, counting diagonal steps as one.
+
+    With `edge_blocked`, off the map counts as blocked too. Capped at MAX_DISTANCE.
+    """
+    height, width = blocked.shape
+    distance = np.full(blocked.shape, MAX_DISTANCE, dtype=np.int8)
+    distance[blocked] = 0
+    reached = blocked.copy()
+    for step in range(1, MAX_DISTANCE):
+        # Grow what is reached by one tile in all 8 directions
+        padded = np.pad(reached, 1, constant_values=edge_blocked)
+        grown = reached.copy()
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                grown |= padded[dy:dy + height, dx:dx + width]
+        distance[grown & ~reached] = step
+        reached = grown
+    return distance
+
+
+class SpawnIndex:
+    """Where a level has room for the player, enemies and power-ups, worked out once per level.
+
+    Two distance fields cover the placement rules: tiles to the nearest wall
+    (or the map edge) and tiles to the nearest hazard. The tiles meeting a
+    given clearance are listed the first time they are asked for, so a spawn
+    query just draws from that list. sample() makes at most SAMPLE_ATTEMPTS
+    draws per tile wanted, so it always returns, with fewer tiles if the map
+    is too crowded.
+    """
+
+    def __init__(self, width, height, wall_tiles=(), hazard_tiles=()):
+        self.width = width
+        self.height = height
+        walls = np.zeros((height, width), dtype=bool)
+        hazards = np.zeros((height, width), dtype=bool)
+        for grid, tiles in ((walls, wall_tiles), (hazards, hazard_tiles)):
+            for x, y in tiles:
+                if 0 <= x < width and 0 <= y < height:
+                    grid[y, x] = True
+        self.wall_distance = chebyshev_distance(walls, True)
+        self.hazard_distance = chebyshev_distance(hazards, False)
+        self._cells = {}  # (min_wall, min_hazard, margin) -> tiles as (x, y)
+        self._farthest = {}
+        self.samples = 0
+        self.draws = 0
+
+    def is_clear(self, tile_x, tile_y, min_wall=1, min_hazard=1, margin=0):
+        """True if the tile is at least `margin` tiles inside the map and far enough from walls and hazards."""
+        return (margin <= tile_x < self.width - margin and margin <= tile_y < self.height - margin and
+                self.wall_distance[tile_y, tile_x] >= min_wall and
+                self.hazard_distance[tile_y, tile_x] >= min_hazard)
+
+    def cells(self, min_wall=1, min_hazard=1, margin=0):
+        """Every tile passing is_clear with these settings, listed once and then reused."""
+        key = (min_wall, min_hazard, margin)
+        cells = self._cells.get(key)
+        if cells is None:
+            clear = (self.wall_distance >= min_wall) & (self.hazard_distance >= min_hazard)
+            inner = np.zeros_like(clear)
+            inner[margin:self.height - margin, margin:self.width - margin] = True
+            ys, xs = np.nonzero(clear & inner)
+            cells = self._cells[key] = list(zip(xs.tolist(), ys.tolist()))
+        return cells
+
+    def farthest(self, tile_x, tile_y, count, min_wall=1, min_hazard=1, margin=0):
+        """The `count` clear tiles furthest from (tile_x, tile_y), furthest first."""
+        key = (tile_x, tile_y, count, min_wall, min_hazard, margin)
+        found = self._farthest.get(key)
+        if found is None:
+            cells = self.cells(min_wall, min_hazard, margin)
+            found = self._farthest[key] = sorted(
+                cells, key=lambda cell: -((cell[0] - tile_x) ** 2 + (cell[1] - tile_y) ** 2))[:count]
+        return found
+
+    def sample(self, k, min_wall=1, min_hazard=1, margin=0, avoid=(), spacing=0, taken=(), rng=random):
+        """Up to `k` random clear tiles as (x, y).
+
+        Each one is at least `distance` tiles from every (x, y, distance) in
+        `avoid`, and at least `spacing` tiles from the others and from the
+        tiles in `taken`.
+        """
+        cells = self.cells(min_wall, min_hazard, margin)
+        chosen = []
+        if not cells:
+            return chosen
+        self.samples += 1
+        placed = list(taken)
+        for _ in range(k * SAMPLE_ATTEMPTS):
+            if len(chosen) == k:
+                break
+            self.draws += 1
+            x, y = cells[rng.randrange(len(cells))]
+            if any(math.hypot(x - ax, y - ay) < distance for ax, ay, distance in avoid):
+                continue
+            if any(math.hypot(x - px, y - py) < spacing for px, py in placed):
+                continue
+            chosen.append((x, y))
+            placed.append((x, y))
+        return chosen
+
+    def stats(self):
+        """Get lookup counters."""
+        return {
+            'cell_lists': len(self._cells),
+            'samples': self.samples,
+            'draws': self.draws,
+            'draws_per_sample': self.draws / self.samples if self.samples else 0.0,
+        }
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from game_state import Game
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+def walked_stop(game, x, y, dx, dy):
+    """Where a slide ends, walked cell by cell against the current layers."""
+    while (0 <= x + dx < game.grid_size and 0 <= y + dy < game.grid_size and
+           [x + dx, y + dy] not in game.walls and [x + dx, y + dy] not in game.player_placed_blocks):
+        x += dx
+        y += dy
+    return x, y
+
+
+def assert_slides_current(game):
+    for y in range(game.grid_size):
+        for x in range(game.grid_size):
+            for dx, dy in DIRECTIONS:
+                assert game.slides.stop(x, y, dx, dy) == walked_stop(game, x, y, dx, dy)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_layer_mutations_keep_the_slides_current(seed):
+    rng = random.Random(seed)
+    game = Game()
+    game.init_level({'walls': [[3, 3], [6, 1]], 'coins': [], 'start': [0, 9], 'exit': [9, 0], 'size': 10})
+    for _ in range(40):
+        cell = [rng.randrange(10), rng.randrange(10)]
+        layer = rng.choice([game.walls, game.player_placed_blocks])
+        if cell in layer:
+            layer.remove(cell)
+        else:
+            layer.append(cell)
+        assert_slides_current(game)
+    game.walls = [[x, 5] for x in range(1, 10)]
+    game.player_placed_blocks = []
+    assert_slides_current(game)
+
+
+def test_start_movement_stops_at_an_appended_wall():
+    game = Game()
+    game.init_level({'walls': [], 'coins': [], 'start': [0, 9], 'exit': [9, 0], 'size': 10})
+    game.walls.append([5, 9])
+    game.start_movement(1, 0)
+    assert (game.player.x, game.player.y) == (4, 9)
+    game.walls.remove([5, 9])
+    game.start_movement(1, 0)
+    assert (game.player.x, game.player.y) == (9, 9)
@@ -0,0 +1,113 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame  # noqa: E402
+
+import game  # noqa: E402
+from enemy_swarm import DENSE_HITS, EnemySwarm  # noqa: E402
+
+SIZE = game.PLAYER_SIZE
+
+
+@pytest.fixture(scope='module')
+def level():
+    # Asset paths are relative to src/, where the game is run from
+    cwd = os.getcwd()
+    os.chdir(os.path.dirname(game.__file__))
+    pygame.display.set_mode((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    yield game.Level(2, size=(40, 30), rng=random.Random(0))
+    os.chdir(cwd)
+
+
+def floor(level):
+    return [(x * game.TILE_SIZE, y * game.TILE_SIZE)
+            for y, row in enumerate(level.tilemap) for x, (tile, _) in enumerate(row)
+            if tile == 'floor' and not level.hazards.at(x, y)]
+
+
+def spawn(level, count, seed=0):
+    rng = random.Random(seed)
+    enemies = [game.Enemy(x, y, 2) for x, y in rng.sample(floor(level), count)]
+    for enemy in enemies:
+        enemy.move_delay = -1  # Move on every step
+    return EnemySwarm(enemies, SIZE, game.TILE_SIZE), rng
+
+
+def overlaps(a, b):
+    return abs(a.x - b.x) < SIZE and abs(a.y - b.y) < SIZE
+
+
+def test_step_chases_without_entering_walls_or_each_other(level):
+    swarm, rng = spawn(level, 40)
+    player = pygame.Rect(*rng.choice(floor(level)), SIZE, SIZE)
+
+    def spread():
+        return np.mean([np.hypot(enemy.rect.centerx - player.centerx, enemy.rect.centery - player.centery)
+                        for enemy in swarm.members])
+
+    before = spread()
+    for frame in range(600):
+        swarm.step(player, level, 10 ** 6 + frame)
+        for enemy in swarm.members:
+            assert not level.wall_index.collides(enemy.rect)
+            assert not level.hazards.collides(enemy.rect)
+    rects = [enemy.rect for enemy in swarm.members]
+    assert not any(overlaps(a, b) for i, a in enumerate(rects) for b in rects[i + 1:])
+    assert spread() < before / 2  # Queued behind each other, but nobody stuck on a wall corner
+    assert swarm.collides(player.inflate(4, 4))  # The nearest have caught up
+
+
+def test_crowd_never_overlaps(level):
+    # Past DENSE_PAIRS, so neighbours come from the cell buckets
+    swarm, rng = spawn(level, 400, seed=4)
+    player = pygame.Rect(*rng.choice(floor(level)), SIZE, SIZE)
+    for frame in range(80):
+        swarm.step(player, level, 10 ** 6 + frame)
+        left = swarm.x[:len(swarm)].astype(int)
+        top = swarm.y[:len(swarm)].astype(int)
+        touching = (np.abs(left[:, None] - left) < SIZE) & (np.abs(top[:, None] - top) < SIZE)
+        assert touching.sum() == len(swarm)  # Each enemy only overlaps itself
+
+
+def test_queries_match_the_members_rects(level):
+    swarm, rng = spawn(level, 80, seed=1)
+    for _ in range(50):
+        probe = pygame.Rect(rng.randrange(1600), rng.randrange(1200), rng.randint(1, 120), rng.randint(1, 120))
+        expected = [enemy for enemy in swarm.members if enemy.rect.colliderect(probe)]
+        assert swarm.query(probe) == expected
+        assert swarm.collides(probe) == bool(expected)
+        if expected:
+            assert swarm.collides(probe, ignore=expected[0]) == (len(expected) > 1)
+
+
+def test_first_hits_bucketed_matches_every_pair(level):
+    swarm, rng = spawn(level, 100, seed=2)
+    count = DENSE_HITS // len(swarm) + 50  # Past the dense cut-off, so the cell buckets are used
+    left = np.array([rng.randrange(1600) for _ in range(count)])
+    top = np.array([rng.randrange(1200) for _ in range(count)])
+    right = left + np.array([rng.randint(1, 60) for _ in range(count)])
+    bottom = top + np.array([rng.randint(1, 60) for _ in range(count)])
+    hits = swarm.first_hits(left, top, right, bottom)
+    for i in range(count):
+        box = pygame.Rect(left[i], top[i], right[i] - left[i], bottom[i] - top[i])
+        slots = [slot for slot, enemy in enumerate(swarm.members) if enemy.rect.colliderect(box)]
+        assert hits[i] == (slots[0] if slots else -1)
+
+
+def test_removed_enemies_keep_their_state(level):
+    swarm, _ = spawn(level, 10, seed=3)
+    gone = swarm.members[2:8:2]
+    for enemy in gone:
+        enemy.health = 5
+    rects = [enemy.rect for enemy in gone]
+    kept = [enemy for enemy in swarm.members if enemy not in gone]
+    swarm.remove_many(gone)
+    assert swarm.members == kept and len(swarm) == 7
+    assert [enemy.slot for enemy in kept] == list(range(7))
+    for enemy, rect in zip(gone, rects):
+        assert enemy.swarm is None
+        assert enemy.health == 5 and enemy.rect == rect
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+
+import pytest
+
+from game_state import Game, GameState
+from maze_samples import random_maze
+from maze_solver import EXACT_SIZE, MazeSolver, meets_difficulty, solve_maze
+
+
+def brute_force(maze, money=1, blocks_placed=0, blocks_destroyed=0):
+    """(moves, spend) by Dijkstra over every place, destroy and slide the rules allow, or None."""
+    size = maze['size']
+    coins = frozenset(map(tuple, maze['coins']))
+    start = (tuple(maze['start']), frozenset(), frozenset(), frozenset(map(tuple, maze['walls'])),
+             blocks_placed, blocks_destroyed)
+    best = {start: (0, 0)}
+    heap = [(0, 0, 0, start)]
+    tie = itertools.count(1)
+    while heap:
+        moves, spend, _, state = heapq.heappop(heap)
+        if best[state] < (moves, spend):
+            continue
+        (x, y), collected, placed, walls, placed_count, destroyed_count = state
+        if (x, y) == (size - 1, 0) and moves:
+            return moves, spend
+        left = money + len(collected) - spend
+        successors = []
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            cx, cy, picked = x, y, set()
+            while (0 <= cx + dx < size and 0 <= cy + dy < size and
+                   (cx + dx, cy + dy) not in walls and (cx + dx, cy + dy) not in placed):
+                cx, cy = cx + dx, cy + dy
+                if (cx, cy) in coins:
+                    picked.add((cx, cy))
+            if (cx, cy) != (x, y):
+                successors.append((((cx, cy), collected | picked, placed, walls, placed_count, destroyed_count),
+                                   1, 0))
+        for cell in itertools.product(range(size), repeat=2):
+            if (cell not in walls and cell not in placed and cell != (x, y) and
+                    (cell not in coins or cell in collected) and left > placed_count):
+                successors.append((((x, y), collected, placed | {cell}, walls, placed_count + 1, destroyed_count),
+                                   0, placed_count + 1))
+            if (cell in walls or cell in placed) and left > destroyed_count:
+                successors.append((((x, y), collected, placed - {cell}, walls - {cell}, placed_count,
+                                    destroyed_count + 1), 0, destroyed_count + 1))
+        for state, add_moves, add_spend in successors:
+            cost = (moves + add_moves, spend + add_spend)
+            if state not in best or cost < best[state]:
+                best[state] = cost
+                heapq.heappush(heap, cost + (next(tie), state))
+    return None
+
+
+def replay(maze, solution, money=1, blocks_placed=0, blocks_destroyed=0):
+    """Play a solution's path in Game and return it, checking every step is allowed."""
+    game = Game()
+    game.coins, game.blocks_placed, game.blocks_destroyed = money, blocks_placed, blocks_destroyed
+    game.init_level(maze)
+    for step in solution['path']:
+        if step[0] == 'slide':
+            game.start_movement(step[1], step[2])
+        else:
+            game.cursor.x, game.cursor.y = step[1], step[2]
+            assert game.try_place_block() if step[0] == 'place' else game.try_destroy_block()
+    return game
+
+
+def found(solution):
+    return (solution['moves'], solution['spend']) if solution['solvable'] else None
+
+
+@pytest.mark.parametrize('seed', range(60))
+def test_small_boards_match_brute_force(seed):
+    maze = random_maze(5 + seed % 2, seed=seed, wall_density=0.3, coin_density=0.1)
+    solution = MazeSolver(maze).solve()
+    assert solution['exact']
+    assert found(solution) == brute_force(maze)
+
+
+@pytest.mark.parametrize('seed', [95, 212, 341])
+def test_boards_the_old_variant_cap_got_wrong(seed):
+    # Capping boards per position, as every board size once did, gave (5, 3), unsolvable and (7, 1)
+    maze = random_maze(7, seed=seed, wall_density=0.3, coin_density=0.1)
+    assert found(MazeSolver(maze).solve()) == brute_force(maze)
+    assert found(MazeSolver(maze, board_variants=4).solve()) != brute_force(maze)
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_counters_match_brute_force(seed):
+    maze = random_maze(5, seed=seed + 1000, wall_density=0.35, coin_density=0.1)
+    counters = (1 + seed % 4, seed % 3, seed // 3 % 3)
+    assert found(solve_maze(maze, *counters)) == brute_force(maze, *counters)
+
+
+def test_paths_replay_in_game():
+    for seed in range(20):
+        maze = random_maze(10, seed=seed, wall_density=0.3, coin_density=0.05)
+        solution = solve_maze(maze)
+        if solution['solvable']:
+            game = replay(maze, solution)
+            assert game.state == GameState.LEVEL_COMPLETE
+
+
+def test_large_boards_give_a_playable_route():
+    maze = random_maze(64, seed=1, wall_density=0.2, coin_density=0.01)
+    assert maze['size'] > EXACT_SIZE
+    solution = solve_maze(maze)
+    assert solution['solvable'] and not solution['exact']
+    assert replay(maze, solution).state == GameState.LEVEL_COMPLETE
+
+
+def test_meets_difficulty_counts_the_players_counters():
+    # Walled in at the start: destroying (1, 2) is the only way out
+    maze = {'walls': [[1, 2], [0, 1]], 'coins': [], 'start': [0, 2], 'exit': [2, 0], 'size': 3}
+    assert meets_difficulty(maze, 1)
+    assert not meets_difficulty(maze, 1, money=1, blocks_destroyed=1)
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from maze_samples import bfs_has_path, random_maze
+from reachability import FloorConnectivity, ReachabilityIndex
+
+
+def flood_connected(width, height, blocked):
+    """True if the open cells form one non-empty 4-connected region, by a fresh flood fill."""
+    open_cells = {(x, y) for y in range(height) for x in range(width)} - blocked
+    if not open_cells:
+        return False
+    start = next(iter(open_cells))
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if cell in open_cells and cell not in seen:
+                seen.add(cell)
+                stack.append(cell)
+    return len(seen) == len(open_cells)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_block_agrees_with_a_full_flood_fill(seed):
+    rng = random.Random(seed)
+    width, height = 12 + seed % 3, 9
+    connectivity = FloorConnectivity(width, height)
+    blocked = set()
+    for _ in range(150):
+        x, y, size = rng.randrange(width), rng.randrange(height), rng.randint(1, 3)
+        cells = [(x + i, y + j) for i in range(size) for j in range(size) if x + i < width and y + j < height]
+        expected = flood_connected(width, height, blocked | set(cells))
+        assert connectivity.block(cells) == expected
+        if expected:
+            blocked.update(cells)
+        assert connectivity.open_count == width * height - len(blocked)
+    assert connectivity.connected()
+
+
+def test_block_refuses_to_empty_the_grid():
+    connectivity = FloorConnectivity(2, 2)
+    assert not connectivity.block([(0, 0), (1, 0), (0, 1), (1, 1)])
+    assert connectivity.block([(0, 0)])
+    assert connectivity.open_count == 3
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_index_connected_matches_bfs(seed):
+    maze = random_maze(10, seed=seed, wall_density=0.25 + seed % 4 * 0.05)
+    start, exit_pos = maze['start'], [9, 0]
+    index = ReachabilityIndex(10, maze['walls'], start, exit_pos)
+    assert index.connected() == bfs_has_path(start, exit_pos, maze['walls'], 10)
+    path = index.path()
+    if index.connected():
+        assert start in path and exit_pos in path
+        assert all(index.reachable(x, y) for x, y in path)
+    else:
+        assert path == []
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_cut_queries_agree_with_a_full_flood_fill(seed):
+    rng = random.Random(seed)
+    size = 8 + seed % 3
+    start, exit_pos = [0, size - 1], [size - 1, 0]
+    index = ReachabilityIndex(size, [], start, exit_pos)
+    walls = []
+    for _ in range(size * size):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if [x, y] in walls:
+            assert not index.cuts_path(x, y) and not index.add_wall(x, y)
+            continue
+        cuts = [x, y] in (start, exit_pos) or not bfs_has_path(start, exit_pos, walls + [[x, y]], size)
+        assert index.cuts_path(x, y) == cuts
+        assert index.add_wall(x, y) == (not cuts and [x, y] not in (start, exit_pos))
+        if not cuts:
+            walls.append([x, y])
+        assert index.connected()
+        assert sorted(index.reachable_list()) == sorted(ReachabilityIndex(size, walls, start, exit_pos).reachable_list())
+    # The cut marks carry over between walls, so most queries skip the lowlink pass
+    assert index.cut_passes < len(walls)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from game_state import Game, GameState
+from maze_samples import random_maze
+from simulator import DESTROY, PLACE, Simulator
+
+MOVES = {1: (0, -1), 2: (0, 1), 3: (-1, 0), 4: (1, 0)}
+
+
+def test_batch_matches_game_step_for_step():
+    mazes = [random_maze(8, seed=seed, wall_density=0.3, coin_density=0.15) for seed in range(16)]
+    sim = Simulator(mazes)
+    games = []
+    for maze in mazes:
+        game = Game()
+        game.init_level(maze)
+        games.append(game)
+
+    rng = np.random.default_rng(0)
+    for _ in range(60):
+        actions = rng.integers(0, 7, len(mazes))
+        targets = rng.integers(0, 8, (len(mazes), 2))
+        sim.step(actions, targets)
+        for i, game in enumerate(games):
+            if game.state != GameState.PLAYING:
+                continue
+            game.cursor.x, game.cursor.y = targets[i]
+            if actions[i] == PLACE:
+                game.try_place_block()
+            elif actions[i] == DESTROY:
+                game.try_destroy_block()
+            elif actions[i] in MOVES:
+                game.start_movement(*MOVES[actions[i]])
+
+        for i, game in enumerate(games):
+            assert (sim.player_x[i], sim.player_y[i]) == (game.player.x, game.player.y)
+            assert sim.coins[i] == game.coins
+            assert (sim.blocks_placed[i], sim.blocks_destroyed[i]) == (game.blocks_placed, game.blocks_destroyed)
+            assert sim.state[i] == game.state.value
+    assert sim.done.any()
+
+
+def test_mixed_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        Simulator([random_maze(5, seed=0), random_maze(6, seed=0)])
@@ -0,0 +1,61 @@
+import math
+import random
+
+import pytest
+
+from spawn_index import MAX_DISTANCE, SpawnIndex
+
+
+def random_index(seed, width=20, height=15):
+    rng = random.Random(seed)
+    walls = {(rng.randrange(width), rng.randrange(height)) for _ in range(25)}
+    hazards = {(rng.randrange(width), rng.randrange(height)) for _ in range(15)} - walls
+    return SpawnIndex(width, height, walls, hazards), walls, hazards
+
+
+def clearance(x, y, tiles, width=None, height=None):
+    """Chebyshev tiles from (x, y) to the nearest of `tiles`, or to off the map when the size is given."""
+    distances = [max(abs(x - tx), abs(y - ty)) for tx, ty in tiles]
+    if width is not None:
+        distances.append(min(x + 1, y + 1, width - x, height - y))
+    return min(distances + [MAX_DISTANCE])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cells_match_a_tile_by_tile_check(seed):
+    index, walls, hazards = random_index(seed)
+    for min_wall, min_hazard, margin in ((1, 1, 0), (2, 1, 3), (2, 3, 3), (1, 2, 1)):
+        expected = [(x, y) for y in range(15) for x in range(20)
+                    if margin <= x < 20 - margin and margin <= y < 15 - margin and
+                    clearance(x, y, walls, 20, 15) >= min_wall and clearance(x, y, hazards) >= min_hazard]
+        assert index.cells(min_wall, min_hazard, margin) == expected
+        assert all(index.is_clear(x, y, min_wall, min_hazard, margin) for x, y in expected)
+
+
+def test_sample_keeps_its_distances():
+    index, _, _ = random_index(0)
+    avoid = [(10, 7, 4)]
+    taken = [(3, 3)]
+    for seed in range(20):
+        tiles = index.sample(5, avoid=avoid, spacing=3, taken=taken, rng=random.Random(seed))
+        assert tiles
+        assert all(index.is_clear(x, y) for x, y in tiles)
+        assert all(math.hypot(x - 10, y - 7) >= 4 for x, y in tiles)
+        placed = taken + tiles
+        assert all(math.hypot(a[0] - b[0], a[1] - b[1]) >= 3
+                   for i, a in enumerate(placed) for b in placed[i + 1:])
+
+
+def test_sample_is_reproducible_and_gives_up_when_crowded():
+    index, _, _ = random_index(1)
+    assert index.sample(4, rng=random.Random(7)) == index.sample(4, rng=random.Random(7))
+    # No 20x15 map has room for 100 tiles 5 apart
+    assert len(index.sample(100, spacing=5, rng=random.Random(0))) < 100
+
+
+def test_farthest_is_furthest_first():
+    index, _, _ = random_index(2)
+    corners = index.farthest(10, 7, 3, min_wall=1, min_hazard=2, margin=2)
+    cells = index.cells(1, 2, 2)
+    distances = sorted(((x - 10) ** 2 + (y - 7) ** 2 for x, y in cells), reverse=True)
+    assert [(x - 10) ** 2 + (y - 7) ** 2 for x, y in corners] == distances[:3]
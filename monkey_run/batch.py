@@ -0,0 +1,156 @@
+"""Play many seeded headless Monkey Run games in parallel.
+
+Run from the monkey_run directory:
+    python batch.py                          # 2000 runs on every core
+    python batch.py --runs 500 --workers 4 --max-frames 9000
+    python batch.py --verify 20              # also replay 20 runs and check they match
+
+Each run is played by a simple bot on a RunEngine seeded with the run number,
+so the same command always gives the same scores. Prints the score and run
+length distributions and the cost of RunEngine.step per frame.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from collections import Counter
+
+from engine import RunEngine, InputRecorder, replay, LEFT, RIGHT
+from obstacle_pool import BANANA, PEEL
+
+FRAME_BUDGET_US = 1e6 / 30  # One frame at 30 FPS
+
+# How much the bot wants each object type in its lane: bananas, coconuts, peels, trees
+LANE_VALUES = (10, -40, -3, -1000)
+
+
+def bot_inputs(engine, rng, mistakes=0.02, lookahead=60):
+    """Input bits for one frame: head for the lane with the best things coming down it."""
+    if rng.random() < mistakes:
+        return rng.choice((0, LEFT, RIGHT))
+    values = [0.0] * len(engine.lanes)
+    for kind, x, y in engine.objects.rows():
+        distance = engine.player_y - y
+        if -8 < distance < lookahead:
+            lane = engine.lanes.index(x)
+            value = LANE_VALUES[kind]
+            # Closer things matter more, and pickups too close to reach don't count
+            if kind == BANANA or kind == PEEL:
+                value *= 1 - distance / lookahead
+            values[lane] += value
+    # Moving across lanes means passing through the ones in between, so a
+    # lane is only as good as the worst lane on the way there
+    current = engine.current_lane
+    best, best_value = current, values[current]
+    for lane in range(len(values)):
+        if lane == current:
+            continue
+        path = values[lane:current] if lane < current else values[current + 1:lane + 1]
+        path_value = min(path)
+        if path_value > best_value + 1:
+            best, best_value = lane, path_value
+    if best < current:
+        return LEFT
+    if best > current:
+        return RIGHT
+    return 0
+
+
+def play(args):
+    """Play one seeded run to game over or max_frames and return its stats."""
+    seed, max_frames, keep_recording = args
+    engine = RunEngine(seed)
+    bot_rng = random.Random(seed ^ 0x5EED)
+    recorder = InputRecorder(seed)
+    step_times = Counter()  # Microseconds -> frames
+    clock = time.perf_counter
+    while engine.frame < max_frames:
+        inputs = bot_inputs(engine, bot_rng)
+        recorder.record(inputs)
+        start = clock()
+        running = engine.step(inputs)
+        step_times[int((clock() - start) * 1e6)] += 1
+        if not running:
+            break
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'frames': engine.frame,
+        'coconuts_hit': engine.coconuts_hit,
+        'survived': engine.running,
+        'step_times': step_times,
+        'recording': recorder.to_bytes() if keep_recording else None,
+    }
+
+
+def _percentile(counts, fraction):
+    """Value at `fraction` of a Counter of value -> occurrences."""
+    target = fraction * sum(counts.values())
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def run_batch(runs=2000, workers=None, max_frames=5400, verify=0):
+    """Play `runs` seeded games on `workers` processes and print the distributions."""
+    workers = workers or os.cpu_count() or 1
+    jobs = [(seed, max_frames, seed < verify) for seed in range(runs)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = list(pool.imap_unordered(play, jobs, chunksize=max(1, runs // (workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    scores = sorted(result['score'] for result in results)
+    frames = [result['frames'] for result in results]
+    step_times = Counter()
+    for result in results:
+        step_times.update(result['step_times'])
+    total_frames = sum(frames)
+
+    print(f"{runs} runs on {workers} workers in {elapsed:.1f}s ({total_frames / elapsed:,.0f} frames/s)")
+    print(f"score:  mean {statistics.mean(scores):.1f}  stdev {statistics.pstdev(scores):.1f}  "
+          f"min {scores[0]}  p10 {scores[len(scores) // 10]}  median {statistics.median(scores):g}  "
+          f"p90 {scores[len(scores) * 9 // 10]}  max {scores[-1]}")
+    print(f"frames: mean {statistics.mean(frames):.0f}  "
+          f"survived to {max_frames}: {sum(result['survived'] for result in results)}  "
+          f"ended by coconuts: {sum(result['coconuts_hit'] >= 3 for result in results)}")
+    print(f"step:   mean {sum(us * n for us, n in step_times.items()) / total_frames:.1f}us  "
+          f"p50 {_percentile(step_times, 0.5)}us  p95 {_percentile(step_times, 0.95)}us  "
+          f"p99 {_percentile(step_times, 0.99)}us  max {max(step_times)}us  "
+          f"over frame budget: {sum(n for us, n in step_times.items() if us > FRAME_BUDGET_US)}")
+
+    # Score histogram in ten buckets
+    width = max(1, (scores[-1] - scores[0]) // 10 + 1)
+    buckets = Counter((score - scores[0]) // width for score in scores)
+    for bucket in range(10):
+        low = scores[0] + bucket * width
+        count = buckets.get(bucket, 0)
+        print(f"{low:>7}-{low + width - 1:<7} {count:>6} {'#' * round(60 * count / len(scores))}")
+
+    if verify:
+        mismatches = 0
+        for result in results:
+            if result['recording'] is None:
+                continue
+            engine = replay(InputRecorder.from_bytes(result['recording']))
+            if (engine.score, engine.frame) != (result['score'], result['frames']):
+                mismatches += 1
+                print(f"Replay mismatch for seed {result['seed']}")
+        print(f"replayed {verify} runs, {mismatches} mismatches")
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-frames', type=int, default=5400)
+    parser.add_argument('--verify', type=int, default=0, help="replay this many runs and compare")
+    options = parser.parse_args()
+    run_batch(options.runs, options.workers, options.max_frames, options.verify)
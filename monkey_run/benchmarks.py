@@ -0,0 +1,162 @@
+"""Micro-benchmarks for the monkey_run game logic.
+
+Run from the monkey_run directory:
+    python benchmarks.py            # run everything
+    python benchmarks.py pool       # run a single benchmark
+    python benchmarks.py lanes
+    python benchmarks.py stream
+"""
+import random
+import sys
+import time
+
+LANES = [30, 60, 90, 120]
+TYPES = ["banana", "coconut", "peel", "tree"]
+
+
+def _timeit(func, repeat):
+    """Average seconds per call of func over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def _legacy_update(obstacles, speed, player_x, player_y):
+    """The dict-list obstacle update MonkeyRun used before ObstaclePool (score effects dropped)."""
+    for obstacle in obstacles[:]:
+        obstacle["y"] += speed
+        if abs(obstacle["x"] - player_x) < 8 and abs(obstacle["y"] - player_y) < 8:
+            if obstacle["type"] != "tree":
+                obstacles.remove(obstacle)
+        elif obstacle["y"] > 130:
+            obstacles.remove(obstacle)
+
+
+def bench_pool():
+    """Frame cost of moving, colliding and culling N live obstacles."""
+    from obstacle_pool import ObstaclePool, TYPE_CODES, TREE
+
+    print("pool: per-frame obstacle update, dict list vs ObstaclePool")
+    print(f"{'live':>7} {'dict list':>12} {'pool':>12} {'speedup':>9} {'pool p95':>12}")
+    for live in (10, 100, 1000, 5000):
+        rng = random.Random(0)
+        spawns = [(rng.choice(TYPES), rng.choice(LANES), rng.uniform(-10, 130)) for _ in range(live)]
+
+        obstacles = [{"type": kind, "x": x, "y": y, "spacing": 30} for kind, x, y in spawns]
+
+        def legacy_frame():
+            _legacy_update(obstacles, 2, 60, 100)
+            # Keep the population steady, like a dense endless mode
+            while len(obstacles) < live:
+                obstacles.append({"type": rng.choice(TYPES), "x": rng.choice(LANES), "y": -10, "spacing": 30})
+
+        pool = ObstaclePool(capacity=live)
+        for kind, x, y in spawns:
+            pool.spawn(TYPE_CODES[kind], x, y, 30)
+
+        def pool_frame():
+            pool.advance(2)
+            hits = pool.hits(60, 100)
+            removed = [i for i in hits if pool.kind[i] != TREE]
+            removed.extend(pool.below(130))
+            pool.remove(removed)
+            while len(pool) < live:
+                pool.spawn(rng.randrange(4), rng.choice(LANES), -10, 30)
+
+        frames = 200 if live <= 1000 else 50
+        legacy = _timeit(legacy_frame, frames)
+        pool_frame()  # Warm-up, the first NumPy calls are slower
+        # Per-frame times, to show the frame cost stays flat rather than spiking on removals
+        times = []
+        for _ in range(frames):
+            frame_start = time.perf_counter()
+            pool_frame()
+            times.append(time.perf_counter() - frame_start)
+        times.sort()
+        pooled = sum(times) / frames
+        p95 = times[int(frames * 0.95)]
+        print(f"{live:>7} {legacy * 1e3:>10.3f}ms {pooled * 1e3:>10.3f}ms {legacy / pooled:>8.1f}x "
+              f"{p95 * 1e3:>10.3f}ms")
+
+
+def bench_lanes():
+    """Collision and culling cost as the live count grows, full scan vs lane index."""
+    from obstacle_pool import ObstaclePool, LanePool
+
+    print("lanes: per-frame hits() + below(), ObstaclePool scan vs LanePool heads")
+    print(f"{'live':>7} {'full scan':>12} {'lane index':>12} {'speedup':>9}")
+    for live in (10, 100, 1000, 5000, 20000):
+        rng = random.Random(0)
+        # Evenly spread down the screen, as a dense endless mode would keep them
+        spawns = sorted(((rng.randrange(4), rng.choice(LANES), rng.uniform(-10, 130)) for _ in range(live)),
+                        key=lambda spawn: -spawn[2])
+        full = ObstaclePool(capacity=live)
+        lanes = LanePool(LANES, capacity=live)
+        for kind, x, y in spawns:
+            full.spawn(kind, x, y)
+            lanes.spawn(kind, x, y)
+
+        frames = 200 if live <= 5000 else 50
+        full.hits(60, 100)  # Warm-up
+        scan = _timeit(lambda: (full.hits(60, 100), full.below(130)), frames)
+        indexed = _timeit(lambda: (lanes.hits(60, 100), lanes.below(130)), frames)
+        print(f"{live:>7} {scan * 1e3:>10.3f}ms {indexed * 1e3:>10.3f}ms {scan / indexed:>8.1f}x")
+
+
+def bench_stream():
+    """How often the game outruns the background obstacle stream, with Gemini taking 2 s a request."""
+    import math
+    from obstacle_pool import LanePool, TYPE_CODES
+    from obstacle_stream import ObstacleStream, local_obstacles, BASE_SPEED, FPS
+
+    accel = 20  # Run frames and requests this many times faster than real time
+    latency = 2.0
+
+    class SlowGenerator:
+        def generate_obstacles(self, score, speed):
+            time.sleep(latency / accel)
+            return local_obstacles(score, speed, 8)
+
+    class SpacingStream(ObstacleStream):
+        """The target ObstacleStream used before, assuming one obstacle every `spacing` frames."""
+        def target_size(self):
+            spacings = [obstacle["spacing"] for obstacle in self.buffer]
+            spacing = sum(spacings) / len(spacings) if spacings else 40
+            frames_per_obstacle = max(1.0, spacing * BASE_SPEED / max(self.speed, BASE_SPEED))
+            return max(5, min(60, math.ceil(self.lookahead_seconds * FPS / frames_per_obstacle)))
+
+    print("stream: underruns over 60 s of play, MonkeyRun popping while fewer than 10 are on screen")
+    print(f"{'speed':>6} {'target':>9} {'pops':>6} {'underruns':>10} {'filled locally':>15}")
+    for speed in (2, 3.5, 5):
+        for name, stream_class in (('spacing', SpacingStream), ('pop rate', ObstacleStream)):
+            stream = stream_class(SlowGenerator())
+            pool = LanePool(LANES)
+            time.sleep(latency * 2 / accel)  # Let the first requests land, as the title screen would
+            pops = 0
+            for _ in range(60 * FPS):
+                stream.update(0, speed)
+                if len(pool) < 10:
+                    obstacle = stream.pop()
+                    pool.spawn(TYPE_CODES[obstacle["type"]], LANES[obstacle["lane"]], -10, obstacle["spacing"])
+                    pops += 1
+                pool.advance(speed)
+                pool.remove(pool.below(130))
+                time.sleep(1 / FPS / accel)
+            stats = stream.stats()
+            stream.shutdown()
+            print(f"{speed:>6} {name:>9} {pops:>6} {stats['underruns']:>10} "
+                  f"{stats['filled_locally'] / pops:>14.0%}")
+
+
+BENCHMARKS = {
+    'pool': bench_pool,
+    'lanes': bench_lanes,
+    'stream': bench_stream,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,193 @@
+import random
+import sys
+from array import array
+
+from obstacle_pool import LanePool, BANANA, COCONUT, PEEL, TREE
+
+# Input bits for one frame
+LEFT = 1
+RIGHT = 2
+
+# Game states
+GAME_RUNNING = 0
+GAME_OVER = 1
+
+# Spawn rules per object type: (chance per frame, cooldown frames, spawn y)
+SPAWN_RULES = (
+    (BANANA, 0.03, 30, -10),
+    (COCONUT, 0.02, 45, -10),
+    (PEEL, 0.01, 60, -10),
+    (TREE, 0.01, 90, -20),
+)
+
+
+class RunEngine:
+    """Monkey Run game rules with no window, stepped one frame at a time.
+
+    All randomness comes from `rng`, so two engines built with the same seed
+    and fed the same inputs play out identically. The pyxel front end in
+    main.py only turns key presses into input bits and draws the state.
+    """
+
+    def __init__(self, seed=None, rng=None):
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.lanes = [30, 60, 90, 120]  # 4 lanes for movement
+        self.reset()
+
+    def reset(self):
+        # Game state
+        self.state = GAME_RUNNING
+        self.frame = 0
+
+        # Player properties
+        self.current_lane = 1  # Start in second lane
+        self.player_x = self.lanes[self.current_lane]
+        self.player_y = 100  # Fixed vertical position
+
+        # Game properties
+        self.score = 0
+        self.coconuts_hit = 0
+        self.speed = 2  # Initial game speed
+        self.max_speed = 5
+        self.speed_increment = 0.001
+
+        # Objects - bananas, coconuts, banana peels and trees share one lane-indexed pool
+        self.objects = LanePool(self.lanes)
+
+        # Spawn timers, one per type in SPAWN_RULES
+        self.timers = [0] * len(SPAWN_RULES)
+
+    @property
+    def running(self):
+        return self.state == GAME_RUNNING
+
+    def step(self, inputs=0):
+        """Advance one frame with the given LEFT/RIGHT bits. Returns False once the game is over."""
+        if self.state == GAME_OVER:
+            return False
+        self.frame += 1
+
+        # Player movement
+        if inputs & LEFT and self.current_lane > 0:
+            self.current_lane -= 1
+        if inputs & RIGHT and self.current_lane < 3:
+            self.current_lane += 1
+
+        # Update player position smoothly
+        self.player_x += (self.lanes[self.current_lane] - self.player_x) * 0.2
+
+        # Increase speed over time
+        self.speed = min(self.speed + self.speed_increment, self.max_speed)
+
+        # Spawn objects
+        self._spawn_objects()
+
+        # Update object positions and check collisions
+        self._update_objects()
+
+        # Check game over conditions
+        if self.coconuts_hit >= 3:
+            self.state = GAME_OVER
+        return self.running
+
+    def _spawn_objects(self):
+        rng = self.rng
+        for n, (kind, chance, cooldown, y) in enumerate(SPAWN_RULES):
+            if self.timers[n] <= 0 and rng.random() < chance:
+                lane = rng.randint(0, 3)
+                self.objects.spawn(kind, self.lanes[lane], y)
+                self.timers[n] = cooldown
+            self.timers[n] = max(0, self.timers[n] - 1)
+
+    def _update_objects(self):
+        # Move every object in one pass
+        self.objects.advance(self.speed)
+
+        # Check collisions, only the lanes under the player are looked at
+        removed = []
+        for i in self.objects.hits(self.player_x, self.player_y):
+            kind = self.objects.kind[i]
+            if kind == BANANA:
+                self.score += 10
+                removed.append(i)
+            elif kind == COCONUT:
+                self.coconuts_hit += 1
+                self.score = max(0, self.score - 5)
+                removed.append(i)
+            elif kind == PEEL:
+                self.score = max(0, self.score - 3)
+                removed.append(i)
+            elif kind == TREE:
+                self.state = GAME_OVER
+
+        # Remove collected and off-screen objects (the player box never reaches y > 130)
+        removed.extend(self.objects.below(130))
+        self.objects.remove(removed)
+
+
+class InputRecorder:
+    """Per-frame inputs of one run, run-length encoded as (inputs, repeat) pairs.
+
+    Players hold still most of the time, so a whole run is usually a few
+    hundred bytes. Together with the engine seed it replays the run exactly.
+    """
+
+    MAX_REPEAT = 0xFFFF  # Longest run stored in one pair
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.runs = array('H')  # Flat inputs, repeat, inputs, repeat, ...
+        self.frames = 0
+
+    def record(self, inputs):
+        runs = self.runs
+        if runs and runs[-2] == inputs and runs[-1] < self.MAX_REPEAT:
+            runs[-1] += 1
+        else:
+            runs.extend((inputs, 1))
+        self.frames += 1
+
+    def __iter__(self):
+        runs = self.runs
+        for n in range(0, len(runs), 2):
+            inputs = runs[n]
+            for _ in range(runs[n + 1]):
+                yield inputs
+
+    def __len__(self):
+        return self.frames
+
+    def to_bytes(self):
+        """Seed followed by the pairs, as little-endian integers."""
+        if self.seed is None:
+            raise ValueError("Only runs with a known seed can be saved")
+        header = array('Q', [self.seed])
+        runs = array('H', self.runs)
+        if sys.byteorder == 'big':
+            header.byteswap()
+            runs.byteswap()
+        return header.tobytes() + runs.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        header = array('Q')
+        header.frombytes(data[:8])
+        runs = array('H')
+        runs.frombytes(data[8:])
+        if sys.byteorder == 'big':
+            header.byteswap()
+            runs.byteswap()
+        recorder = cls(header[0])
+        recorder.runs = runs
+        recorder.frames = sum(runs[1::2])
+        return recorder
+
+
+def replay(recorder):
+    """Play a recorded run on a fresh engine and return the engine at its last frame."""
+    engine = RunEngine(recorder.seed)
+    for inputs in recorder:
+        if not engine.step(inputs):
+            break
+    return engine
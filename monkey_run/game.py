@@ -1,12 +1,20 @@
 import pyxel
 import random
 import os
+import time
 import google.generativeai as genai
 from dotenv import load_dotenv
+from obstacle_stream import ObstacleStream, FPS
+from obstacle_pool import LanePool, BANANA, COCONUT, PEEL, TREE, TYPE_CODES
+from renderer import LayeredRenderer
 
 # Load environment variables
 load_dotenv()
 
+MAX_OBSTACLES = 10  # A new obstacle is popped every frame while fewer than this are on screen
+SPAWN_Y = -10
+CULL_Y = 130  # The player box never reaches below this
+
 class ObstacleGenerator:
     def __init__(self):
         # Configure Gemini API
@@ -21,7 +29,7 @@ class ObstacleGenerator:
         prompt = f"""
         Generate obstacles for a monkey runner game. Return only a JSON array of objects.
         Current score: {score}
-        Current speed: {speed}
+        Current speed: {current_speed}
         
         Each object should have:
         - "type": one of ["banana", "coconut", "peel", "tree"]
@@ -63,12 +71,19 @@ class ObstacleGenerator:
         ]
 
 class MonkeyRun:
-    def __init__(self):
+    def __init__(self, dirty_rects=False):
         # Initialize game window
         pyxel.init(160, 120, title="Monkey Run")
         
-        # Initialize obstacle generator
+        # Initialize obstacle generator, fed through a background stream so
+        # Gemini requests never stall the frame loop
         self.obstacle_gen = ObstacleGenerator()
+        self.obstacle_stream = ObstacleStream(self.obstacle_gen, max_live=MAX_OBSTACLES,
+                                              fall_distance=CULL_Y - SPAWN_Y)
+        
+        # Frame pacing metrics
+        self.frames_dropped = 0
+        self.last_frame_time = None
         
         # Game states
         self.GAME_RUNNING = 0
@@ -77,6 +92,9 @@ class MonkeyRun:
         # Initialize game state
         self.reset_game()
         
+        # Static background is drawn once; each frame only adds what moved
+        self.renderer = LayeredRenderer(self.lanes, dirty_rects=dirty_rects)
+        
         # Start the game
         pyxel.run(self.update, self.draw)
     
@@ -98,20 +116,34 @@ class MonkeyRun:
         self.speed_increment = 0.001
         
         # Objects
-        self.obstacles = []  # List of active obstacles
-        self.obstacle_queue = []  # Queue of upcoming obstacles
+        self.obstacles = LanePool(self.lanes)  # Active obstacles, indexed by lane
         
-        # Generate initial obstacles
-        self._generate_new_obstacles()
+        # Start refilling upcoming obstacles for the new run
+        self.obstacle_stream.reset()
+        self.obstacle_stream.update(self.score, self.speed)
     
-    def _generate_new_obstacles(self):
-        """Get new obstacles from Gemini when queue is low"""
-        if len(self.obstacle_queue) < 5:
-            new_obstacles = self.obstacle_gen.generate_obstacles(self.score, self.speed)
-            self.obstacle_queue.extend(new_obstacles)
+    def _track_frame(self):
+        """Count frames lost to updates that overran the frame budget"""
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            gap = now - self.last_frame_time
+            if gap > 1.5 / FPS:
+                self.frames_dropped += round(gap * FPS) - 1
+        self.last_frame_time = now
+    
+    def stats(self):
+        """Obstacle stream counters plus dropped frames and draw timing"""
+        stats = self.obstacle_stream.stats()
+        stats['frames_dropped'] = self.frames_dropped
+        stats.update(self.renderer.stats())
+        return stats
     
     def update(self):
+        self._track_frame()
+        
         if pyxel.btnp(pyxel.KEY_Q):
+            print(f"Run stats: {self.stats()}")
+            self.obstacle_stream.shutdown()
             pyxel.quit()
             
         if self.state == self.GAME_OVER:
@@ -134,79 +166,47 @@ class MonkeyRun:
         # Update and spawn obstacles
         self._update_obstacles()
         
-        # Generate new obstacles if needed
-        self._generate_new_obstacles()
+        # Let the background stream know how the run is going (never blocks)
+        self.obstacle_stream.update(self.score, self.speed)
         
         # Check game over conditions
         if self.coconuts_hit >= 3:
             self.state = self.GAME_OVER
     
     def _update_obstacles(self):
-        # Spawn new obstacles from queue
-        if self.obstacle_queue and len(self.obstacles) < 10:
-            next_obstacle = self.obstacle_queue[0]
-            self.obstacles.append({
-                "type": next_obstacle["type"],
-                "x": self.lanes[next_obstacle["lane"]],
-                "y": -10,
-                "spacing": next_obstacle["spacing"]
-            })
-            self.obstacle_queue.pop(0)
-        
-        # Update existing obstacles
-        for obstacle in self.obstacles[:]:
-            obstacle["y"] += self.speed
-            
-            # Check collisions
-            if abs(obstacle["x"] - self.player_x) < 8 and abs(obstacle["y"] - self.player_y) < 8:
-                if obstacle["type"] == "banana":
-                    self.score += 10
-                    self.obstacles.remove(obstacle)
-                elif obstacle["type"] == "coconut":
-                    self.coconuts_hit += 1
-                    self.score = max(0, self.score - 5)
-                    self.obstacles.remove(obstacle)
-                elif obstacle["type"] == "peel":
-                    self.score = max(0, self.score - 3)
-                    self.obstacles.remove(obstacle)
-                elif obstacle["type"] == "tree":
-                    self.state = self.GAME_OVER
-            
-            # Remove off-screen obstacles
-            elif obstacle["y"] > 130:
-                self.obstacles.remove(obstacle)
+        # Spawn new obstacles from the stream
+        if len(self.obstacles) < MAX_OBSTACLES:
+            next_obstacle = self.obstacle_stream.pop()
+            self.obstacles.spawn(TYPE_CODES[next_obstacle["type"]], self.lanes[next_obstacle["lane"]], SPAWN_Y,
+                                 next_obstacle["spacing"])
+        
+        # Move everything in one pass
+        self.obstacles.advance(self.speed)
+        
+        # Check collisions, only the lanes under the player are looked at
+        removed = []
+        for i in self.obstacles.hits(self.player_x, self.player_y):
+            kind = self.obstacles.kind[i]
+            if kind == BANANA:
+                self.score += 10
+                removed.append(i)
+            elif kind == COCONUT:
+                self.coconuts_hit += 1
+                self.score = max(0, self.score - 5)
+                removed.append(i)
+            elif kind == PEEL:
+                self.score = max(0, self.score - 3)
+                removed.append(i)
+            elif kind == TREE:
+                self.state = self.GAME_OVER
+        
+        # Remove collected and off-screen obstacles
+        removed.extend(self.obstacles.below(CULL_Y))
+        self.obstacles.remove(removed)
     
     def draw(self):
-        pyxel.cls(11)  # Light blue background
-        
-        if self.state == self.GAME_RUNNING:
-            # Draw lanes
-            for lane in self.lanes:
-                pyxel.line(lane, 0, lane, 120, 13)
-            
-            # Draw player (monkey)
-            pyxel.rect(self.player_x - 4, self.player_y - 4, 8, 8, 14)  # Brown
-            
-            # Draw obstacles
-            for obstacle in self.obstacles:
-                if obstacle["type"] == "banana":
-                    pyxel.circ(obstacle["x"], obstacle["y"], 2, 10)  # Yellow
-                elif obstacle["type"] == "coconut":
-                    pyxel.circ(obstacle["x"], obstacle["y"], 3, 5)  # Dark brown
-                elif obstacle["type"] == "peel":
-                    pyxel.rect(obstacle["x"] - 2, obstacle["y"] - 1, 4, 2, 10)  # Yellow
-                elif obstacle["type"] == "tree":
-                    pyxel.rect(obstacle["x"] - 3, obstacle["y"] - 8, 6, 16, 3)  # Green
-            
-            # Draw score and coconuts hit
-            pyxel.text(4, 4, f"SCORE: {self.score}", 0)
-            pyxel.text(4, 12, f"COCONUTS: {self.coconuts_hit}/3", 0)
-            
-        else:  # Game Over screen
-            pyxel.text(60, 50, "GAME OVER", 8)
-            pyxel.text(45, 60, f"FINAL SCORE: {self.score}", 8)
-            pyxel.text(40, 70, "PRESS R TO RESTART", 8)
-            pyxel.text(45, 80, "PRESS Q TO QUIT", 8)
+        self.renderer.draw(self.state == self.GAME_RUNNING, self.player_x, self.player_y, self.obstacles.rows(),
+                           self.score, self.coconuts_hit)
 
 if __name__ == "__main__":
     MonkeyRun()
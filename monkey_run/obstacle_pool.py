@@ -0,0 +1,178 @@
+import bisect
+
+import numpy as np
+
+# Type codes stored in ObstaclePool.kind
+BANANA = 0
+COCONUT = 1
+PEEL = 2
+TREE = 3
+TYPE_NAMES = ("banana", "coconut", "peel", "tree")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+
+class ObstaclePool:
+    """Fixed-capacity obstacle store as parallel NumPy arrays.
+
+    Slots are handed out from a free list and stay put until removed, so other
+    structures can refer to an obstacle by its slot. Per-frame passes run over
+    the whole arrays at once instead of looping over dicts in Python.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.spacing = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))  # Lowest slots get reused first
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.count = 0
+
+    def spawn(self, kind, x, y, spacing=0):
+        """Add an obstacle by type code. Returns its slot, or -1 if the pool is full."""
+        if not self.free:
+            return -1
+        i = self.free.pop()
+        self.x[i] = x
+        self.y[i] = y
+        self.kind[i] = kind
+        self.spacing[i] = spacing
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def advance(self, dy):
+        """Move every obstacle down by dy (dead slots move too, which is harmless)."""
+        self.y += dy
+
+    def hits(self, player_x, player_y, reach=8):
+        """Slots of obstacles overlapping the player's box, lowest slot first."""
+        overlap = self.alive & (np.abs(self.x - player_x) < reach) & (np.abs(self.y - player_y) < reach)
+        return np.flatnonzero(overlap).tolist()
+
+    def below(self, limit):
+        """Slots of obstacles that have fallen past y = limit."""
+        return np.flatnonzero(self.alive & (self.y > limit)).tolist()
+
+    def remove(self, slots):
+        """Free the given slots."""
+        for i in set(slots):
+            if self.alive[i]:
+                self.alive[i] = False
+                self.free.append(i)
+                self.count -= 1
+
+    def rows(self):
+        """(kind, x, y) of each live obstacle as plain Python values, for drawing.
+
+        Grouped by kind in type-code order, so trees are drawn over the rest as before.
+        """
+        live = np.flatnonzero(self.alive)
+        live = live[np.argsort(self.kind[live], kind='stable')]
+        return zip(self.kind[live].tolist(), self.x[live].tolist(), self.y[live].tolist())
+
+
+class LanePool(ObstaclePool):
+    """ObstaclePool with a per-lane index for objects that only spawn in fixed lanes.
+
+    Everything falls at the same speed, so an object's y is its spawn key plus
+    how far the screen has scrolled since, and the order within a lane never
+    changes. Each lane keeps its keys sorted, bottom of the screen first:
+    collisions bisect straight to the player's band in the lanes the player
+    overlaps, and culling drops a run off the front of the lane, however many
+    objects are live.
+    """
+
+    def __init__(self, lanes, capacity=1024):
+        super().__init__(capacity)
+        self.lane_x = list(lanes)
+        self.scroll = 0.0  # Total distance everything has fallen
+        self.lane_keys = [[] for _ in self.lane_x]  # scroll at spawn - spawn y, ascending
+        self.lane_slots = [[] for _ in self.lane_x]
+        self.heads = [0] * len(self.lane_x)  # Entries before the head have been culled
+        self.lane_of = {}  # slot -> (lane index, key)
+
+    def clear(self):
+        super().clear()
+        self.scroll = 0.0
+        for lane in range(len(self.lane_x)):
+            self.lane_keys[lane] = []
+            self.lane_slots[lane] = []
+            self.heads[lane] = 0
+        self.lane_of.clear()
+
+    def spawn(self, kind, x, y, spacing=0):
+        # Checked first, so a bad x doesn't leave a live object outside every lane
+        if x not in self.lane_x:
+            raise ValueError(f"x={x} is not one of this pool's lanes {self.lane_x}")
+        i = super().spawn(kind, x, y, spacing)
+        if i < 0:
+            return i
+        lane = self.lane_x.index(x)
+        keys = self.lane_keys[lane]
+        key = self.scroll - y
+        # Newest objects sit highest, so this is an append unless a tree
+        # started above something spawned after it
+        k = bisect.bisect_right(keys, key, self.heads[lane])
+        keys.insert(k, key)
+        self.lane_slots[lane].insert(k, i)
+        self.lane_of[i] = (lane, key)
+        return i
+
+    def advance(self, dy):
+        super().advance(dy)
+        self.scroll += dy
+
+    def hits(self, player_x, player_y, reach=8):
+        slots = []
+        # Player box is player_y - reach < y < player_y + reach, and y = scroll - key
+        low = self.scroll - player_y - reach
+        high = self.scroll - player_y + reach
+        for lane, lane_x in enumerate(self.lane_x):
+            if abs(lane_x - player_x) >= reach:
+                continue
+            keys = self.lane_keys[lane]
+            start = bisect.bisect_right(keys, low, self.heads[lane])
+            end = bisect.bisect_left(keys, high, start)
+            slots.extend(self.lane_slots[lane][start:end])
+        return sorted(slots)
+
+    def below(self, limit):
+        slots = []
+        for lane, keys in enumerate(self.lane_keys):
+            head = self.heads[lane]
+            end = bisect.bisect_left(keys, self.scroll - limit, head)
+            slots.extend(self.lane_slots[lane][head:end])
+        return slots
+
+    def remove(self, slots):
+        for i in set(slots):
+            if i not in self.lane_of:
+                continue
+            lane, key = self.lane_of.pop(i)
+            keys = self.lane_keys[lane]
+            lane_slots = self.lane_slots[lane]
+            head = self.heads[lane]
+            k = bisect.bisect_left(keys, key, head)
+            while lane_slots[k] != i:
+                k += 1
+            if k == head:
+                # Culled from the bottom: just move the head past it
+                self.heads[lane] = head = head + 1
+                if head > 256 and head * 2 > len(keys):
+                    del keys[:head]
+                    del lane_slots[:head]
+                    self.heads[lane] = 0
+            else:
+                del keys[k]
+                del lane_slots[k]
+        super().remove(slots)
@@ -0,0 +1,164 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+
+OBSTACLE_TYPES = ("banana", "coconut", "peel", "tree")
+LANE_COUNT = 4
+FPS = 30
+BASE_SPEED = 2
+
+
+def local_obstacles(score, speed, count, rng=random):
+    """Procedural obstacles following the same rules as the Gemini prompt.
+
+    Rewards dominate at low scores, hazards take over as score grows, and
+    spacing tightens with speed.
+    """
+    hazard = min(0.7, 0.25 + score / 1000)
+    weights = (1 - hazard, hazard * 0.45, hazard * 0.3, hazard * 0.25)
+    spacing = max(12, int(45 - speed * 5))
+    return [
+        {
+            "type": rng.choices(OBSTACLE_TYPES, weights)[0],
+            "lane": rng.randrange(LANE_COUNT),
+            "spacing": spacing + rng.randint(0, spacing // 2),
+        }
+        for _ in range(count)
+    ]
+
+
+def clean_obstacles(obstacles):
+    """Keep only well-formed obstacles from a generator response."""
+    cleaned = []
+    if not isinstance(obstacles, list):
+        return cleaned
+    for obstacle in obstacles:
+        try:
+            lane = int(obstacle["lane"])
+            spacing = int(obstacle["spacing"])
+            if obstacle["type"] in OBSTACLE_TYPES and 0 <= lane < LANE_COUNT:
+                cleaned.append({"type": obstacle["type"], "lane": lane, "spacing": max(1, spacing)})
+        except (KeyError, TypeError, ValueError):
+            continue
+    return cleaned
+
+
+class ObstacleStream:
+    """Buffer of upcoming obstacles kept full by a background thread.
+
+    The game thread only ever pops from the buffer. When Gemini can't keep up
+    and the buffer runs low, local procedural obstacles are added on the spot,
+    so update() never waits on the network.
+    """
+
+    def __init__(self, obstacle_gen, lookahead_seconds=4.0, low_water=2, max_live=10, fall_distance=140):
+        self.obstacle_gen = obstacle_gen
+        self.lookahead_seconds = lookahead_seconds
+        self.low_water = low_water  # Fill locally when fewer than this many are left
+        self.max_live = max_live  # The game pops whenever fewer than this many are on screen
+        self.fall_distance = fall_distance  # Pixels an obstacle falls from spawn until it's culled
+
+        self.lock = threading.Lock()
+        self.wanted = threading.Condition(self.lock)
+        self.buffer = deque()
+        self.score = 0
+        self.speed = BASE_SPEED
+        self.epoch = 0  # Bumped by reset() so results for an old run get dropped
+
+        # Counters
+        self.generated = 0
+        self.filled_locally = 0
+        self.underruns = 0
+        self.requests = 0
+        self.request_time = 0.0
+
+        self.running = True
+        self.worker = threading.Thread(target=self._run, name="obstacle-stream", daemon=True)
+        self.worker.start()
+
+    def target_size(self):
+        """Obstacles the game will pop over the lookahead window at the current speed.
+
+        MonkeyRun pops one a frame while fewer than max_live are on screen, so
+        it pops them as fast as they fall off: max_live every
+        fall_distance / speed frames. Spacing doesn't come into it. The buffer
+        never drops below max_live, enough to fill an empty screen.
+        """
+        per_frame = self.max_live * max(self.speed, BASE_SPEED) / self.fall_distance
+        return max(self.max_live, min(60, math.ceil(self.lookahead_seconds * FPS * per_frame)))
+
+    def update(self, score, speed):
+        """Record the game state for the next request and wake the worker if needed. Never blocks on Gemini."""
+        with self.lock:
+            self.score = score
+            self.speed = speed
+            if len(self.buffer) < self.target_size():
+                self.wanted.notify()
+
+    def pop(self):
+        """Next obstacle, topping the buffer up locally first if the worker fell behind."""
+        with self.lock:
+            if len(self.buffer) < self.low_water:
+                self.underruns += 1
+                filler = local_obstacles(self.score, self.speed, self.low_water * 2)
+                self.buffer.extend(filler)
+                self.filled_locally += len(filler)
+                self.wanted.notify()
+            return self.buffer.popleft()
+
+    def reset(self):
+        """Drop buffered obstacles and any request in flight, e.g. on game restart."""
+        with self.lock:
+            self.epoch += 1
+            self.buffer.clear()
+            self.score = 0
+            self.speed = BASE_SPEED
+            self.wanted.notify()
+
+    def shutdown(self):
+        """Stop the worker thread."""
+        with self.lock:
+            self.running = False
+            self.wanted.notify()
+
+    def stats(self):
+        """Get stream counters."""
+        with self.lock:
+            return {
+                'buffered': len(self.buffer),
+                'target': self.target_size(),
+                'generated': self.generated,
+                'filled_locally': self.filled_locally,
+                'underruns': self.underruns,
+                'requests': self.requests,
+                'avg_request_time': self.request_time / self.requests if self.requests else 0.0,
+            }
+
+    def _run(self):
+        while True:
+            with self.lock:
+                self.wanted.wait_for(lambda: not self.running or len(self.buffer) < self.target_size())
+                if not self.running:
+                    break
+                epoch, score, speed = self.epoch, self.score, self.speed
+
+            start = time.perf_counter()
+            try:
+                obstacles = clean_obstacles(self.obstacle_gen.generate_obstacles(score, speed))
+            except Exception as e:
+                print(f"Background obstacle generation failed: {e}")
+                obstacles = []
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                self.requests += 1
+                self.request_time += elapsed
+                if not obstacles:
+                    # Don't spin on a failing generator, the game fills locally meanwhile
+                    self.wanted.wait(timeout=1.0)
+                    continue
+                if epoch == self.epoch:
+                    self.buffer.extend(obstacles)
+                    self.generated += len(obstacles)
@@ -0,0 +1,177 @@
+import time
+from collections import deque
+
+import pyxel
+
+from obstacle_pool import BANANA, COCONUT, PEEL, TREE
+
+BACKGROUND_COLOR = 11  # Light blue
+LANE_COLOR = 13
+FONT_WIDTH = 4  # Pyxel's built-in font is 4x6 per character
+FONT_HEIGHT = 6
+BANK_SIZE = 256  # Image banks are 256x256; bigger windows get their own image
+
+# HUD lines: the label is baked into the background, the number follows it
+SCORE_LABEL = (4, 4, "SCORE: ")
+COCONUT_LABEL = (4, 12, "COCONUTS: ")
+
+# Screen area each sprite can touch, as (dx, dy, w, h) from its position, with
+# a pixel of slack for fractional coordinates
+SPRITE_RECTS = {
+    BANANA: (-3, -3, 7, 7),
+    COCONUT: (-4, -4, 9, 9),
+    PEEL: (-3, -2, 6, 4),
+    TREE: (-4, -9, 8, 18),
+}
+PLAYER_RECT = (-5, -5, 10, 10)
+
+
+def _intersects(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class LayeredRenderer:
+    """MonkeyRun drawing on top of a background rendered once.
+
+    The sky, lane lines and HUD labels are drawn into an image bank up front,
+    so a frame starts with a single blt instead of cls plus the lines and
+    labels. With dirty_rects on, the screen isn't cleared at all: only the
+    areas sprites covered last frame are copied back from the background,
+    and HUD lines are redrawn when they change or something crossed them.
+    """
+
+    def __init__(self, lanes, bank=0, dirty_rects=False, history=300):
+        self.width = pyxel.width
+        self.height = pyxel.height
+        self.lanes = lanes
+        self.dirty_rects = dirty_rects
+        if self.width <= BANK_SIZE and self.height <= BANK_SIZE:
+            self.background = pyxel.image(bank)
+        else:
+            self.background = pyxel.Image(self.width, self.height)
+        self._bake()
+
+        self.mode = None  # What's on screen: 'running', 'over', or None before the first frame
+        self.drawn = []  # Sprite rects drawn last frame
+        self.hud = {}  # HUD label -> (line text, rect) last drawn
+
+        # Draw timing
+        self.draw_times = deque(maxlen=history)  # Recent frames, for percentiles
+        self.frames = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.full_redraws = 0
+        self.restored_rects = 0
+
+    def _bake(self):
+        """Draw everything that never changes while running into the background image."""
+        image = self.background
+        image.cls(BACKGROUND_COLOR)
+        for lane in self.lanes:
+            image.line(lane, 0, lane, self.height, LANE_COLOR)
+        for x, y, label in (SCORE_LABEL, COCONUT_LABEL):
+            image.text(x, y, label, 0)
+
+    def _restore(self, rect):
+        x, y, w, h = rect
+        pyxel.blt(x, y, self.background, x, y, w, h)
+
+    def _full_redraw(self):
+        pyxel.blt(0, 0, self.background, 0, 0, self.width, self.height)
+        self.full_redraws += 1
+        self.hud = {}
+
+    def draw(self, running, player_x, player_y, rows, score, coconuts_hit):
+        """Draw one frame. `rows` yields (kind, x, y) for every live object."""
+        start = time.perf_counter()
+        if running:
+            self._draw_running(player_x, player_y, rows, score, coconuts_hit)
+        elif self.mode != 'over' or not self.dirty_rects:
+            self._draw_game_over(score)
+        elapsed = time.perf_counter() - start
+
+        self.frames += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.draw_times.append(elapsed)
+
+    def _draw_running(self, player_x, player_y, rows, score, coconuts_hit):
+        sprites = []
+        for kind, x, y in rows:
+            dx, dy, w, h = SPRITE_RECTS[kind]
+            sprites.append((kind, x, y, (int(x) + dx, int(y) + dy, w, h)))
+        px, py, pw, ph = PLAYER_RECT
+        player_rect = (int(player_x) + px, int(player_y) + py, pw, ph)
+        rects = [sprite[3] for sprite in sprites]
+        rects.append(player_rect)
+
+        # Put the background back where sprites were; fall back to one full blt
+        # when that would copy most of the screen anyway
+        restored = self.drawn
+        full = (not self.dirty_rects or self.mode != 'running'
+                or 2 * sum(w * h for _, _, w, h in restored) > self.width * self.height)
+        if full:
+            self._full_redraw()
+        else:
+            for rect in restored:
+                self._restore(rect)
+            self.restored_rects += len(restored)
+        self.mode = 'running'
+        self.drawn = rects
+
+        # Work out which HUD lines need drawing before sprites go on top. The
+        # labels are in the background too, but the whole line is redrawn so it
+        # stays over any sprite crossing it, as before
+        hud = []
+        for (x, y, label), value in ((SCORE_LABEL, score), (COCONUT_LABEL, f"{coconuts_hit}/3")):
+            text = f"{label}{value}"
+            rect = (x, y, len(text) * FONT_WIDTH, FONT_HEIGHT)
+            previous = self.hud.get(label)
+            if previous is not None and previous[0] == text and not any(
+                    _intersects(rect, other) for other in restored + rects):
+                continue
+            if previous is not None:
+                # Clear the old line, which may be longer than the new one
+                self._restore((x, y, max(rect[2], previous[1][2]), FONT_HEIGHT))
+            hud.append((label, text, rect))
+
+        # Draw player (monkey)
+        pyxel.rect(player_x - 4, player_y - 4, 8, 8, 14)  # Brown
+
+        # Draw objects
+        for kind, x, y, _ in sprites:
+            if kind == BANANA:
+                pyxel.circ(x, y, 2, 10)  # Yellow
+            elif kind == COCONUT:
+                pyxel.circ(x, y, 3, 5)  # Dark brown
+            elif kind == PEEL:
+                pyxel.rect(x - 2, y - 1, 4, 2, 10)  # Yellow
+            elif kind == TREE:
+                pyxel.rect(x - 3, y - 8, 6, 16, 3)  # Green
+
+        # Draw score and coconuts hit over everything
+        for label, text, rect in hud:
+            pyxel.text(rect[0], rect[1], text, 0)
+            self.hud[label] = (text, rect)
+
+    def _draw_game_over(self, score):
+        self.mode = 'over'
+        self.drawn = []
+        self.hud = {}
+        pyxel.cls(BACKGROUND_COLOR)
+        pyxel.text(60, 50, "GAME OVER", 8)
+        pyxel.text(45, 60, f"FINAL SCORE: {score}", 8)
+        pyxel.text(40, 70, "PRESS R TO RESTART", 8)
+        pyxel.text(45, 80, "PRESS Q TO QUIT", 8)
+
+    def stats(self):
+        """Get draw timing counters."""
+        recent = sorted(self.draw_times)
+        return {
+            'frames': self.frames,
+            'avg_draw_ms': self.total_time / self.frames * 1e3 if self.frames else 0.0,
+            'p95_draw_ms': recent[int(len(recent) * 0.95)] * 1e3 if recent else 0.0,
+            'max_draw_ms': self.max_time * 1e3,
+            'full_redraws': self.full_redraws,
+            'restored_rects': self.restored_rects,
+        }